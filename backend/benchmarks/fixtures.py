@@ -0,0 +1,648 @@
+"""FBRef-shaped HTML pages rebuilt from the data the scrapers saved.
+
+The parsers are benchmarked and checked against each other offline, so the
+pages they parse are rendered from ``scraped_data/``: a league stats page
+from the season's ``stats_squads_*`` and ``results*`` CSVs, a player stats
+page per category from ``player_data/``, the schedule from its CSV and a
+match report from a saved match JSON. The markup follows FBRef's (the
+``data-stat`` cells, the scorebox, the lineups and events, the per-team
+player tables), and every page is wrapped in navigation chrome so it is
+about as heavy as the real thing.
+
+A small set of the rendered pages is checked in under ``benchmarks/pages/``,
+gzipped and listed in a manifest, so the benchmark suite parses the same
+bytes wherever it runs. Re-render it after changing the markup with:
+
+    python -m benchmarks.fixtures
+"""
+
+import glob
+import gzip
+import html
+import json
+import os
+import re
+from typing import Any, Literal, TypedDict
+
+import pandas as pd
+
+data_dir = os.path.join(os.path.dirname(__file__), "..", "..", "scraped_data")
+pages_dir = os.path.join(os.path.dirname(__file__), "pages")
+
+FixtureKind = Literal["league", "players", "schedule", "match"]
+
+# Columns the scrapers add themselves rather than read from a cell.
+_DERIVED_COLUMNS = {"competition_id", "season_id", "season", "id"}
+
+
+class Fixture(TypedDict):
+    """A rendered page and what the scraper needs to parse it."""
+
+    name: str
+    kind: FixtureKind
+    html: str
+    params: dict[str, Any]
+
+
+def _e(value: Any) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _page(title: str, content: str, nav_links: int = 1500) -> str:
+    """Wraps ``content`` in the header, navigation and footer of a page."""
+    nav = "".join(
+        f'<li><a href="/en/comps/{i}/History/">Competition {i}</a></li>'
+        for i in range(nav_links)
+    )
+    return (
+        "<!DOCTYPE html>"
+        '<html lang="en" class="no-js"><head><meta charset="utf-8">'
+        f"<title>{_e(title)} | FBref.com</title>"
+        '<link rel="stylesheet" href="https://cdn.ssref.net/req/1/css/fb.css">'
+        "<script>var sr_goog_ad_units = []; if (1 < 2) { window.x = 1; }</script>"
+        '</head><body class="fb"><div id="wrap">'
+        f'<div id="header"><nav id="nav"><ul>{nav}</ul></nav></div>'
+        f'<div id="content" role="main" class="box">{content}</div>'
+        f'<div id="footer"><ul>{nav[: len(nav) // 4]}</ul>'
+        "<p>Copyright &copy; Sports Reference LLC.</p></div>"
+        "</div></body></html>"
+    )
+
+
+def _table(table_id: str, stats: list[str], labels: list[str], rows: list[str]) -> str:
+    head = "".join(
+        f'<th aria-label="{_e(label)}" data-stat="{_e(stat)}" scope="col" '
+        f'class="poptip sort_default_asc center">{_e(label)}</th>'
+        for stat, label in zip(stats, labels)
+    )
+    return (
+        f'<div class="table_container" id="div_{table_id}">'
+        f'<table class="stats_table sortable min_width" id="{_e(table_id)}" '
+        f'data-cols-to-freeze=",2"><caption>{_e(table_id)} Table</caption>'
+        f'<thead><tr class="over_header"><th data-stat="header" colspan="3" '
+        f'class="over_header center"></th></tr><tr>{head}</tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table></div>"
+    )
+
+
+def _season_csvs(league_name: str, season_year: str, pattern: str) -> list[str]:
+    return sorted(
+        glob.glob(
+            os.path.join(
+                data_dir, league_name, f"{pattern}-{league_name}-{season_year}.csv"
+            )
+        )
+    )
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def league_page(league_name: str, season_year: str) -> str:
+    """Renders a league's stats page from its saved league tables."""
+    tables = []
+    for path in _season_csvs(league_name, season_year, "*"):
+        table_id = os.path.basename(path).removesuffix(
+            f"-{league_name}-{season_year}.csv"
+        )
+        if not table_id.startswith(("stats_squads_", "results")):
+            continue
+        df = _read_csv(path)
+        is_away = "against" in table_id
+        stats = [
+            c
+            for c in df.columns
+            if c not in _DERIVED_COLUMNS
+            and c not in ("team_id", "team_url", "logo_url")
+        ]
+        names = [c.removesuffix("_away") if is_away else c for c in stats]
+        rows = []
+        for record in df.to_dict(orient="records"):
+            cells = []
+            for stat, name in zip(stats, names):
+                if name == "team":
+                    logo = (
+                        f'<img src="{_e(record["logo_url"])}" class="teamlogo" '
+                        'alt="Club Crest"> '
+                        if record.get("logo_url")
+                        else ""
+                    )
+                    team = f"vs {record['team']}" if is_away else record["team"]
+                    cells.append(
+                        f'<td class="left" data-stat="team">{logo}'
+                        f'<a href="{_e(record["team_url"])}">{_e(team)}</a></td>'
+                    )
+                elif name == "rank":
+                    cells.append(
+                        f'<th scope="row" data-stat="rank">{_e(record[stat])}</th>'
+                    )
+                else:
+                    cells.append(
+                        f'<td class="right" data-stat="{_e(name)}">'
+                        f"{_e(record[stat])}</td>"
+                    )
+            rows.append(f"<tr>{''.join(cells)}</tr>")
+        tables.append(_table(table_id, names, names, rows))
+    return _page(f"{season_year} {league_name} Stats", "".join(tables))
+
+
+def players_page(league_name: str, season_year: str, category: str) -> str:
+    """Renders a league's player stats page of one category."""
+    pattern = f"player_data/player_stats_{category}"
+    df = _read_csv(_season_csvs(league_name, season_year, pattern)[0])
+    compound = {
+        "player_link": "player",
+        "player_id": "player",
+        "player_name": "player",
+        "team_id": "team",
+        "team_name": "team",
+        "team_link": "team",
+        "matches_link": "matches",
+    }
+    stats: list[str] = ["ranker"]
+    for column in df.columns:
+        stat = compound.get(column, column)
+        if stat not in stats and column not in _DERIVED_COLUMNS:
+            stats.append(stat)
+
+    rows = []
+    for i, record in enumerate(df.to_dict(orient="records"), start=1):
+        cells = []
+        for stat in stats:
+            if stat == "ranker":
+                cells.append(
+                    f'<th scope="row" class="right" data-stat="ranker">{i}</th>'
+                )
+            elif stat == "player":
+                cells.append(
+                    '<td class="left" data-stat="player" '
+                    f'csk="{_e(record["player_name"])}">'
+                    f'<a href="{_e(record["player_link"])}">'
+                    f'{_e(record["player_name"])}</a></td>'
+                )
+            elif stat == "team":
+                cells.append(
+                    '<td class="left" data-stat="team">'
+                    f'<a href="{_e(record["team_link"])}">'
+                    f'{_e(record["team_name"])}</a></td>'
+                )
+            elif stat == "nationality":
+                nationality = record["nationality"]
+                code = nationality.rstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+                cells.append(
+                    '<td class="left poptip" data-stat="nationality">'
+                    '<a href="/en/country/x">'
+                    f'<span style="white-space: nowrap"><span class="f-i f-{_e(code)}">'
+                    f"{_e(code)}</span> {_e(nationality[len(code):])}</span></a></td>"
+                )
+            elif stat == "matches":
+                cells.append(
+                    f'<td class="left group_start" data-stat="matches">'
+                    f'<a href="{_e(record["matches_link"])}">Matches</a></td>'
+                )
+            else:
+                cells.append(
+                    f'<td class="right" data-stat="{_e(stat)}">{_e(record[stat])}</td>'
+                )
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+        if i % 25 == 0:
+            header = "".join(f'<th data-stat="{_e(s)}">{_e(s)}</th>' for s in stats)
+            rows.append(f'<tr class="thead">{header}</tr>')
+    return _page(
+        f"{season_year} {league_name} Player Stats",
+        _table(f"stats_{category}", stats, stats, rows),
+    )
+
+
+def player_categories(league_name: str, season_year: str) -> tuple[str, ...]:
+    """Returns the player stats categories saved for a season."""
+    prefix = os.path.join(data_dir, league_name, "player_data", "player_stats_")
+    return tuple(
+        path.removeprefix(prefix).removesuffix(f"-{league_name}-{season_year}.csv")
+        for path in _season_csvs(league_name, season_year, "player_data/player_stats_*")
+    )
+
+
+def schedule_page(league_name: str, season_year: str) -> str:
+    """Renders a season's scores and fixtures page."""
+    df = _read_csv(_season_csvs(league_name, season_year, "schedule")[0])
+    stats = [
+        "gameweek",
+        "dayofweek",
+        "date",
+        "start_time",
+        "home_team",
+        "score",
+        "away_team",
+        "attendance",
+        "venue",
+        "referee",
+        "match_report",
+    ]
+    rows = []
+    week = None
+    for record in df.to_dict(orient="records"):
+        if week is not None and record["match_week"] != week:
+            rows.append(
+                '<tr class="spacer partial_table result_all">'
+                f'<td colspan="{len(stats)}"></td></tr>'
+            )
+        week = record["match_week"]
+        attendance = (
+            f"{int(record['attendance']):,}" if record["attendance"].isdigit() else ""
+        )
+        rows.append(
+            f'<tr><th scope="row" class="right" data-stat="gameweek">{_e(week)}</th>'
+            f'<td class="left" data-stat="dayofweek">{_e(record["day"])}</td>'
+            f'<td class="left" data-stat="date">{_e(record["date"])}</td>'
+            '<td class="right" data-stat="start_time"><span class="venuetime" '
+            f'data-venue-epoch="{_e(record["schedule_epoch"])}">20:00</span></td>'
+            '<td class="right" data-stat="home_team">'
+            f'<a href="{_e(record["home_team_link"])}">'
+            f'{_e(record["home_team_name"])}</a></td>'
+            '<td class="center" data-stat="score">'
+            f'<a href="{_e(record["match_link"])}">'
+            f'{_e(record["score"])}</a></td>'
+            '<td class="left" data-stat="away_team">'
+            f'<a href="{_e(record["away_team_link"])}">'
+            f'{_e(record["away_team_name"])}</a></td>'
+            '<td class="right" data-stat="attendance" '
+            f'csk="{_e(record["attendance"])}">'
+            f"{attendance}</td>"
+            f'<td class="left" data-stat="venue">{_e(record["venue"])}</td>'
+            f'<td class="left" data-stat="referee">{_e(record["referee"])}</td>'
+            '<td class="left" data-stat="match_report">'
+            f'<a href="{_e(record["match_link"])}">'
+            "Match Report</a></td></tr>"
+        )
+    table_id = f"sched_{season_year}_{league_name}_1"
+    return _page(
+        f"{season_year} {league_name} Scores and Fixtures",
+        _table(table_id, stats, stats, rows),
+    )
+
+
+def _player_cell(player: dict[str, Any]) -> str:
+    return (
+        f'<th scope="row" class="left" data-stat="player">'
+        f'<a href="{_e(player["link"])}">{_e(player["name"])}</a></th>'
+    )
+
+
+def _stat_cell(stat: str, value: Any) -> str:
+    if stat == "nationality" and isinstance(value, str):
+        code = value.rstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        return (
+            f'<td class="left" data-stat="nationality"><a href="/en/country/x">'
+            f'<span style="white-space: nowrap"><span class="f-i f-{_e(code)}">'
+            f"{_e(code)}</span> {_e(value[len(code):])}</span></a></td>"
+        )
+    if stat == "age" and value is not None:
+        value = f"{value}-123"
+    text = "" if value is None else value
+    return f'<td class="right" data-stat="{_e(stat)}">{_e(text)}</td>'
+
+
+def _player_stats_table(table_id: str, players: list[dict[str, Any]], key: str) -> str:
+    players = [p for p in players if key in p]
+    if not players:
+        return ""
+    stats = [s for s in players[0][key] if s != "fbref_id"]
+    head = "".join(f'<th data-stat="{_e(s)}" scope="col">{_e(s)}</th>' for s in stats)
+    rows = [
+        "<tr>"
+        + _player_cell(p)
+        + "".join(_stat_cell(s, p[key].get(s)) for s in stats)
+        + "</tr>"
+        for p in players
+    ]
+    total = "".join(f'<td class="right" data-stat="{_e(s)}"></td>' for s in stats)
+    return (
+        f'<div class="table_container" id="div_{table_id}">'
+        f'<table class="stats_table sortable" id="{_e(table_id)}"><thead>'
+        f'<tr class="over_header"><th colspan="6"></th></tr>'
+        f'<tr><th data-stat="player" scope="col">Player</th>{head}</tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody>"
+        f'<tfoot><tr><th data-stat="player">{len(players)} Players</th>{total}</tr>'
+        "</tfoot></table></div>"
+    )
+
+
+def _team_box(team: dict[str, Any]) -> str:
+    captain = team["captain"]
+    return (
+        '<div><div><strong><a itemprop="name" href="/en/squads/'
+        f'{_e(team["team_id"])}/">{_e(team["team_name"])}</a></strong></div>'
+        f'<div class="media-item logo loader"><img src="{_e(team["logo_url"])}" '
+        'class="teamlogo"></div>'
+        f'<div class="scores"><div class="score">{_e(team["score"])}</div>'
+        f'<div class="score_xg">{_e(team["xg"])}</div></div>'
+        f"<div>{_e(team['record'])}</div>"
+        f'<div class="datapoint"><strong>Manager</strong>: {_e(team["manager"])}</div>'
+        '<div class="datapoint"><strong>Captain</strong>: '
+        f'<a href="/en/players/{_e(captain["fbref_id"])}/x">{_e(captain["name"])}</a>'
+        "</div></div>"
+    )
+
+
+def _lineup(side: str, team: dict[str, Any]) -> str:
+    starters = "".join(
+        f'<tr><td>{_e(p["number"])}</td><td><a href="/en/players/'
+        f'{_e(p["fbref_id"])}/x">{_e(p["name"])}</a></td></tr>'
+        for p in team["lineup"]
+    )
+    bench = "".join(
+        f'<tr><td>{i}</td><td><a href="{_e(p["link"])}">{_e(p["name"])}</a></td></tr>'
+        for i, p in enumerate(team["player_stats"][len(team["lineup"]) :], start=40)
+    )
+    return (
+        f'<div class="lineup" id="{side}"><table><tr><th colspan="2">'
+        f'{_e(team["team_name"])} ({_e(team["formation"])})</th></tr>{starters}'
+        f'<tr><th colspan="2">Bench</th></tr>{bench}</table></div>'
+    )
+
+
+def _event(side: str, event: dict[str, Any]) -> str:
+    players = event["event"]
+    if event["event_type"] == "substitute_in":
+        players = players[::-1]
+    links = [f'<a href="{_e(p["link"])}">{_e(p["name"])}</a>' for p in players]
+    if event["event_type"] == "goal" and len(links) == 2:
+        block = f"<div>&#8203;{links[0]}<small>Assist: {links[1]}</small></div>"
+    elif event["event_type"] == "substitute_in":
+        block = f"<div>&#8203;{links[0]}<br><small>for {links[1]}</small></div>"
+    else:
+        block = f"<div>&#8203;{''.join(links)}</div>"
+    return (
+        f'<div class="event {side}"><div>{_e(event["time"])}</div>'
+        f'<div class="event_icon {_e(event["event_type"])}"></div>{block}</div>'
+    )
+
+
+def _team_stats(home: dict[str, Any], away: dict[str, Any]) -> str:
+    def bar(text: str) -> str:
+        return f"<td><div><div>{text}</div><div></div></div></td>"
+
+    rows = [
+        f'<tr><th><span class="teamandlogo">{_e(home["team_name"])}</span></th>'
+        f'<th><span class="teamandlogo">{_e(away["team_name"])}</span></th></tr>'
+    ]
+    formats = {
+        "possession": lambda s: f"<strong>{s}%</strong>",
+        "passing_accuracy": lambda s: (
+            f"{s['completed']} of {s['total']}&nbsp;—&nbsp;"
+            f"<strong>{s['accuracy']}%</strong>"
+        ),
+        "shots_on_target": lambda s: (
+            f"{s['on_target']} of {s['total_shots']}&nbsp;—&nbsp;"
+            f"<strong>{s['percentage']}%</strong>"
+        ),
+        "saves": lambda s: (
+            f"{s['shots_saved']} of {s['shots_faced']}&nbsp;—&nbsp;"
+            f"<strong>{s['percentage']}%</strong>"
+        ),
+    }
+    stats = away.get("team_stats") or home.get("team_stats") or {}
+    for key, render in formats.items():
+        if key not in stats:
+            continue
+        label = key.replace("_", " ").title()
+        home_stat = home["team_stats"].get(key, stats[key])
+        away_stat = away["team_stats"].get(key, stats[key])
+        rows.append(f'<tr><th colspan="2">{label}</th></tr>')
+        rows.append(f"<tr>{bar(render(home_stat))}{bar(render(away_stat))}</tr>")
+
+    extra = away.get("extra_team_stats") or {}
+    blocks = []
+    keys = list(extra)
+    for i in range(0, len(keys), 4):
+        cells = "".join(
+            f"<div>{_e(home['extra_team_stats'].get(k, extra[k]))}</div>"
+            f"<div>{_e(k.replace('_', ' ').title())}</div>"
+            f"<div>{_e(extra[k])}</div>"
+            for k in keys[i : i + 4]
+        )
+        blocks.append(
+            f'<div><div class="th">{_e(home["team_name"])}</div>'
+            f'<div class="th">&nbsp;</div><div class="th">{_e(away["team_name"])}</div>'
+            f"{cells}</div>"
+        )
+    return (
+        f'<div id="team_stats"><h2>Team Stats</h2><table><tbody>{"".join(rows)}'
+        f'</tbody></table></div><div id="team_stats_extra">{"".join(blocks)}</div>'
+    )
+
+
+def match_page(path: str) -> str:
+    """Renders a match report page from a match JSON the scraper saved."""
+    with open(path) as f:
+        match = json.load(f)
+    home, away = match["home_team"], match["away_team"]
+
+    events = "".join(
+        _event(side, event)
+        for side, team in (("a", home), ("b", away))
+        for event in team["events"]
+    )
+    stat_types = [
+        key.removesuffix("_stats")
+        for key in (home["player_stats"] or [{}])[0]
+        if key.endswith("_stats")
+    ]
+    switcher = "".join(
+        f'<div><a data-show="switcher_player_stats_{_e(home["team_id"])}_{t}">'
+        f"{t}</a></div>"
+        for t in stat_types
+    )
+    player_tables = "".join(
+        _player_stats_table(
+            f"stats_{team['team_id']}_{t}", team["player_stats"], f"{t}_stats"
+        )
+        for team in (home, away)
+        for t in stat_types
+    ) + "".join(
+        _player_stats_table(
+            f"keeper_stats_{team['team_id']}", team["player_stats"], "keeper_stats"
+        )
+        for team in (home, away)
+    )
+    content = (
+        f"<h1>{_e(match['match_name'])} Match Report – {_e(match['match_date'])}</h1>"
+        f'<div class="scorebox">{_team_box(home)}{_team_box(away)}'
+        '<div class="scorebox_meta"><div>'
+        f'<span class="venuetime">{_e(match["match_date"])}</span></div>'
+        "<div><a>Premier League</a></div>"
+        "<div><small><strong>Attendance</strong>: "
+        f"{_e(match['match_attendance'])}</small></div>"
+        f"<div><small><strong>Venue</strong>: {_e(match['venue'])}</small></div>"
+        "<div><small><strong>Officials</strong>: Robert Jones (Referee)</small></div>"
+        "</div></div>"
+        f'<div id="field_wrap">{_lineup("a", home)}{_lineup("b", away)}</div>'
+        f'<div id="events_wrap">{events}</div>'
+        f"{_team_stats(home, away)}"
+        f'<div class="filter switcher">{switcher}</div>'
+        f"{player_tables}"
+    )
+    return _page(f"{match['match_name']} Match Report", content)
+
+
+def match_data_for(path: str) -> dict[str, str]:
+    """Returns the ``MatchData`` a saved match JSON was scraped with."""
+    with open(path) as f:
+        match = json.load(f)
+    return {
+        "league_name": "Premier-League",
+        "fbref_id": match["fbref_id"],
+        "home_team": match["home_team"]["team_name"].replace(" ", "-"),
+        "away_team": match["away_team"]["team_name"].replace(" ", "-"),
+        "date": "August-16-2024",
+    }
+
+
+_TABLE_CONTAINER = re.compile(
+    r'<div class="table_container" id="div_[^"]*">.*?</table></div>', re.DOTALL
+)
+
+
+def as_raw(fixture: Fixture) -> Fixture:
+    """Returns the fixture as FBRef serves it, before JavaScript runs.
+
+    FBRef leaves every table but the first few of a page inside comments, the
+    results tables of a league page and none of the player or match tables.
+    The schedule is served as it is rendered, so it has no raw variant.
+    """
+    keep = 2 if fixture["kind"] == "league" else 0
+    count = 0
+
+    def comment_out(match: re.Match) -> str:
+        nonlocal count
+        count += 1
+        if count <= keep:
+            return match.group(0)
+        return f'<div class="placeholder"></div>\n<!--\n{match.group(0)}\n-->'
+
+    return Fixture(
+        name=f"{fixture['name']}-raw",
+        kind=fixture["kind"],
+        html=_TABLE_CONTAINER.sub(comment_out, fixture["html"]),
+        params=fixture["params"],
+    )
+
+
+def _match_paths() -> list[str]:
+    """Returns the saved matches, those with team stats first."""
+
+    def has_team_stats(path: str) -> bool:
+        with open(path) as f:
+            return bool(json.load(f)["home_team"].get("team_stats"))
+
+    paths = sorted(glob.glob(os.path.join(data_dir, "matches", "*.json")))
+    return sorted(paths, key=lambda path: not has_team_stats(path))
+
+
+def all_fixtures(
+    league_name: str = "Premier-League",
+    season_year: str = "2024-2025",
+    categories: tuple[str, ...] = ("standard", "keeper", "shooting"),
+    matches: int = 3,
+) -> list[Fixture]:
+    """Renders one page of every kind the scrapers parse.
+
+    Args:
+        league_name: The league whose saved data the pages are built from.
+        season_year: The season whose saved data the pages are built from.
+        categories: The player stats categories to render.
+        matches: How many of the saved matches to render.
+
+    Returns:
+        The rendered pages.
+    """
+    params = {"league_name": league_name, "fbref_id": 9, "season_year": season_year}
+    fixtures = [
+        Fixture(
+            name=f"league-{league_name}-{season_year}",
+            kind="league",
+            html=league_page(league_name, season_year),
+            params=params,
+        ),
+        Fixture(
+            name=f"schedule-{league_name}-{season_year}",
+            kind="schedule",
+            html=schedule_page(league_name, season_year),
+            params=params,
+        ),
+    ]
+    fixtures += [
+        Fixture(
+            name=f"players-{category}-{league_name}-{season_year}",
+            kind="players",
+            html=players_page(league_name, season_year, category),
+            params={**params, "category": category},
+        )
+        for category in categories
+    ]
+    for path in _match_paths()[:matches]:
+        fixtures.append(
+            Fixture(
+                name=f"match-{os.path.basename(path).removesuffix('.json')}",
+                kind="match",
+                html=match_page(path),
+                params={"match_data": match_data_for(path)},
+            )
+        )
+    return fixtures
+
+
+def checked_in_fixtures() -> list[Fixture]:
+    """Renders the pages kept under ``pages_dir``, one or two of every kind."""
+    return all_fixtures(categories=("standard", "keeper"), matches=1)
+
+
+def write_pages(fixtures: list[Fixture], directory: str = pages_dir):
+    """Saves rendered pages gzipped, with a manifest of what each one is.
+
+    The archives carry no timestamp, so re-rendering unchanged pages leaves
+    the files as they were.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = []
+    for fixture in fixtures:
+        file = f"{fixture['name']}.html.gz"
+        with open(os.path.join(directory, file), "wb") as f:
+            f.write(gzip.compress(fixture["html"].encode("utf-8"), mtime=0))
+        manifest.append(
+            {
+                "name": fixture["name"],
+                "kind": fixture["kind"],
+                "file": file,
+                "params": fixture["params"],
+            }
+        )
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def load_pages(directory: str = pages_dir) -> list[Fixture]:
+    """Loads the pages saved by ``write_pages``."""
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    fixtures = []
+    for entry in manifest:
+        path = os.path.join(directory, entry["file"])
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            fixtures.append(
+                Fixture(
+                    name=entry["name"],
+                    kind=entry["kind"],
+                    html=f.read(),
+                    params=entry["params"],
+                )
+            )
+    return fixtures
+
+
+if __name__ == "__main__":
+    write_pages(checked_in_fixtures())
+    print(f"💾 Saved the benchmark pages to {pages_dir}")
@@ -0,0 +1,110 @@
+"""Times the match page lookups through ``PageIndex`` against tree searches.
+
+``parse_match_page`` used to search the soup once per lookup: the header,
+the scorebox, each team's lineup twice and events, the team stats, the
+stats switcher, and a table per stat type and team. Those same lookups are
+run here both ways on the section soup of every match fixture, the index
+paying for its one walk of the tree, and the full parse is timed as well.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.match_index_benchmark --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import all_fixtures
+from benchmarks.parser_benchmark import best_of
+from benchmarks.parser_parity import parse_fixture
+from scraper.fbref_match_scraper import FBRefMatchScraper
+from scraper.page_index import PageIndex
+from scraper.table_extract import make_section_soup
+
+
+def _stat_types(soup: BeautifulSoup) -> list[str]:
+    return [
+        a["data-show"].removeprefix("switcher_player_stats_").split("_", 1)[1]
+        for a in soup.find("div", class_="filter switcher").find_all("a")
+    ]
+
+
+def search_tree(soup: BeautifulSoup, team_ids: list[str], stat_types: list[str]):
+    """Makes the lookups of a match parse with one tree search each."""
+    soup.select_one("div#content > h1")
+    soup.find("div", class_="scorebox_meta")
+    soup.find("div", class_="scorebox")
+    for side in ("a", "b"):
+        soup.find("div", id=side, class_="lineup")
+        soup.find("div", id=side, class_="lineup")
+        soup.find_all("div", class_=f"event {side}")
+    soup.find("div", id="team_stats")
+    soup.select_one("#team_stats_extra")
+    soup.find("div", class_="filter switcher")
+    for team_id in team_ids:
+        for stat_type in stat_types:
+            soup.find("table", id=f"stats_{team_id}_{stat_type}")
+        soup.find("table", id=f"keeper_stats_{team_id}")
+
+
+def search_index(soup: BeautifulSoup, team_ids: list[str], stat_types: list[str]):
+    """Makes the same lookups through a ``PageIndex`` of the page."""
+    page = PageIndex(soup)
+    page.by_id("content", "div")
+    page.first_by_class("scorebox_meta", "div")
+    page.first_by_class("scorebox", "div")
+    for side in ("a", "b"):
+        page.by_id(side, "div", "lineup")
+        page.by_id(side, "div", "lineup")
+        page.by_class(f"event {side}", "div")
+    page.by_id("team_stats", "div")
+    page.by_id("team_stats_extra")
+    page.first_by_class("filter switcher", "div")
+    for team_id in team_ids:
+        for stat_type in stat_types:
+            page.table(f"stats_{team_id}_{stat_type}")
+        page.table(f"keeper_stats_{team_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fixtures = [
+        fixture
+        for fixture in all_fixtures(args.league, args.season, matches=args.matches)
+        if fixture["kind"] == "match"
+    ]
+    print(
+        f"{'page':<48} {'tree searches':>14} {'index':>10} {'full parse':>12} "
+        f"{'speedup':>7}"
+    )
+    for fixture in fixtures:
+        soup = make_section_soup(fixture["html"], FBRefMatchScraper.sections)
+        team_ids = [
+            div.find("img")["src"].split("/")[-1].split(".")[0]
+            for div in soup.find("div", class_="scorebox").find_all(
+                "div", recursive=False
+            )[:2]
+        ]
+        stat_types = _stat_types(soup)
+        searches = best_of(lambda: search_tree(soup, team_ids, stat_types), args.repeat)
+        index = best_of(lambda: search_index(soup, team_ids, stat_types), args.repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse = best_of(lambda: parse_fixture(fixture), args.repeat)
+        print(
+            f"{fixture['name']:<48} {searches * 1000:>12.1f}ms "
+            f"{index * 1000:>8.1f}ms {parse * 1000:>10.1f}ms "
+            f"{searches / index:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Times each parser backend on the fixture pages.
+
+For every page two timings are taken per backend, each the best of
+``--repeat`` runs: building the soup alone, and the scraper's whole parse
+(soup plus extraction). The speedup over ``html.parser`` is printed next to
+each, so the gain of a backend can be told apart from the time the
+extraction code itself takes.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.parser_benchmark --repeat 5
+"""
+
+import argparse
+import gc
+import time
+from typing import Callable
+
+from benchmarks.fixtures import Fixture, all_fixtures
+from benchmarks.parser_parity import parse_fixture
+from scraper.html_parser import (
+    PARSER_BACKENDS,
+    ParserBackend,
+    make_soup,
+    set_parser_backend,
+)
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Returns the fastest of ``repeat`` runs of ``func``, in seconds.
+
+    The garbage left by the previous run is collected first, so it is not
+    counted against the next one.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark(
+    fixtures: list[Fixture],
+    backends: tuple[ParserBackend, ...] = PARSER_BACKENDS,
+    repeat: int = 3,
+) -> dict[str, dict[str, tuple[float, float]]]:
+    """Times the soup and the full parse of every page with every backend.
+
+    Returns:
+        The ``(soup_seconds, parse_seconds)`` per page name and backend.
+    """
+    results: dict[str, dict[str, tuple[float, float]]] = {}
+    for fixture in fixtures:
+        results[fixture["name"]] = {}
+        for backend in backends:
+            set_parser_backend(backend)
+            soup = best_of(lambda: make_soup(fixture["html"], backend), repeat)
+            parse = best_of(lambda: parse_fixture(fixture), repeat)
+            results[fixture["name"]][backend] = (soup, parse)
+    return results
+
+
+def print_results(results: dict[str, dict[str, tuple[float, float]]]):
+    """Prints the timings and the speedups over ``html.parser``."""
+    print(f"{'page':<48} {'backend':<12} {'soup':>16} {'parse':>16}")
+    totals: dict[str, list[float]] = {}
+    for name, timings in results.items():
+        base_soup, base_parse = timings.get("html.parser", (0.0, 0.0))
+        for backend, (soup, parse) in timings.items():
+            total = totals.setdefault(backend, [0.0, 0.0])
+            total[0] += soup
+            total[1] += parse
+            soup_x = f"{base_soup / soup:.1f}x" if base_soup else ""
+            parse_x = f"{base_parse / parse:.1f}x" if base_parse else ""
+            print(
+                f"{name:<48} {backend:<12} {soup * 1000:>8.1f}ms {soup_x:>6} "
+                f"{parse * 1000:>8.1f}ms {parse_x:>6}"
+            )
+    base_soup, base_parse = totals.get("html.parser", [0.0, 0.0])
+    for backend, (soup, parse) in totals.items():
+        soup_x = f"{base_soup / soup:.1f}x" if base_soup else ""
+        parse_x = f"{base_parse / parse:.1f}x" if base_parse else ""
+        print(
+            f"{'total':<48} {backend:<12} {soup * 1000:>8.1f}ms {soup_x:>6} "
+            f"{parse * 1000:>8.1f}ms {parse_x:>6}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--backend", action="append", choices=PARSER_BACKENDS, dest="backends"
+    )
+    args = parser.parse_args()
+
+    fixtures = all_fixtures(args.league, args.season, matches=args.matches)
+    results = benchmark(fixtures, tuple(args.backends or PARSER_BACKENDS), args.repeat)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
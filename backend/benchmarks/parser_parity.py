@@ -0,0 +1,159 @@
+"""Checks every parser backend produces the same data as ``html.parser``.
+
+Each fixture page is parsed by its scraper once per backend and the
+resulting datasets are compared with the ``html.parser`` ones, which is what
+the scrapers were written against. Pages FBRef serves with their tables in
+comments are checked raw as well. The random ``id`` columns the scrapers
+add are left out of the comparison.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.parser_parity
+
+The exit status is 1 if any backend disagrees, so it can gate a change to a
+parser or to ``scraper.html_parser``.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from typing import Any
+
+import pandas as pd
+
+from benchmarks.fixtures import Fixture, all_fixtures, as_raw
+from scraper.html_parser import PARSER_BACKENDS, ParserBackend, set_parser_backend
+
+
+def _scraper_for(fixture: Fixture) -> Any:
+    params = fixture["params"]
+    if fixture["kind"] == "league":
+        from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+
+        return FBRefPlaywrightScraper(
+            params["league_name"], params["fbref_id"], params["season_year"]
+        )
+    if fixture["kind"] == "players":
+        from scraper.fbref_players_data_scrape import FBRefPlayerScraper
+
+        return FBRefPlayerScraper(
+            params["league_name"], params["fbref_id"], params["season_year"]
+        )
+    if fixture["kind"] == "schedule":
+        from scraper.fbref_competition_schedule_scrape import (
+            FBRefCompetitionScheduleScraper,
+        )
+
+        return FBRefCompetitionScheduleScraper(
+            params["league_name"], params["fbref_id"], params["season_year"]
+        )
+    from scraper.fbref_match_scraper import FBRefMatchScraper
+
+    return FBRefMatchScraper(params["match_data"])
+
+
+def parse_fixture(fixture: Fixture) -> Any:
+    """Parses a fixture with its scraper and returns the scraper's dataset."""
+    scraper = _scraper_for(fixture)
+    html = fixture["html"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        if fixture["kind"] == "league":
+            scraper.parse_tables(html)
+        elif fixture["kind"] == "players":
+            scraper._parse_commented_table(html, fixture["params"]["category"])
+        elif fixture["kind"] == "schedule":
+            scraper.parse_schedule(html)
+        else:
+            scraper.parse_match_page(html)
+    return scraper.dataset
+
+
+def normalize(value: Any) -> Any:
+    """Turns a dataset into plain data, without the random ``id`` columns."""
+    if isinstance(value, pd.DataFrame):
+        return value.drop(columns=["id"], errors="ignore").to_dict(orient="records")
+    if isinstance(value, dict):
+        return {k: normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [normalize(v) for v in value]
+    return value
+
+
+def first_difference(expected: Any, actual: Any, path: str = "") -> str | None:
+    """Returns where two normalized datasets first differ, None if equal."""
+    if type(expected) is not type(actual):
+        return f"{path}: {type(expected).__name__} != {type(actual).__name__}"
+    if isinstance(expected, dict):
+        if expected.keys() != actual.keys():
+            missing = sorted(map(str, expected.keys() ^ actual.keys()))
+            return f"{path}: keys differ {missing[:10]}"
+        for key in expected:
+            diff = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if diff:
+                return diff
+        return None
+    if isinstance(expected, list):
+        if len(expected) != len(actual):
+            return f"{path}: {len(expected)} items != {len(actual)}"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            diff = first_difference(e, a, f"{path}[{i}]")
+            if diff:
+                return diff
+        return None
+    if expected != actual and not (expected != expected and actual != actual):
+        return f"{path}: {expected!r} != {actual!r}"
+    return None
+
+
+def check(
+    fixtures: list[Fixture], backends: tuple[ParserBackend, ...] = PARSER_BACKENDS
+) -> int:
+    """Compares each backend with ``html.parser`` on every fixture.
+
+    Pages FBRef serves with tables in comments are also parsed raw, with
+    every backend, and must give the same data as the rendered page.
+
+    Returns:
+        The number of pages and backends that disagree.
+    """
+    failures = 0
+    for fixture in fixtures:
+        set_parser_backend("html.parser")
+        expected = normalize(parse_fixture(fixture))
+        variants = [fixture]
+        if fixture["kind"] != "schedule":
+            variants.append(as_raw(fixture))
+        for variant in variants:
+            for backend in backends:
+                if variant is fixture and backend == "html.parser":
+                    continue
+                set_parser_backend(backend)
+                actual = normalize(parse_fixture(variant))
+                diff = first_difference(expected, actual)
+                if diff:
+                    failures += 1
+                    print(f"❌ {variant['name']} [{backend}] {diff}")
+                else:
+                    print(f"✅ {variant['name']} [{backend}]")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument(
+        "--backend", action="append", choices=PARSER_BACKENDS, dest="backends"
+    )
+    args = parser.parse_args()
+
+    fixtures = all_fixtures(args.league, args.season, matches=args.matches)
+    failures = check(fixtures, tuple(args.backends or PARSER_BACKENDS))
+    print(f"📊 {failures} mismatches across {len(fixtures)} pages.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compares parsing only a page's sections with building its whole soup.
+
+Before the scrapers declared their ``PageSections`` every parse started by
+turning the whole page into a BeautifulSoup tree. For each fixture page this
+times and measures that whole-document soup against the soups the scraper
+builds now, of its sections and tables only, with the current parser
+backend. The extraction that follows is the same either way. Peak memory
+is the peak of Python allocations seen by ``tracemalloc``; Lexbor's own
+short lived C buffers are not included.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.partial_parse_benchmark --repeat 3
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable
+
+from benchmarks.fixtures import Fixture, all_fixtures
+from benchmarks.parser_benchmark import best_of
+from benchmarks.parser_parity import _scraper_for
+from scraper.html_parser import PARSER_BACKENDS, make_soup, set_parser_backend
+from scraper.table_extract import (
+    extract_table,
+    iter_table_html,
+    make_section_soup,
+    parse_table,
+)
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Returns the peak bytes allocated while ``func`` runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def section_soups(fixture: Fixture) -> list:
+    """Parses only what the fixture's scraper reads, as its parse does."""
+    html = fixture["html"]
+    if fixture["kind"] == "players":
+        return [extract_table(html, f"stats_{fixture['params']['category']}")]
+    sections = _scraper_for(fixture).sections
+    if fixture["kind"] == "match":
+        return [make_section_soup(html, sections)]
+    return [parse_table(fragment) for _, fragment in iter_table_html(html, sections)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", choices=PARSER_BACKENDS, default=None)
+    args = parser.parse_args()
+    if args.backend:
+        set_parser_backend(args.backend)
+
+    fixtures = all_fixtures(args.league, args.season, matches=args.matches)
+    print(f"{'page':<48} {'whole soup':>20} {'sections':>22} {'time':>6} {'mem':>6}")
+    totals = [0.0, 0, 0.0, 0]
+    for fixture in fixtures:
+        whole = lambda: make_soup(fixture["html"])
+        partial = lambda: section_soups(fixture)
+        timings = (
+            best_of(whole, args.repeat),
+            peak_memory(whole),
+            best_of(partial, args.repeat),
+            peak_memory(partial),
+        )
+        for i, value in enumerate(timings):
+            totals[i] += value
+        print_row(fixture["name"], *timings)
+    print_row("total", *totals)
+
+
+def print_row(
+    name: str,
+    whole_seconds: float,
+    whole_bytes: int,
+    partial_seconds: float,
+    partial_bytes: int,
+):
+    print(
+        f"{name:<48} {whole_seconds * 1000:>8.1f}ms {whole_bytes / 1e6:>7.1f}MB "
+        f"{partial_seconds * 1000:>10.1f}ms {partial_bytes / 1e6:>7.1f}MB "
+        f"{whole_seconds / partial_seconds:>5.1f}x {whole_bytes / partial_bytes:>5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
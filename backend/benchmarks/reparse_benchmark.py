@@ -0,0 +1,101 @@
+"""Measures how ``scraper.reparse`` scales with the number of workers.
+
+The fixture pages are stored in a throwaway HTML cache under as many URLs as
+``--copies`` asks for, so there is a backfill's worth of pages, and then
+re-parsed with each worker count in turn. The outputs go to a temporary
+directory. The pages per second of each run, and how close it gets to a
+linear speedup over one worker, are printed.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.reparse_benchmark --copies 10 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.fixtures import Fixture, all_fixtures
+from scraper.crawl import SCRAPERS
+from scraper.frontier import DONE, FrontierEntry
+from scraper.html_cache import HtmlCache
+from scraper.reparse import reparse
+
+
+def _entry(fixture: Fixture, copy: int) -> FrontierEntry:
+    """Returns a frontier entry for one copy of a fixture page."""
+    kind = fixture["kind"]
+    if kind == "match":
+        params = dict(fixture["params"]["match_data"])
+        url = SCRAPERS[kind](params).base_url
+    else:
+        params = dict(fixture["params"])
+        category = params.pop("category", None)
+        scraper = SCRAPERS[kind](**params)
+        if category is None:
+            url = scraper.base_url
+        else:
+            url = scraper.urls[category]
+            params["category"] = category
+    return FrontierEntry(
+        url=f"{url}?copy={copy}",
+        kind=kind,
+        league=None,
+        season=None,
+        priority=0,
+        status=DONE,
+        attempts=1,
+        last_fetched=None,
+        params=params,
+        error=None,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    fixtures = all_fixtures(args.league, args.season, matches=args.matches)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HtmlCache(os.path.join(tmp, "html_cache"))
+        entries = []
+        for copy in range(args.copies):
+            for fixture in fixtures:
+                entry = _entry(fixture, copy)
+                cache.put(entry["url"], fixture["html"])
+                entries.append(entry)
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            base = None
+            for workers in sorted(set(args.workers)):
+                summary = reparse(
+                    entries,
+                    workers=workers,
+                    chunk_size=args.chunk_size,
+                    cache_root=cache.root,
+                )
+                rate = summary["pages_per_second"]
+                base = base or rate / workers
+                print(
+                    f"{workers:>3} workers: {summary['pages']} pages in "
+                    f"{summary['seconds']:.1f}s, {rate:.1f} pages/s, "
+                    f"{rate / (base * workers):.0%} of linear, "
+                    f"{summary['failed']} failed, {summary['missing']} missing"
+                )
+        finally:
+            os.chdir(cwd)
+    print(f"🖥️ {os.cpu_count()} CPUs available.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measures the peak memory of writing a player table whole or streamed.
+
+A player stats table of the fixture pages is grown to ``--scale`` times its
+rows, then written to CSV both ways: extracted into one DataFrame written
+with ``to_csv``, as ``save_to_csv`` does, and streamed in batches of rows
+with ``write_csv``, as ``stream_to_csv`` does. The table's soup is built
+before measuring, so the peaks are those of the extraction and the writing
+alone. Both files are checked to hold the same data.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.streaming_benchmark --scale 1 4 16
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import players_page
+from benchmarks.partial_parse_benchmark import peak_memory
+from scraper.csv_stream import write_csv
+from scraper.extraction_plan import get_plan_registry
+from scraper.fbref_players_data_scrape import FBRefPlayerScraper, _player_rule
+from scraper.table_extract import extract_table
+
+
+def grown_table(html: str, category: str, scale: int):
+    """Returns the category's table with its body rows repeated ``scale`` times."""
+    table = extract_table(html, f"stats_{category}")
+    tbody = table.find("tbody")
+    rows = tbody.find_all("tr", recursive=False)
+    for _ in range(scale - 1):
+        for row in rows:
+            tbody.append(copy.copy(row))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--category", default="standard")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    html = players_page(args.league, args.season, args.category)
+    scraper = FBRefPlayerScraper(args.league, 9, args.season)
+    table_type = f"player_stats_{args.category}"
+    mismatches = 0
+    print(f"{'rows':>7} {'whole':>16} {'streamed':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_path = os.path.join(tmp, "whole.csv")
+        stream_path = os.path.join(tmp, "streamed.csv")
+        for scale in args.scale:
+            table = grown_table(html, args.category, scale)
+
+            def whole():
+                scraper._extract_player_data(table, args.category).to_csv(
+                    whole_path, index=False
+                )
+
+            def streamed():
+                write_csv(
+                    stream_path,
+                    get_plan_registry().iter_batches(
+                        table, table_type, "players", _player_rule, args.batch_size
+                    ),
+                )
+
+            results = []
+            for write in (whole, streamed):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    started = time.perf_counter()
+                    peak = peak_memory(write)
+                    results.append((peak, time.perf_counter() - started))
+            rows = len(table.find("tbody").find_all("tr", recursive=False))
+            (whole_peak, whole_s), (stream_peak, stream_s) = results
+            print(
+                f"{rows:>7} {whole_peak / 1e6:>6.1f}MB {whole_s:>6.2f}s "
+                f"{stream_peak / 1e6:>6.1f}MB {stream_s:>6.2f}s"
+            )
+            try:
+                pd.testing.assert_frame_equal(
+                    pd.read_csv(stream_path), pd.read_csv(whole_path)
+                )
+            except AssertionError as e:
+                mismatches += 1
+                print(f"❌ x{scale}: {e}")
+    print(f"📊 {mismatches} mismatches across {len(args.scale)} sizes.")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Benchmarks parsing, transforming and loading, and gates regressions.
+
+Every kind of page the scrapers parse is benchmarked on the pages checked in
+under ``benchmarks/pages/``: the league stats page, the standard and keeper
+player stats pages, the schedule and a match report. So is the work done on
+what the scrapers saved in ``scraped_data/``: validating the league table
+rows with ``ResultsOverallSchema``, turning the saved schedule into the
+matches to scrape, flattening the saved match JSON files and reading the
+player CSVs.
+
+Each case reports its latency (the best of ``--repeat`` runs), the rows it
+produced, its rows per second and the peak memory it allocated. The results
+can be saved with ``--save`` and compared with saved ones with
+``--baseline``. A case producing another number of rows, or slower or
+hungrier than its baseline by more than the baseline's ``tolerance``, is a
+regression and the exit status is 1. Latency gets a relative and an
+absolute allowance (``min_seconds``) for machine noise, and ``--threshold``
+overrides the relative ones.
+
+Row counts are the same on every machine, timings are not. The checked-in
+``benchmarks/baseline.json`` is therefore what CI checks rows against, and
+a timing gate compares two runs on the same machine: save a baseline from
+the base branch, then compare the change with it in the same job.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --rows-only
+    git checkout main && python -m benchmarks.suite --save /tmp/base.json
+    git checkout - && python -m benchmarks.suite --baseline /tmp/base.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+from typing import Any, Callable, TypedDict
+
+import pandas as pd
+from pydantic import ValidationError
+
+from benchmarks.fixtures import _season_csvs, data_dir, load_pages
+from benchmarks.parser_benchmark import best_of
+from benchmarks.parser_parity import parse_fixture
+from benchmarks.partial_parse_benchmark import peak_memory
+from pipeline.fbref_schemas import ResultsOverallSchema
+from scraper.match_batch import load_schedule_csv, pending_matches
+
+matches_dir = os.path.join(data_dir, "matches")
+
+
+class Case(TypedDict):
+    """A benchmarked piece of work.
+
+    Attributes:
+        name: The name of the case, unique in the suite.
+        kind: ``"parse"``, ``"transform"`` or ``"load"``.
+        run: Does the work and returns the number of rows it produced.
+    """
+
+    name: str
+    kind: str
+    run: Callable[[], int]
+
+
+class Tolerance(TypedDict):
+    """How much worse than its baseline a case may get.
+
+    Attributes:
+        seconds: The allowed slowdown, ``1.0`` for twice as slow.
+        peak_bytes: The allowed memory growth, ``0.1`` for 10%.
+        min_seconds: A slowdown allowed on top, so that noise on the
+            fastest cases is not taken for a regression.
+    """
+
+    seconds: float
+    peak_bytes: float
+    min_seconds: float
+
+
+DEFAULT_TOLERANCE = Tolerance(seconds=1.0, peak_bytes=0.1, min_seconds=0.01)
+
+
+class CaseResult(TypedDict):
+    """The measurements of a case."""
+
+    kind: str
+    seconds: float
+    rows: int
+    rows_per_second: float
+    peak_bytes: int
+
+
+def dataset_rows(dataset: Any) -> int:
+    """Counts the rows of a scraper's dataset.
+
+    Tables count their rows, a schedule its matches and a match report the
+    players of both teams.
+    """
+    if isinstance(dataset, pd.DataFrame):
+        return len(dataset)
+    if isinstance(dataset, list):
+        return len(dataset)
+    if isinstance(dataset, dict) and "home_team" in dataset:
+        return sum(
+            len(dataset[team].get("player_stats") or [])
+            for team in ("home_team", "away_team")
+        )
+    if isinstance(dataset, dict):
+        return sum(dataset_rows(value) for value in dataset.values())
+    return 0
+
+
+def _parse_case(fixture) -> Case:
+    return Case(
+        name=f"parse/{fixture['name']}",
+        kind="parse",
+        run=lambda: dataset_rows(parse_fixture(fixture)),
+    )
+
+
+def validate_results(path: str) -> int:
+    """Validates the rows of a saved league table, returns the valid ones."""
+    valid = 0
+    for record in pd.read_csv(path, dtype=str, keep_default_na=False).to_dict(
+        orient="records"
+    ):
+        try:
+            ResultsOverallSchema(**record)
+            valid += 1
+        except ValidationError:
+            pass
+    return valid
+
+
+def load_schedule(path: str) -> int:
+    """Turns a saved schedule into the matches to scrape, counts them."""
+    return len(pending_matches(load_schedule_csv(path), directory=os.devnull))
+
+
+def load_matches(directory: str = matches_dir) -> int:
+    """Flattens the players of the saved match files, counts them."""
+    players = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            match = json.load(f)
+        for team in ("home_team", "away_team"):
+            for player in match.get(team, {}).get("player_stats") or []:
+                players.append({"match_id": match.get("fbref_id"), **player})
+    return len(pd.json_normalize(players, sep="_"))
+
+
+def load_csvs(paths: list[str]) -> int:
+    """Reads saved CSV files, counts their rows."""
+    return sum(len(pd.read_csv(path)) for path in paths)
+
+
+def cases(league_name: str, season_year: str, results_season: str) -> list[Case]:
+    """Returns the cases of the suite.
+
+    Args:
+        league_name: The league whose saved data is loaded.
+        season_year: The season whose saved data is loaded.
+        results_season: The season whose league table rows are validated,
+            one saved with every column the schema requires.
+    """
+    suite = [_parse_case(fixture) for fixture in load_pages()]
+
+    results = _season_csvs(league_name, results_season, "results*_overall")
+    schedule = _season_csvs(league_name, season_year, "schedule")
+    players = _season_csvs(league_name, season_year, "player_data/player_stats_*")
+    if results:
+        suite.append(
+            Case(
+                name=f"transform/results_overall-{results_season}",
+                kind="transform",
+                run=lambda: validate_results(results[0]),
+            )
+        )
+    if schedule:
+        suite.append(
+            Case(
+                name=f"load/schedule-{season_year}",
+                kind="load",
+                run=lambda: load_schedule(schedule[0]),
+            )
+        )
+    suite.append(Case(name="load/match-json", kind="load", run=load_matches))
+    if players:
+        suite.append(
+            Case(
+                name=f"load/player-csvs-{season_year}",
+                kind="load",
+                run=lambda: load_csvs(players),
+            )
+        )
+    return suite
+
+
+def measure(case: Case, repeat: int) -> CaseResult:
+    """Runs a case ``repeat`` times for its latency, once more for memory."""
+    rows = 0
+
+    def run():
+        nonlocal rows
+        rows = case["run"]()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds = best_of(run, repeat)
+        peak = peak_memory(run)
+    return CaseResult(
+        kind=case["kind"],
+        seconds=seconds,
+        rows=rows,
+        rows_per_second=rows / seconds if seconds else 0.0,
+        peak_bytes=peak,
+    )
+
+
+def regressions(
+    results: dict[str, CaseResult],
+    baseline: dict[str, CaseResult],
+    tolerance: Tolerance = DEFAULT_TOLERANCE,
+    rows_only: bool = False,
+) -> list[str]:
+    """Returns what got worse than the baseline by more than ``tolerance``.
+
+    Args:
+        results: The results of this run, by case.
+        baseline: The saved results, by case.
+        tolerance: How much slower or hungrier a case may get.
+        rows_only: Only compare the rows, e.g. with a baseline saved on
+            another machine.
+
+    Returns:
+        A description of each regression.
+    """
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["rows"] != base["rows"]:
+            found.append(f"{name}: {base['rows']} rows before, {result['rows']} now")
+        if rows_only:
+            continue
+        allowed = {
+            "seconds": base["seconds"] * (1 + tolerance["seconds"])
+            + tolerance["min_seconds"],
+            "peak_bytes": base["peak_bytes"] * (1 + tolerance["peak_bytes"]),
+        }
+        for metric in ("seconds", "peak_bytes"):
+            if result[metric] > allowed[metric]:
+                found.append(
+                    f"{name}: {metric} {base[metric]:.4g} -> {result[metric]:.4g} "
+                    f"(+{result[metric] / base[metric] - 1:.0%})"
+                )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--results-season", default="2025-2026")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-k", dest="keyword", help="Only run cases containing this.")
+    parser.add_argument("--save", help="Save the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with the results in this file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="The allowed slowdown and memory growth, instead of the baseline's.",
+    )
+    parser.add_argument(
+        "--rows-only", action="store_true", help="Only compare the rows produced."
+    )
+    args = parser.parse_args()
+
+    baseline: dict[str, CaseResult] = {}
+    tolerance = DEFAULT_TOLERANCE
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            saved = json.load(f)
+        baseline = saved["cases"]
+        tolerance = saved.get("tolerance", tolerance)
+    if args.threshold is not None:
+        tolerance = Tolerance(
+            seconds=args.threshold,
+            peak_bytes=args.threshold,
+            min_seconds=tolerance["min_seconds"],
+        )
+
+    results: dict[str, CaseResult] = {}
+    print(f"{'case':<56} {'latency':>10} {'rows':>7} {'rows/s':>10} {'peak':>9}")
+    for case in cases(args.league, args.season, args.results_season):
+        if args.keyword and args.keyword not in case["name"]:
+            continue
+        result = results[case["name"]] = measure(case, args.repeat)
+        print(
+            f"{case['name']:<56} {result['seconds'] * 1000:>8.1f}ms "
+            f"{result['rows']:>7} {result['rows_per_second']:>10.0f} "
+            f"{result['peak_bytes'] / 1e6:>7.1f}MB"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "cpus": os.cpu_count(),
+                    "tolerance": tolerance,
+                    "cases": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"💾 Saved results to {args.save}")
+
+    if args.baseline:
+        found = regressions(results, baseline, tolerance, args.rows_only)
+        for regression in found:
+            print(f"❌ {regression}")
+        checked = "rows" if args.rows_only else f"{tolerance['seconds']:.0%} latency"
+        print(f"📊 {len(found)} regressions ({checked}) across {len(results)} cases.")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Times the league table extraction against the per-stat lookup it replaced.
+
+``FBRefPlaywrightScraper._get_table_stats_and_header`` used to look every
+stat up in every row with ``row.find``, after selecting the rows with
+``tbody tr:has(td)``. That version is kept below as the reference: the
+benchmark checks both produce the same DataFrame for every table of the
+league fixture page, then times each on the wide ``stats_squads_*`` tables.
+
+The reference gives text columns, so its numeric columns are typed with
+``coerce_numeric`` before the comparison, and the memory of its frames is
+printed next to the memory of the typed frames.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.table_extraction_benchmark --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+
+import pandas as pd
+
+from benchmarks.fixtures import league_page
+from benchmarks.parser_benchmark import best_of
+from scraper.extraction_plan import coerce_numeric
+from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.html_parser import make_soup
+
+
+def lookup_per_stat(table) -> pd.DataFrame:
+    """The extraction as it was, one ``row.find`` per stat and row."""
+    stat_tags = []
+
+    for th in table.find_all("th", attrs={"aria-label": True}):
+        stat_tag = th.get("data-stat")
+        if stat_tag:
+            stat_tags.append(stat_tag)
+
+    rows = []
+    is_away = "against" in (table.get("id") or "")
+    for row in table.select("tbody tr:has(td)"):
+        data = {}
+        for stat in stat_tags:
+            cell = row.find(attrs={"data-stat": stat})
+            if not cell:
+                continue
+
+            text = cell.get_text(strip=True)
+
+            if stat == "team":
+                anchor = cell.find("a")
+                if anchor:
+                    href = anchor.get("href", "")
+                    team_id = (
+                        href.split("/")[-3] if "squads" in href else href.split("/")[-2]
+                    )
+                    data["team_id"] = team_id
+                    data["team_url"] = href
+                    data["team"] = anchor.get_text(strip=True)
+
+                img = cell.find("img")
+                if img:
+                    data["logo_url"] = img.get("src")
+            else:
+                colname = f"{stat}_away" if is_away else stat
+                data[colname] = text
+        rows.append(data)
+
+    return pd.DataFrame(rows)
+
+
+def typed(frame: pd.DataFrame) -> pd.DataFrame:
+    """Types the numeric columns of a reference frame."""
+    text = [column for column in frame.columns if not column.startswith("team")]
+    numeric = coerce_numeric({column: frame[column].tolist() for column in text})
+    return frame.assign(**numeric)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scraper = FBRefPlaywrightScraper(args.league, 9, args.season)
+    soup = make_soup(league_page(args.league, args.season))
+    tables = [table for table in soup.select("table") if table.get("id")]
+
+    mismatches = 0
+    text_bytes = typed_bytes = 0
+    for table in tables:
+        with contextlib.redirect_stdout(io.StringIO()):
+            reference = lookup_per_stat(table)
+            actual = scraper._get_table_stats_and_header(table, table["id"])
+        expected = typed(reference)
+        text_bytes += reference.memory_usage(deep=True).sum()
+        typed_bytes += actual.memory_usage(deep=True).sum()
+        try:
+            pd.testing.assert_frame_equal(actual, expected)
+        except AssertionError as e:
+            mismatches += 1
+            print(f"❌ {table['id']}: {e}")
+
+    wide = [table for table in tables if table["id"].startswith("stats_squads_")]
+    before = after = 0.0
+    for table in wide:
+        before += best_of(lambda: lookup_per_stat(table), args.repeat)
+        after += best_of(
+            lambda: scraper._get_table_stats_and_header(table, table["id"]), args.repeat
+        )
+    cells = sum(len(table.find_all("td")) for table in wide)
+    print(f"📦 {len(wide)} stats_squads tables, {cells} cells")
+    print(f"per-stat lookup: {before * 1000:8.1f}ms")
+    print(f"single pass:     {after * 1000:8.1f}ms  {before / after:.1f}x")
+    print(
+        f"memory: {text_bytes / 1e3:.0f}kB as text, {typed_bytes / 1e3:.0f}kB typed, "
+        f"{typed_bytes / text_bytes:.0%}"
+    )
+    print(f"📊 {mismatches} mismatches across {len(tables)} tables.")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measures the cost of tracing the parsers, and checks the traces written.
+
+Every fixture page is parsed by its scraper with tracing off, then on, each
+parse under a root span as ``FetchTelemetry.track`` would open. The traces
+written are then checked: each line must be OTLP/JSON holding one trace,
+whose spans all have a parent in the trace but its one root span.
+
+Usage, from ``backend/``:
+
+    python -m benchmarks.tracing_benchmark --matches 3
+
+The exit status is 1 if a trace is malformed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+
+from benchmarks.fixtures import all_fixtures
+from benchmarks.parser_benchmark import best_of
+from benchmarks.parser_parity import parse_fixture
+from scraper.tracing import get_tracer, set_trace_file
+
+
+def check_traces(path: str) -> tuple[Counter, list[str]]:
+    """Checks the traces of an OTLP/JSON lines file.
+
+    Args:
+        path: The file the traces were written to.
+
+    Returns:
+        The number of spans per span name, and a description of each
+        problem found.
+    """
+    names: Counter = Counter()
+    problems = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            try:
+                resource_spans = json.loads(line)["resourceSpans"]
+                spans = [
+                    span
+                    for resource in resource_spans
+                    for scope in resource["scopeSpans"]
+                    for span in scope["spans"]
+                ]
+            except (ValueError, KeyError, TypeError) as e:
+                problems.append(f"line {number}: not OTLP/JSON ({e!r})")
+                continue
+            ids = {span["spanId"] for span in spans}
+            roots = [span for span in spans if "parentSpanId" not in span]
+            if len({span["traceId"] for span in spans}) != 1:
+                problems.append(f"line {number}: spans of several traces")
+            if len(roots) != 1:
+                problems.append(f"line {number}: {len(roots)} root spans")
+            for span in spans:
+                names[span["name"]] += 1
+                if span.get("parentSpanId", span["spanId"]) not in ids:
+                    problems.append(f"line {number}: {span['name']} has no parent")
+                if int(span["endTimeUnixNano"]) < int(span["startTimeUnixNano"]):
+                    problems.append(f"line {number}: {span['name']} ends too early")
+    return names, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", default="Premier-League")
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--matches", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures = all_fixtures(args.league, args.season, matches=args.matches)
+    tracer = get_tracer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces.jsonl")
+        print(f"{'page':<56} {'off':>9} {'on':>9} {'overhead':>9}")
+        for fixture in fixtures:
+
+            def parse():
+                with tracer.span("scrape", kind=fixture["kind"]):
+                    parse_fixture(fixture)
+
+            set_trace_file(None)
+            off = best_of(parse, args.repeat)
+            set_trace_file(path)
+            on = best_of(parse, args.repeat)
+            print(
+                f"{fixture['name']:<56} {off * 1000:>7.1f}ms {on * 1000:>7.1f}ms "
+                f"{on / off - 1:>+9.1%}"
+            )
+        set_trace_file(None)
+
+        names, problems = check_traces(path)
+        size = os.path.getsize(path)
+    traces = names["scrape"]
+    print(
+        f"📊 {traces} traces, {sum(names.values())} spans, "
+        f"{size / max(traces, 1) / 1e3:.1f}KB per trace."
+    )
+    for name, count in sorted(names.items()):
+        print(f"   {name:<32} {count:>6}")
+    for problem in problems:
+        print(f"❌ {problem}")
+    print(f"📊 {len(problems)} malformed traces.")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
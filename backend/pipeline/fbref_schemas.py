@@ -1,23 +1,47 @@
 # Base schema with only types (no coercion or validation logic)
 from typing import ClassVar
 import uuid
+
+import pandas as pd
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 
 
+def na_to_none(v):
+    # Typed frames hold pd.NA or NaN in empty cells, which can't be compared
+    if pd.api.types.is_scalar(v) and pd.isna(v):
+        return None
+    return v
+
+
+def _require_value(v):
+    if na_to_none(v) is None:
+        raise ValueError("missing value")
+
+
 def parse_int_positive(v: str | int) -> int:
-    s = str(v).replace(",", "").strip().lstrip("+")
-    iv = int(s)
+    # The scrapers emit typed columns, only text needs parsing
+    _require_value(v)
+    if isinstance(v, int):
+        iv = v
+    else:
+        iv = int(str(v).replace(",", "").strip().lstrip("+"))
     if iv < 0:
         raise ValueError("must be non-negative")
     return iv
 
 
 def parse_int_signed(v: str | int) -> int:
+    _require_value(v)
+    if isinstance(v, int):
+        return v
     s = str(v).replace(",", "").strip()
     return int(s)
 
 
 def parse_float_signed(v: str | float) -> float:
+    _require_value(v)
+    if isinstance(v, (int, float)):
+        return float(v)
     s = str(v).replace(",", "").strip()
     if s.startswith("+"):
         s = s[1:]
@@ -25,6 +49,7 @@ def parse_float_signed(v: str | float) -> float:
 
 
 def parse_last5(v: str) -> str:
+    _require_value(v)
     return " ".join([x for x in v])
 
 
@@ -64,7 +89,8 @@ class ResultsOverallSchema(BaseModel):
     @field_validator("id", mode="before")
     @classmethod
     def _fill_id(cls, v):
-        if not v or v == "":
+        v = na_to_none(v)
+        if not v:
             return str(uuid.uuid4())
         return v
 
@@ -82,6 +108,7 @@ class ResultsOverallSchema(BaseModel):
     )
     @classmethod
     def _coerce_positive_ints(cls, v):
+        v = na_to_none(v)
         if v is None or v == "":
             return v
         return parse_int_positive(v)
@@ -89,6 +116,9 @@ class ResultsOverallSchema(BaseModel):
     @field_validator("goal_diff", mode="before")
     @classmethod
     def _coerce_goal_diff(cls, v):
+        v = na_to_none(v)
+        if v is None:
+            return v
         return parse_int_signed(v)
 
     @field_validator(
@@ -96,11 +126,15 @@ class ResultsOverallSchema(BaseModel):
     )
     @classmethod
     def _coerce_floats(cls, v):
+        v = na_to_none(v)
+        if v is None:
+            return v
         return parse_float_signed(v)
 
     @field_validator("last_5", mode="before")
     @classmethod
     def _coerce_last5(cls, v):
+        v = na_to_none(v)
         if v is None:
             return v
         return parse_last5(v)
@@ -1,17 +1,13 @@
 from typing import TypedDict
-from patchright.sync_api import (
-    TimeoutError as PlaywrightTimeoutError,
-)
-
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
 
 from pipeline.fbref_schemas import ResultsOverallSchema
+from scraper.browser_pool import get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.html_cache import get_html_cache
 from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.retry_policy import get_retry_policy, retry_scrape
+from scraper.telemetry import get_telemetry
 
 
 class LeagueData(TypedDict):
@@ -35,14 +31,9 @@ scrapes: LeagueList = [
 ]
 
 if __name__ == "__main__":
-    import time
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    import argparse
+
+    @retry_scrape(before_sleep=lambda _: get_browser_pool().recycle())
     def run_scraper_with_retries(scraper: FBRefPlaywrightScraper):
         """Runs a scraper with a retry mechanism.
 
@@ -54,6 +45,15 @@ if __name__ == "__main__":
 
     def main():
         """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+
         scraper_instances = [
             FBRefPlaywrightScraper(
                 league_name=scrape["league_name"],
@@ -78,6 +78,11 @@ if __name__ == "__main__":
                 print(
                     f"Failed to scrape {scraper.base_url} after multiple retries: {e}"
                 )
-            time.sleep(5)
+
+        print(f"🧰 Browser pool stats: {get_browser_pool().stats()}")
+        print(f"📊 Fetch path stats: {get_fetch_strategy().stats()}")
+        print(f"🛡️ Challenge stats: {get_challenge_handler().stats()}")
+        print(f"🔁 Retry stats: {get_retry_policy().stats()}")
+        print(f"⏱️ Fetch telemetry report: {get_telemetry().write_report()}")
 
     main()
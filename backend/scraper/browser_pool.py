@@ -0,0 +1,334 @@
+"""A shared, long-lived Playwright browser pool for the FBRef scrapers.
+
+Booting Chrome through ``launch_persistent_context`` takes several seconds, so
+instead of every ``scrape()`` launching its own browser the scrapers borrow
+pages from a single pool. The pool keeps one persistent context alive for the
+whole run and recycles it after a number of pages, or when the browser's JS
+heap has grown past a limit, so long backfills do not slowly leak memory.
+
+The pool wraps the *sync* Playwright API, which is bound to the thread that
+started it. Use one pool per thread (the scripts in this package are single
+threaded and share the module level pool returned by ``get_browser_pool``).
+"""
+
+import atexit
+import itertools
+import os
+import shutil
+import socket
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypedDict, TypeVar
+
+from patchright.sync_api import (
+    sync_playwright,
+    BrowserContext,
+    Page,
+    Playwright,
+)
+
+from scraper.clearance import ClearanceStore, get_clearance_store
+from scraper.resource_blocking import ResourceBlocker
+
+user_data_dir = "./playwright_user_data"
+
+T = TypeVar("T")
+
+
+def _profile_locked(path: str) -> bool:
+    """Returns whether a running Chrome holds the profile at ``path``.
+
+    Chrome's ``SingletonLock`` is a symlink to ``<hostname>-<pid>``. A lock
+    left behind by a Chrome that crashed on this host is stale, and Chrome
+    takes it over; a lock of another host cannot be checked and is honoured.
+    """
+    try:
+        target = os.readlink(os.path.join(path, "SingletonLock"))
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return True
+    host, _, pid = target.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def free_profile_dir(user_data_dir: str = user_data_dir) -> str:
+    """Returns a Chrome profile directory no other browser is holding.
+
+    Chrome refuses to open a profile another instance has locked, so parallel
+    scraper processes fall back to a profile of their own. The Cloudflare
+    clearance they would otherwise miss is shared through the clearance store.
+    Release a per-process profile with ``release_profile_dir`` when done.
+
+    Args:
+        user_data_dir: The preferred profile directory.
+
+    Returns:
+        ``user_data_dir``, or a per-process sibling of it if it is locked.
+    """
+    pid = os.getpid()
+    candidates = itertools.chain(
+        (user_data_dir, f"{user_data_dir}-{pid}"),
+        (f"{user_data_dir}-{pid}-{n}" for n in itertools.count(1)),
+    )
+    return next(path for path in candidates if not _profile_locked(path))
+
+
+def release_profile_dir(path: str, user_data_dir: str = user_data_dir):
+    """Deletes a per-process profile handed out by ``free_profile_dir``.
+
+    Args:
+        path: The profile directory the browser ran with.
+        user_data_dir: The preferred profile directory, which is kept.
+    """
+    if path != user_data_dir:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class PoolStats(TypedDict):
+    """A snapshot of the browser pool counters."""
+
+    contexts_launched: int
+    contexts_recycled: int
+    pages_served: int
+    pages_in_context: int
+    pages_in_use: int
+    launch_seconds: float
+    heap_bytes: int
+    peak_heap_bytes: int
+    bytes_transferred: int
+    requests_blocked: int
+
+
+class BrowserPool:
+    """Hands out pages from a long-lived persistent browser context.
+
+    Attributes:
+        user_data_dir: The Chrome profile directory used by the context.
+        headless: Whether Chrome runs headless.
+        max_pages_per_context: Pages served before the context is recycled.
+        max_heap_growth_mb: JS heap growth (in MB) over the first measurement
+            of a context that triggers a recycle.
+        blocker: Aborts the requests a table scrape does not need and
+            records the bytes each page transferred.
+        clearance: The Cloudflare clearance injected into every new context.
+    """
+
+    def __init__(
+        self,
+        user_data_dir: str = user_data_dir,
+        headless: bool = False,
+        max_pages_per_context: int = 50,
+        max_heap_growth_mb: int = 512,
+        blocker: ResourceBlocker | None = None,
+        clearance: ClearanceStore | None = None,
+    ):
+        """Initializes the BrowserPool. The browser is launched lazily.
+
+        Args:
+            user_data_dir: The Chrome profile directory used by the context.
+            headless: Whether Chrome runs headless.
+            max_pages_per_context: Pages served before the context is recycled.
+            max_heap_growth_mb: JS heap growth (in MB) that triggers a recycle.
+            blocker: The request blocker. Defaults to the standard block list.
+            clearance: The clearance store. Defaults to the shared one.
+        """
+        self.user_data_dir = user_data_dir
+        self.headless = headless
+        self.max_pages_per_context = max_pages_per_context
+        self.max_heap_growth_mb = max_heap_growth_mb
+        self.blocker = blocker or ResourceBlocker()
+        self.clearance = clearance or get_clearance_store()
+
+        self._playwright: Playwright | None = None
+        self._context: BrowserContext | None = None
+        self._profile_dir = user_data_dir
+        self._baseline_heap: int | None = None
+        self._recycle_requested = False
+        self._stats: PoolStats = {
+            "contexts_launched": 0,
+            "contexts_recycled": 0,
+            "pages_served": 0,
+            "pages_in_context": 0,
+            "pages_in_use": 0,
+            "launch_seconds": 0.0,
+            "heap_bytes": 0,
+            "peak_heap_bytes": 0,
+            "bytes_transferred": 0,
+            "requests_blocked": 0,
+        }
+
+    @property
+    def context(self) -> BrowserContext:
+        """The live browser context, launching Chrome if needed."""
+        if self._context is None:
+            self._launch()
+        assert self._context is not None
+        return self._context
+
+    def _launch(self):
+        """Starts Playwright (once) and launches a fresh persistent context."""
+        started = time.perf_counter()
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        # A clearance is only honoured for the user agent that earned it.
+        user_agent = self.clearance.user_agent()
+        self._profile_dir = free_profile_dir(self.user_data_dir)
+        context = self._playwright.chromium.launch_persistent_context(
+            user_data_dir=self._profile_dir,
+            channel="chrome",
+            headless=self.headless,
+            no_viewport=True,
+            **({"user_agent": user_agent} if user_agent else {}),
+        )
+        # A crashed or externally closed browser must not be handed out again.
+        context.on("close", lambda _: self._forget_context(context))
+        self.blocker.install(context)
+        self.clearance.inject(context)
+
+        self._context = context
+        self._baseline_heap = None
+        self._recycle_requested = False
+        self._stats["contexts_launched"] += 1
+        self._stats["pages_in_context"] = 0
+        self._stats["launch_seconds"] += time.perf_counter() - started
+        print(f"🚀 Browser context launched in {time.perf_counter() - started:.1f}s")
+
+    def _forget_context(self, context: BrowserContext):
+        """Drops the reference to a context that has been closed."""
+        if self._context is context:
+            self._context = None
+
+    def _measure_heap(self, page: Page) -> int:
+        """Returns the JS heap used by the page's renderer, or 0 if unknown."""
+        try:
+            heap = page.evaluate(
+                "() => performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+            return int(heap or 0)
+        except Exception:
+            return 0
+
+    def _should_recycle(self) -> bool:
+        """Checks the page and memory limits of the current context."""
+        if self._recycle_requested:
+            return True
+        if self._stats["pages_in_context"] >= self.max_pages_per_context:
+            return True
+        if self._baseline_heap is not None:
+            growth = self._stats["heap_bytes"] - self._baseline_heap
+            if growth > self.max_heap_growth_mb * 1024 * 1024:
+                return True
+        return False
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        """Borrows a fresh page from the pool and returns it when done.
+
+        Yields:
+            A new Playwright page in the shared context.
+        """
+        page = self.context.new_page()
+        self.blocker.track(page)
+        self._stats["pages_in_use"] += 1
+        try:
+            yield page
+        finally:
+            self._stats["pages_in_use"] -= 1
+            self._stats["pages_served"] += 1
+            self._stats["pages_in_context"] += 1
+
+            heap = self._measure_heap(page)
+            if heap:
+                if self._baseline_heap is None:
+                    self._baseline_heap = heap
+                self._stats["heap_bytes"] = heap
+                self._stats["peak_heap_bytes"] = max(
+                    self._stats["peak_heap_bytes"], heap
+                )
+
+            self.blocker.finish(page, page.url)
+            try:
+                page.close()
+            except Exception:
+                pass
+
+            if self._stats["pages_in_use"] == 0 and self._should_recycle():
+                self._recycle()
+
+    def run(self, fetch_page: Callable[[Page], T]) -> T:
+        """Borrows a page, calls ``fetch_page`` with it and returns the result.
+
+        Args:
+            fetch_page: The function to run with the borrowed page.
+
+        Returns:
+            Whatever ``fetch_page`` returned.
+        """
+        with self.page() as page:
+            return fetch_page(page)
+
+    def recycle(self):
+        """Requests a fresh context once all borrowed pages are returned."""
+        if self._stats["pages_in_use"] == 0:
+            self._recycle()
+        else:
+            self._recycle_requested = True
+
+    def _recycle(self):
+        """Closes the current context so the next borrow launches a new one."""
+        if self._context is None:
+            return
+        print(
+            f"♻️ Recycling browser context after {self._stats['pages_in_context']} pages."
+        )
+        self._close_context()
+        self._stats["contexts_recycled"] += 1
+
+    def _close_context(self):
+        """Closes the current context, ignoring an already dead browser."""
+        context, self._context = self._context, None
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+            release_profile_dir(self._profile_dir, self.user_data_dir)
+
+    def stats(self) -> PoolStats:
+        """Returns a copy of the pool counters."""
+        traffic = self.blocker.summary()
+        self._stats["bytes_transferred"] = traffic["bytes_transferred"]
+        self._stats["requests_blocked"] = traffic["blocked"]
+        return PoolStats(**self._stats)
+
+    def close(self):
+        """Closes the context and stops Playwright."""
+        self._close_context()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+_default_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Returns the process wide browser pool shared by all scrapers."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BrowserPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
@@ -0,0 +1,195 @@
+"""Shares Cloudflare clearance between browser contexts, processes and HTTP.
+
+Once a browser has solved FBRef's challenge, Cloudflare hands it a
+``cf_clearance`` cookie that is valid for that user agent until it expires.
+``ClearanceStore`` captures the cookie together with the user agent that
+earned it and keeps them in a small JSON file, so that:
+
+- every new browser context (in this or another scraper process) starts
+  with the cookie instead of solving the challenge again, and
+- the plain HTTP fast path can send the same cookie and user agent.
+
+The file is replaced atomically on every write and re-read whenever another
+process has changed it. Expired clearances are never handed out.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import TypedDict
+from urllib.parse import urlparse
+
+from patchright.async_api import (
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage,
+)
+from patchright.sync_api import BrowserContext, Page
+
+clearance_file = "./cf_clearance.json"
+
+CLEARANCE_COOKIES = ("cf_clearance", "__cf_bm")
+
+# Session cookies carry no expiry; assume Cloudflare's shortest lifetime.
+SESSION_CLEARANCE_SECONDS = 30 * 60
+
+
+class Clearance(TypedDict):
+    """The cookies and user agent that passed a host's challenge."""
+
+    host: str
+    user_agent: str
+    cookies: list[dict]
+    captured_at: float
+    expires: float
+
+
+def _host(url: str) -> str:
+    return urlparse(url).hostname or url
+
+
+class ClearanceStore:
+    """A file backed store of Cloudflare clearances, keyed by host.
+
+    Attributes:
+        path: The JSON file the clearances are kept in.
+        expiry_margin: Seconds before expiry at which a clearance is dropped.
+    """
+
+    def __init__(self, path: str = clearance_file, expiry_margin: float = 60.0):
+        """Initializes the ClearanceStore.
+
+        Args:
+            path: The JSON file the clearances are kept in.
+            expiry_margin: Seconds before expiry at which a clearance is dropped.
+        """
+        self.path = path
+        self.expiry_margin = expiry_margin
+        self._clearances: dict[str, Clearance] = {}
+        self._mtime = 0.0
+
+    def _reload(self):
+        """Re-reads the file if another process has written it since."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path) as f:
+                self._clearances = json.load(f)
+            self._mtime = mtime
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read {self.path}: {e}")
+
+    def _save(self):
+        """Atomically replaces the file with the current clearances."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._clearances, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def get(self, url: str) -> Clearance | None:
+        """Returns the unexpired clearance for the host of ``url``, if any."""
+        self._reload()
+        clearance = self._clearances.get(_host(url))
+        if clearance and clearance["expires"] - self.expiry_margin > time.time():
+            return clearance
+        return None
+
+    def _store(self, url: str, cookies: list[dict], user_agent: str) -> bool:
+        """Keeps the clearance cookies among ``cookies``, if there are any."""
+        kept = [c for c in cookies if c.get("name") in CLEARANCE_COOKIES]
+        clearance_cookie = next(
+            (c for c in kept if c["name"] == "cf_clearance"), None
+        )
+        if clearance_cookie is None:
+            return False
+
+        now = time.time()
+        expires = clearance_cookie.get("expires", -1)
+        if expires is None or expires <= 0:
+            expires = now + SESSION_CLEARANCE_SECONDS
+
+        self._reload()
+        self._clearances[_host(url)] = Clearance(
+            host=_host(url),
+            user_agent=user_agent,
+            cookies=kept,
+            captured_at=now,
+            expires=expires,
+        )
+        self._save()
+        print(
+            f"🍪 Captured Cloudflare clearance for {_host(url)}, "
+            f"valid for {(expires - now) / 60:.0f} min"
+        )
+        return True
+
+    def capture(self, page: Page) -> bool:
+        """Captures the clearance a page's context holds for its host.
+
+        Args:
+            page: A page that just got past a challenge.
+
+        Returns:
+            True if a ``cf_clearance`` cookie was found and stored.
+        """
+        user_agent = page.evaluate("() => navigator.userAgent")
+        return self._store(page.url, page.context.cookies(page.url), user_agent)
+
+    async def capture_async(self, page: AsyncPage) -> bool:
+        """The asyncio counterpart of ``capture``."""
+        user_agent = await page.evaluate("() => navigator.userAgent")
+        cookies = await page.context.cookies(page.url)
+        return self._store(page.url, cookies, user_agent)
+
+    def _valid_cookies(self) -> list:
+        cookies = []
+        for host in list(self._clearances):
+            clearance = self.get(f"https://{host}/")
+            if clearance:
+                cookies.extend(clearance["cookies"])
+        return cookies
+
+    def inject(self, context: BrowserContext):
+        """Adds every unexpired clearance cookie to a browser context."""
+        self._reload()
+        cookies = self._valid_cookies()
+        if cookies:
+            context.add_cookies(cookies)
+
+    async def inject_async(self, context: AsyncBrowserContext):
+        """The asyncio counterpart of ``inject``."""
+        self._reload()
+        cookies = self._valid_cookies()
+        if cookies:
+            await context.add_cookies(cookies)
+
+    def user_agent(self) -> str | None:
+        """Returns the user agent of the freshest unexpired clearance, if any.
+
+        A browser context launched with this user agent can reuse the
+        clearance cookies injected into it.
+        """
+        self._reload()
+        valid = [
+            c for c in self._clearances.values() if self.get(f"https://{c['host']}/")
+        ]
+        if not valid:
+            return None
+        return max(valid, key=lambda c: c["captured_at"])["user_agent"]
+
+
+_default_store: ClearanceStore | None = None
+
+
+def get_clearance_store() -> ClearanceStore:
+    """Returns the process wide clearance store."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ClearanceStore()
+    return _default_store
@@ -0,0 +1,259 @@
+"""Event-driven handling of Cloudflare's challenge on FBRef pages.
+
+The scrapers used to wait a fixed second, then up to twenty more for the
+challenge checkbox, and then fifteen for a table, so a challenge that cleared
+in two seconds could still cost forty. ``ChallengeHandler`` instead waits for
+whichever comes first: the page's tables or the challenge widget. Once a
+challenge is seen it keeps racing the table against the checkbox, clicks the
+checkbox as soon as it shows up and returns the moment a table appears.
+
+Once a challenge clears, the ``cf_clearance`` cookie it earned is saved to the
+clearance store so other contexts, processes and the HTTP fast path can skip
+the next one. How often pages are challenged and how long the challenges take
+to clear are recorded, see ``ChallengeHandler.stats()``.
+"""
+
+import asyncio
+import time
+from typing import Callable, TypedDict
+
+from patchright.async_api import (
+    Page as AsyncPage,
+    TimeoutError as AsyncPlaywrightTimeoutError,
+)
+from patchright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from scraper.clearance import ClearanceStore, get_clearance_store
+from scraper.telemetry import get_telemetry
+
+TABLE_SELECTOR = "table"
+CHALLENGE_IFRAME_SELECTOR = "iframe[id*='cf-chl-widget-']"
+CHALLENGE_SELECTOR = f"{CHALLENGE_IFRAME_SELECTOR}, #challenge-stage, #challenge-form"
+CHECKBOX_SELECTOR = "input[type='checkbox']"
+
+
+class ChallengeStats(TypedDict):
+    """Counters describing the challenges met during a run."""
+
+    pages: int
+    challenged: int
+    solved: int
+    failed: int
+    challenge_rate: float
+    avg_solve_seconds: float
+    max_solve_seconds: float
+
+
+class ChallengeHandler:
+    """Waits for a page's tables, getting past a Cloudflare challenge if shown.
+
+    Attributes:
+        load_timeout: Milliseconds to wait for either a table or a challenge.
+        solve_timeout: Milliseconds a challenge may take to clear.
+        poll_interval: Milliseconds between checkbox checks while challenged.
+        clearance: Where the clearance earned by a solved challenge is kept.
+    """
+
+    def __init__(
+        self,
+        load_timeout: int = 15_000,
+        solve_timeout: int = 30_000,
+        poll_interval: int = 500,
+        clearance: ClearanceStore | None = None,
+    ):
+        """Initializes the ChallengeHandler.
+
+        Args:
+            load_timeout: Milliseconds to wait for either a table or a challenge.
+            solve_timeout: Milliseconds a challenge may take to clear.
+            poll_interval: Milliseconds between checkbox checks while challenged.
+            clearance: The clearance store. Defaults to the shared one.
+        """
+        self.load_timeout = load_timeout
+        self.solve_timeout = solve_timeout
+        self.poll_interval = poll_interval
+        self.clearance = clearance or get_clearance_store()
+        self._pages = 0
+        self._challenged = 0
+        self._failed = 0
+        self._solve_times: list[float] = []
+
+    def _record(self, challenged_at: float | None, solved: bool):
+        self._pages += 1
+        if challenged_at is None:
+            return
+        self._challenged += 1
+        if solved:
+            self._solve_times.append(time.perf_counter() - challenged_at)
+        else:
+            self._failed += 1
+
+    def wait_for_tables(self, page: Page, log: Callable[[str], None] = print):
+        """Returns as soon as the page shows a table.
+
+        Args:
+            page: The page, already navigated to its URL.
+            log: Where progress messages go.
+
+        Raises:
+            PlaywrightTimeoutError: If neither a table nor a challenge shows up,
+                or the challenge does not clear within ``solve_timeout``.
+        """
+        telemetry = get_telemetry()
+        try:
+            with telemetry.phase("selector_wait"):
+                _ = page.wait_for_selector(
+                    f"{TABLE_SELECTOR}, {CHALLENGE_SELECTOR}", timeout=self.load_timeout
+                )
+        except PlaywrightTimeoutError:
+            log("❌ Neither a table nor a challenge showed up.")
+            self._record(None, solved=False)
+            raise
+
+        if page.locator(TABLE_SELECTOR).count():
+            log("✅ Page loaded and table found.")
+            self._record(None, solved=True)
+            return
+
+        log("🛡️ Cloudflare challenge detected.")
+        with telemetry.phase("challenge"):
+            self._solve_challenge(page, log)
+
+    def _solve_challenge(self, page: Page, log: Callable[[str], None]):
+        """Clicks through the challenge on ``page`` until a table shows up."""
+        challenged_at = time.perf_counter()
+        deadline = challenged_at + self.solve_timeout / 1000
+        checkbox = page.frame_locator(CHALLENGE_IFRAME_SELECTOR).locator(
+            CHECKBOX_SELECTOR
+        )
+        clicked = False
+
+        while time.perf_counter() < deadline:
+            try:
+                _ = page.wait_for_selector(TABLE_SELECTOR, timeout=self.poll_interval)
+                log(
+                    f"✅ Challenge cleared in {time.perf_counter() - challenged_at:.1f}s, table found."
+                )
+                self._record(challenged_at, solved=True)
+                try:
+                    self.clearance.capture(page)
+                except Exception as e:
+                    log(f"⚠️ Could not capture the Cloudflare clearance: {e}")
+                return
+            except PlaywrightTimeoutError:
+                pass
+
+            if not clicked and checkbox.count():
+                try:
+                    checkbox.first.click(force=True, timeout=5_000)
+                    clicked = True
+                    log("Cloudflare checkbox clicked.")
+                except PlaywrightTimeoutError:
+                    log("Checkbox not clickable yet.")
+
+        log("❌ Cloudflare challenge did not clear.")
+        self._record(challenged_at, solved=False)
+        raise PlaywrightTimeoutError("Cloudflare challenge did not clear")
+
+    async def wait_for_tables_async(
+        self, page: AsyncPage, log: Callable[[str], None] = print
+    ):
+        """The asyncio counterpart of ``wait_for_tables``.
+
+        While challenged the table and the checkbox are raced as two tasks,
+        so neither has to be polled.
+        """
+        telemetry = get_telemetry()
+        try:
+            with telemetry.phase("selector_wait"):
+                _ = await page.wait_for_selector(
+                    f"{TABLE_SELECTOR}, {CHALLENGE_SELECTOR}", timeout=self.load_timeout
+                )
+        except AsyncPlaywrightTimeoutError:
+            log("❌ Neither a table nor a challenge showed up.")
+            self._record(None, solved=False)
+            raise
+
+        if await page.locator(TABLE_SELECTOR).count():
+            log("✅ Page loaded and table found.")
+            self._record(None, solved=True)
+            return
+
+        log("🛡️ Cloudflare challenge detected.")
+        with telemetry.phase("challenge"):
+            await self._solve_challenge_async(page, log)
+
+    async def _solve_challenge_async(
+        self, page: AsyncPage, log: Callable[[str], None]
+    ):
+        """Races the table against the checkbox until a table shows up.
+
+        Like the sync path, a checkbox that does not take the click is tried
+        again every ``poll_interval`` until the table shows up.
+        """
+        challenged_at = time.perf_counter()
+        checkbox = page.frame_locator(CHALLENGE_IFRAME_SELECTOR).locator(
+            CHECKBOX_SELECTOR
+        )
+        table_task = asyncio.create_task(
+            page.wait_for_selector(TABLE_SELECTOR, timeout=self.solve_timeout)
+        )
+        checkbox_task = asyncio.create_task(
+            checkbox.first.wait_for(state="visible", timeout=self.solve_timeout)
+        )
+        try:
+            done, _ = await asyncio.wait(
+                {table_task, checkbox_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if table_task not in done and checkbox_task.exception() is None:
+                while not table_task.done():
+                    try:
+                        await checkbox.first.click(force=True, timeout=5_000)
+                        log("Cloudflare checkbox clicked.")
+                        break
+                    except AsyncPlaywrightTimeoutError:
+                        log("Checkbox not clickable yet.")
+                    await asyncio.wait({table_task}, timeout=self.poll_interval / 1000)
+            await table_task
+        except AsyncPlaywrightTimeoutError:
+            log("❌ Cloudflare challenge did not clear.")
+            self._record(challenged_at, solved=False)
+            raise
+        finally:
+            for task in (table_task, checkbox_task):
+                task.cancel()
+                if task.done() and not task.cancelled():
+                    task.exception()
+
+        log(
+            f"✅ Challenge cleared in {time.perf_counter() - challenged_at:.1f}s, table found."
+        )
+        self._record(challenged_at, solved=True)
+        try:
+            await self.clearance.capture_async(page)
+        except Exception as e:
+            log(f"⚠️ Could not capture the Cloudflare clearance: {e}")
+
+    def stats(self) -> ChallengeStats:
+        """Returns the challenge counters."""
+        solved = len(self._solve_times)
+        return ChallengeStats(
+            pages=self._pages,
+            challenged=self._challenged,
+            solved=solved,
+            failed=self._failed,
+            challenge_rate=self._challenged / self._pages if self._pages else 0.0,
+            avg_solve_seconds=sum(self._solve_times) / solved if solved else 0.0,
+            max_solve_seconds=max(self._solve_times, default=0.0),
+        )
+
+
+_default_handler: ChallengeHandler | None = None
+
+
+def get_challenge_handler() -> ChallengeHandler:
+    """Returns the process wide challenge handler shared by all scrapers."""
+    global _default_handler
+    if _default_handler is None:
+        _default_handler = ChallengeHandler()
+    return _default_handler
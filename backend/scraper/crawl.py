@@ -0,0 +1,207 @@
+"""Runs the FBRef scrapers off the crawl frontier.
+
+``--seed`` enqueues everything listed in the ``scrapes`` lists of the scraper
+modules; without it the script only works through what is already queued,
+which is how an interrupted backfill is resumed:
+
+    python -m scraper.crawl --seed
+    python -m scraper.crawl --kinds match
+
+Pages are claimed highest priority first (schedules, then league tables,
+then player tables, then matches), scraped, saved and marked done, so
+re-running the script after a crash picks up the pages that were not.
+"""
+
+from typing import Callable
+
+from tenacity import RetryCallState
+
+from scraper import (
+    fbref_competition_schedule_scrape,
+    fbref_league_data_scrape,
+    fbref_match_scraper,
+    fbref_players_data_scrape,
+)
+from scraper.browser_pool import get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.fbref_competition_schedule_scrape import FBRefCompetitionScheduleScraper
+from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.fbref_match_scraper import FBRefMatchScraper
+from scraper.fbref_players_data_scrape import FBRefPlayerScraper
+from scraper.fetch_engine import get_fetch_engine
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.frontier import CrawlFrontier, FrontierEntry
+from scraper.html_cache import get_html_cache
+from scraper.retry_policy import get_retry_policy, retry_scrape
+from scraper.telemetry import get_telemetry
+
+Scraper = (
+    FBRefPlaywrightScraper
+    | FBRefPlayerScraper
+    | FBRefCompetitionScheduleScraper
+    | FBRefMatchScraper
+)
+
+SCRAPERS: dict[str, type[Scraper]] = {
+    FBRefCompetitionScheduleScraper.kind: FBRefCompetitionScheduleScraper,
+    FBRefPlaywrightScraper.kind: FBRefPlaywrightScraper,
+    FBRefPlayerScraper.kind: FBRefPlayerScraper,
+    FBRefMatchScraper.kind: FBRefMatchScraper,
+}
+
+
+def seed(frontier: CrawlFrontier) -> int:
+    """Enqueues every page listed in the scraper modules' ``scrapes`` lists.
+
+    Args:
+        frontier: The frontier to fill.
+
+    Returns:
+        The number of pages that were not already queued.
+    """
+    added = 0
+    for module, scraper_cls in (
+        (fbref_competition_schedule_scrape, FBRefCompetitionScheduleScraper),
+        (fbref_league_data_scrape, FBRefPlaywrightScraper),
+        (fbref_players_data_scrape, FBRefPlayerScraper),
+    ):
+        for scrape in module.scrapes:
+            for year in scrape["season_year"]:
+                scraper = scraper_cls(
+                    league_name=scrape["league_name"],
+                    fbref_id=scrape["fbref_id"],
+                    season_year=year,
+                )
+                added += scraper.enqueue(frontier)
+    for match in fbref_match_scraper.scrapes:
+        added += FBRefMatchScraper(match).enqueue(frontier)
+    return added
+
+
+def scrape_entry(entry: FrontierEntry) -> Scraper:
+    """Scrapes and saves the page of a claimed frontier entry.
+
+    Args:
+        entry: The claimed entry.
+
+    Returns:
+        The scraper that handled the page.
+
+    Raises:
+        RuntimeError: If a player category page could not be scraped.
+    """
+    scraper = SCRAPERS[entry["kind"]].from_frontier(entry)
+    scraper.scrape()
+    if isinstance(scraper, FBRefPlayerScraper) and scraper.failed_categories:
+        raise RuntimeError(str(scraper.failed_categories))
+    if isinstance(scraper, FBRefMatchScraper):
+        scraper.save_to_json()
+    else:
+        scraper.save_to_csv()
+    return scraper
+
+
+def recycle_browser(retry_state: RetryCallState):
+    """Recycles the browser the failed entry was fetched with.
+
+    Player pages are fetched by the async fetch engine, the other pages by
+    the browser pool.
+    """
+    entry: FrontierEntry = retry_state.args[0]
+    if entry["kind"] == FBRefPlayerScraper.kind:
+        get_fetch_engine().recycle()
+    else:
+        get_browser_pool().recycle()
+
+
+def drain(
+    frontier: CrawlFrontier,
+    kinds: tuple[str, ...] | None = None,
+    run: Callable[[FrontierEntry], Scraper] = scrape_entry,
+) -> int:
+    """Claims and scrapes pages until the frontier has nothing ready.
+
+    Args:
+        frontier: The frontier to work through.
+        kinds: Only scrape pages of these kinds. Defaults to any kind.
+        run: Scrapes a claimed entry, raising if it failed.
+
+    Returns:
+        The number of pages scraped successfully.
+    """
+    scraped = 0
+    while (entry := frontier.claim(kinds)) is not None:
+        print(
+            f"📥 {entry['kind']} {entry['url']} (attempt {entry['attempts']}, "
+            f"priority {entry['priority']})"
+        )
+        try:
+            run(entry)
+        except Exception as e:
+            print(f"❌ Failed to scrape {entry['url']}: {e}")
+            frontier.fail(entry["url"], str(e))
+        else:
+            frontier.complete(entry["url"])
+            scraped += 1
+    return scraped
+
+
+if __name__ == "__main__":
+    import argparse
+
+    @retry_scrape(before_sleep=recycle_browser)
+    def run_scraper_with_retries(entry: FrontierEntry) -> Scraper:
+        """Scrapes a claimed entry with a retry mechanism."""
+        return scrape_entry(entry)
+
+    def main():
+        """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Enqueue everything in the scrapers' scrapes lists first.",
+        )
+        parser.add_argument(
+            "--kinds",
+            nargs="+",
+            choices=sorted(SCRAPERS),
+            help="Only scrape pages of these kinds.",
+        )
+        parser.add_argument(
+            "--requeue-failed",
+            action="store_true",
+            help="Give pages that ran out of attempts another set of attempts.",
+        )
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            help="Serve the fetch metrics for Prometheus on this port.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+        if args.metrics_port:
+            get_telemetry().serve(args.metrics_port)
+        kinds = tuple(args.kinds) if args.kinds else None
+
+        frontier = CrawlFrontier()
+        if args.seed:
+            print(f"🌱 Enqueued {seed(frontier)} new pages.")
+        if args.requeue_failed:
+            print(f"🔄 Re-queued {frontier.requeue_failed(kinds)} failed pages.")
+
+        scraped = drain(frontier, kinds, run_scraper_with_retries)
+        print(f"✅ Scraped {scraped} pages. Frontier: {frontier.counts()}")
+        print(f"🧰 Browser pool stats: {get_browser_pool().stats()}")
+        print(f"📊 Fetch path stats: {get_fetch_strategy().stats()}")
+        print(f"🛡️ Challenge stats: {get_challenge_handler().stats()}")
+        print(f"🔁 Retry stats: {get_retry_policy().stats()}")
+        print(f"⏱️ Fetch telemetry report: {get_telemetry().write_report()}")
+        frontier.close()
+
+    main()
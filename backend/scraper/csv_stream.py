@@ -0,0 +1,57 @@
+"""Writes CSV files one batch of rows at a time.
+
+The scrapers used to hold a whole table several times over before anything
+was written: the list of rows, the DataFrame built from it and the CSV text
+``to_csv`` renders. The extractors now have streaming variants yielding
+small batches of rows, and ``write_csv`` appends each batch to the file as
+it comes, so only one batch is held at a time whatever the size of the
+table.
+
+Only ``scraper.reparse`` streams a table from the page to the file. A
+scrape still keeps what it parsed in the scraper's ``dataset``: the Celery
+tasks report its row counts, the incremental refresh and the match batch
+read the schedule's matches from it, and the parser parity checks compare
+it across backends. A season's tables are a few hundred rows each, so
+holding them is cheap next to the backfills ``reparse`` runs over many
+seasons.
+"""
+
+import os
+from typing import Iterable
+
+import pandas as pd
+
+
+def write_csv(path: str, batches: Iterable[pd.DataFrame]) -> int:
+    """Writes batches of rows to one CSV file, as they come.
+
+    The header is the columns of the first batch. The later batches are
+    written with the same columns, in the same order, a column they lack
+    being left empty. No file is written if there is no row.
+
+    Args:
+        path: The CSV file, replaced if it exists.
+        batches: The batches of rows.
+
+    Returns:
+        The number of rows written.
+    """
+    columns: list[str] | None = None
+    rows = 0
+    file = None
+    try:
+        for batch in batches:
+            if batch.empty:
+                continue
+            if file is None:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                file = open(path, "w", newline="", encoding="utf-8")
+                columns = list(batch.columns)
+                batch.to_csv(file, index=False)
+            else:
+                batch.reindex(columns=columns).to_csv(file, index=False, header=False)
+            rows += len(batch)
+    finally:
+        if file is not None:
+            file.close()
+    return rows
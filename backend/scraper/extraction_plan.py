@@ -0,0 +1,498 @@
+"""Extraction plans compiled once per table layout, with schema drift reports.
+
+The league and player parsers used to work out a table's columns anew for
+every table they parsed, and to decide for every cell, by comparing its
+``data-stat`` with ``player``, ``team``, ``nationality`` and the rest, how to
+turn it into values. Every table of a given type has the same header on
+every page of a season, so that work was repeated for nothing.
+
+A table's header, the ``data-stat`` of each of its ``th[aria-label]`` cells,
+is now hashed into a fingerprint, and the first time a fingerprint is seen
+it is compiled into an ``ExtractionPlan``: the ordered output columns and
+the converter of each stat. The plan is cached and reused for every row and
+every page with that layout.
+
+A layout that changes is reported as schema drift instead of silently
+producing a ragged frame: when a table type shows up with a header other
+than the one it had before in the process, or when its rows carry stats its
+header does not have. The rows are still extracted with the plan of their
+own header, and the stats the header lacks are left out of the frame.
+
+The frames are typed. FBRef writes numbers as text such as ``"1,234"`` or
+``"+0.5"``, and the pipeline used to parse every value of every record again
+with ``parse_int_positive`` and the like. Once a table is extracted, its
+numeric columns are coerced together, in one vectorized pass of
+``coerce_numeric``,
+into nullable ``Int64`` or ``Float64`` columns, empty cells becoming
+``<NA>``. Those hold the numbers in NumPy arrays, in a fraction of the memory
+of a column of Python strings.
+"""
+
+import hashlib
+import itertools
+import math
+import threading
+from typing import Any, Callable, Iterable, Iterator, TypedDict
+
+import numpy as np
+import pandas as pd
+from bs4 import Tag
+
+Converter = Callable[[Tag], dict[str, Any]]
+
+
+class StatRule(TypedDict):
+    """How the cells of one stat are turned into values.
+
+    Attributes:
+        columns: The output columns, in order.
+        convert: Returns the values of a cell by column, leaving out the
+            ones the cell does not have.
+        numeric: Whether the columns may hold numbers, to be coerced with
+            ``coerce_numeric``.
+    """
+
+    columns: tuple[str, ...]
+    convert: Converter
+    numeric: bool
+
+
+class SchemaDrift(TypedDict):
+    """A table whose layout differs from what was seen before.
+
+    Attributes:
+        table: The table type, such as ``stats_squads_standard_for``.
+        kind: ``"header"`` if its header changed, ``"rows"`` if its rows
+            carry stats the header does not have.
+        added: The stats that appeared.
+        removed: The stats that disappeared, for a header change.
+        fingerprint: The fingerprint of the new header.
+    """
+
+    table: str
+    kind: str
+    added: list[str]
+    removed: list[str]
+    fingerprint: str
+
+
+def text_rule(column: str) -> StatRule:
+    """Returns the rule storing a cell's stripped text under ``column``.
+
+    The column is coerced to numbers if all of its values are numbers.
+    """
+    return StatRule(
+        columns=(column,),
+        convert=lambda cell: {column: cell.get_text(strip=True)},
+        numeric=True,
+    )
+
+
+def _parse_numbers(
+    columns: dict[str, list],
+) -> tuple[np.ndarray, dict[str, str | None]]:
+    """Parses columns of FBRef numbers, see ``coerce_numeric``.
+
+    Returns:
+        The numbers of each column, NaN where a value is missing or not a
+        number, and the dtype of each column, as ``numeric_dtypes``.
+    """
+    values = np.array(list(columns.values()), dtype=object)
+    text = np.where(
+        [[isinstance(value, str) for value in row] for row in values], values, ""
+    ).astype(str)
+    text = np.strings.lstrip(np.strings.strip(np.strings.replace(text, ",", "")), "+")
+    missing = text == ""
+    numbers = pd.to_numeric(text.ravel(), errors="coerce").reshape(text.shape)
+    numeric = (~np.isnan(numbers) | missing).all(axis=1)
+    dotted = (np.strings.find(text, ".") >= 0).any(axis=1)
+
+    dtypes: dict[str, str | None] = {}
+    for i, name in enumerate(columns):
+        if missing[i].all():
+            continue
+        dtypes[name] = ("Float64" if dotted[i] else "Int64") if numeric[i] else None
+    return numbers, dtypes
+
+
+def numeric_dtypes(columns: dict[str, list]) -> dict[str, str | None]:
+    """Returns the dtype ``coerce_numeric`` gives each column.
+
+    Args:
+        columns: The values of each column, text or NaN, all of one length.
+
+    Returns:
+        ``"Int64"`` or ``"Float64"`` for a numeric column, None for one that
+        is left as it is. Columns without any value are left out.
+    """
+    if not columns or not len(next(iter(columns.values()))):
+        return {}
+    return _parse_numbers(columns)[1]
+
+
+def _merge_dtypes(
+    dtypes: dict[str, str | None], more: dict[str, str | None]
+) -> dict[str, str | None]:
+    """Returns the dtypes of columns made of the values of both.
+
+    A column is numeric if it is on both sides, or on one and has no value
+    on the other, and ``Float64`` if it is on either side.
+    """
+    merged = {**more, **dtypes}
+    for column, dtype in more.items():
+        previous = merged[column]
+        if previous is None or dtype is None:
+            merged[column] = None
+        elif "Float64" in (previous, dtype):
+            merged[column] = "Float64"
+    return merged
+
+
+def coerce_numeric(
+    columns: dict[str, list], dtypes: dict[str, str | None] | None = None
+) -> dict[str, Any]:
+    """Coerces columns of FBRef numbers to nullable numeric arrays.
+
+    The values of all the columns are cleaned and parsed together, in one
+    vectorized pass: thousands separators, surrounding spaces and a leading
+    ``+`` are dropped, and empty or missing values become ``<NA>``. A column
+    becomes ``Int64`` if none of its values has a decimal point, ``Float64``
+    otherwise. A column is left as it is if any of its values is not a
+    number or none is set.
+
+    Args:
+        columns: The values of each column, text or NaN, all of one length.
+        dtypes: The dtype of each column, from ``numeric_dtypes`` over more
+            rows than these, so the rows of a table are coerced alike
+            whatever part of it they are. Defaults to the dtypes of these
+            values.
+
+    Returns:
+        The columns, the numeric ones as ``pd.arrays.IntegerArray`` or
+        ``pd.arrays.FloatingArray``.
+    """
+    if not columns or not len(next(iter(columns.values()))):
+        return columns
+    numbers, found = _parse_numbers(columns)
+    dtypes = found if dtypes is None else dtypes
+
+    coerced = dict(columns)
+    for i, name in enumerate(columns):
+        dtype = dtypes.get(name)
+        if dtype is not None:
+            array = pd.array(numbers[i], dtype="Float64")
+            coerced[name] = array if dtype == "Float64" else array.astype("Int64")
+    return coerced
+
+
+def header_stats(table: Tag) -> tuple[str, ...]:
+    """Returns the ``data-stat`` of each labelled header cell of a table."""
+    return tuple(
+        stat
+        for th in table.find_all("th", attrs={"aria-label": True})
+        if (stat := th.get("data-stat"))
+    )
+
+
+def fingerprint(stats: Iterable[str]) -> str:
+    """Returns the fingerprint of a header, a hash of its ordered stats."""
+    return hashlib.sha1("\x1f".join(stats).encode()).hexdigest()[:16]
+
+
+class ExtractionPlan:
+    """The compiled extraction of one table layout.
+
+    Attributes:
+        fingerprint: The fingerprint of the header the plan was compiled for.
+        stats: The stats of the header, in order.
+        columns: The output columns, in order.
+    """
+
+    def __init__(
+        self, stats: tuple[str, ...], rule_for: Callable[[str], StatRule | None]
+    ):
+        """Initializes the ExtractionPlan by compiling the rule of each stat.
+
+        Args:
+            stats: The stats of the header, in order.
+            rule_for: Returns the rule of a stat, or None to leave it out.
+        """
+        self.fingerprint = fingerprint(stats)
+        self.stats = stats
+        self._known = frozenset(stats)
+        self._steps: list[tuple[str, Converter]] = []
+        self._numeric: set[str] = set()
+        columns: dict[str, None] = {}
+        for stat in dict.fromkeys(stats):
+            rule = rule_for(stat)
+            if rule is None:
+                continue
+            self._steps.append((stat, rule["convert"]))
+            columns.update(dict.fromkeys(rule["columns"]))
+            if rule["numeric"]:
+                self._numeric.update(rule["columns"])
+        self.columns = tuple(columns)
+
+    def iter_rows(
+        self, table: Tag, unknown: set[str] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yields the values of each body row of a table, by column.
+
+        Each row's cells are walked once and mapped by their ``data-stat``;
+        rows without a ``td`` and rows giving no value are skipped. The
+        values are the text of the page, not yet coerced.
+
+        Args:
+            table: The BeautifulSoup table object.
+            unknown: Collects the stats the rows carry that are not in the
+                header.
+
+        Yields:
+            The values of a row by column, leaving out the missing ones.
+        """
+        for tbody in table.find_all("tbody"):
+            for row in tbody.find_all("tr"):
+                cells: dict[str, Tag] = {}
+                has_td = False
+                for cell in row.find_all(attrs={"data-stat": True}, recursive=False):
+                    has_td = has_td or cell.name == "td"
+                    cells.setdefault(cell["data-stat"], cell)
+                if not has_td and row.find("td") is None:
+                    continue
+
+                values: dict[str, Any] = {}
+                for stat, convert in self._steps:
+                    cell = cells.get(stat)
+                    if cell is not None:
+                        values.update(convert(cell))
+                if unknown is not None:
+                    unknown.update(cells.keys() - self._known)
+                if values:
+                    yield values
+
+    def frame(
+        self,
+        rows: Iterable[dict[str, Any]],
+        every_column: bool = False,
+        dtypes: dict[str, str | None] | None = None,
+    ) -> pd.DataFrame:
+        """Builds the typed DataFrame of rows from ``iter_rows``.
+
+        Missing values are NaN and the numeric columns are coerced with
+        ``coerce_numeric``.
+
+        Args:
+            rows: The rows.
+            every_column: Keep the columns no row has a value for, so that
+                frames of different rows of a table have the same columns.
+            dtypes: The dtypes of the numeric columns, see ``coerce_numeric``.
+                Defaults to the dtypes of these rows.
+
+        Returns:
+            The DataFrame.
+        """
+        columns: dict[str, list] = {column: [] for column in self.columns}
+        filled: set[str] = set()
+        n_rows = 0
+        for values in rows:
+            n_rows += 1
+            filled.update(values)
+            for column, column_values in columns.items():
+                column_values.append(values.get(column, math.nan))
+
+        kept = [column for column in self.columns if every_column or column in filled]
+        data = {column: columns[column] for column in kept}
+        data.update(
+            coerce_numeric(
+                {column: columns[column] for column in kept if column in self._numeric},
+                dtypes,
+            )
+        )
+        return pd.DataFrame(data, index=pd.RangeIndex(n_rows))
+
+    def extract(self, table: Tag) -> tuple[pd.DataFrame, set[str]]:
+        """Extracts the body rows of a table with this plan.
+
+        Only the columns some row has a value for are kept.
+
+        Args:
+            table: The BeautifulSoup table object.
+
+        Returns:
+            The rows as a DataFrame, and the stats the rows carry that are
+            not in the header.
+        """
+        unknown: set[str] = set()
+        return self.frame(self.iter_rows(table, unknown)), unknown
+
+    def iter_batches(
+        self, table: Tag, size: int = 500, unknown: set[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the body rows of a table in typed frames of ``size`` rows.
+
+        Each frame has every column of the plan, in order, so the frames can
+        be appended to one file as they come. The dtype of each numeric
+        column is decided over the whole table first, in a pass that keeps
+        only one batch of rows at a time, so a column is ``Float64`` in
+        every frame if any of its values has a decimal point.
+
+        Args:
+            table: The BeautifulSoup table object.
+            size: The number of rows of a frame.
+            unknown: Collects the stats the rows carry that are not in the
+                header.
+
+        Yields:
+            The frames.
+        """
+        dtypes: dict[str, str | None] = {}
+        for rows in itertools.batched(self.iter_rows(table, unknown), size):
+            columns = {
+                column: [values.get(column, math.nan) for values in rows]
+                for column in self._numeric
+            }
+            dtypes = _merge_dtypes(dtypes, numeric_dtypes(columns))
+
+        for rows in itertools.batched(self.iter_rows(table), size):
+            yield self.frame(rows, every_column=True, dtypes=dtypes)
+
+
+class PlanRegistry:
+    """The compiled plans of the process, and the schema drift it has seen.
+
+    Attributes:
+        drift: Every schema drift reported so far.
+    """
+
+    def __init__(self):
+        """Initializes an empty PlanRegistry."""
+        self._plans: dict[tuple[str, str], ExtractionPlan] = {}
+        self._layouts: dict[str, tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+        self.drift: list[SchemaDrift] = []
+
+    def plan(
+        self,
+        table: str,
+        layout: str,
+        stats: tuple[str, ...],
+        rule_for: Callable[[str], StatRule | None],
+    ) -> ExtractionPlan:
+        """Returns the plan of a header, compiling it the first time.
+
+        Args:
+            table: The table type, to compare the header with its last one.
+            layout: The name of the ``rule_for`` rules, which key the cached
+                plans together with the header's fingerprint.
+            stats: The stats of the header, in order.
+            rule_for: Returns the rule of a stat, or None to leave it out.
+
+        Returns:
+            The plan.
+        """
+        key = (layout, fingerprint(stats))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._plans[key] = ExtractionPlan(stats, rule_for)
+            previous = self._layouts.get(table)
+            self._layouts[table] = stats
+        if previous is not None and previous != stats:
+            self._report(
+                SchemaDrift(
+                    table=table,
+                    kind="header",
+                    added=[stat for stat in stats if stat not in previous],
+                    removed=[stat for stat in previous if stat not in stats],
+                    fingerprint=plan.fingerprint,
+                )
+            )
+        return plan
+
+    def extract(
+        self,
+        table: Tag,
+        table_type: str,
+        layout: str,
+        rule_for: Callable[[str], StatRule | None],
+    ) -> pd.DataFrame:
+        """Extracts a table with the plan of its header, reporting drift.
+
+        Args:
+            table: The BeautifulSoup table object.
+            table_type: The table type, such as ``stats_squads_standard_for``.
+            layout: The name of the ``rule_for`` rules.
+            rule_for: Returns the rule of a stat, or None to leave it out.
+
+        Returns:
+            The rows of the table as a DataFrame.
+        """
+        plan = self.plan(table_type, layout, header_stats(table), rule_for)
+        frame, unknown = plan.extract(table)
+        self._report_rows(table_type, plan, unknown)
+        return frame
+
+    def iter_batches(
+        self,
+        table: Tag,
+        table_type: str,
+        layout: str,
+        rule_for: Callable[[str], StatRule | None],
+        size: int = 500,
+    ) -> Iterator[pd.DataFrame]:
+        """Yields a table in frames of ``size`` rows, reporting drift.
+
+        The streaming counterpart of ``extract``, see
+        ``ExtractionPlan.iter_batches``.
+
+        Args:
+            table: The BeautifulSoup table object.
+            table_type: The table type, such as ``stats_squads_standard_for``.
+            layout: The name of the ``rule_for`` rules.
+            rule_for: Returns the rule of a stat, or None to leave it out.
+            size: The number of rows of a frame.
+
+        Yields:
+            The frames.
+        """
+        plan = self.plan(table_type, layout, header_stats(table), rule_for)
+        unknown: set[str] = set()
+        yield from plan.iter_batches(table, size, unknown)
+        self._report_rows(table_type, plan, unknown)
+
+    def _report_rows(self, table_type: str, plan: ExtractionPlan, unknown: set[str]):
+        if unknown:
+            self._report(
+                SchemaDrift(
+                    table=table_type,
+                    kind="rows",
+                    added=sorted(unknown),
+                    removed=[],
+                    fingerprint=plan.fingerprint,
+                )
+            )
+
+    def _report(self, drift: SchemaDrift):
+        with self._lock:
+            self.drift.append(drift)
+        if drift["kind"] == "header":
+            print(
+                f"⚠️ Schema drift in {drift['table']}: header changed, "
+                f"added {drift['added']}, removed {drift['removed']}"
+            )
+        else:
+            print(
+                f"⚠️ Schema drift in {drift['table']}: rows carry stats "
+                f"missing from the header {drift['added']}, left out"
+            )
+
+
+_default_registry: PlanRegistry | None = None
+
+
+def get_plan_registry() -> PlanRegistry:
+    """Returns the process wide registry of extraction plans."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = PlanRegistry()
+    return _default_registry
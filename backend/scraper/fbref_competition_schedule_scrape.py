@@ -2,23 +2,25 @@
 
 import os
 from datetime import datetime
-from typing import TypedDict, List
+import itertools
+from typing import Iterator, TypedDict, List
 import pandas as pd
-from bs4 import BeautifulSoup
 from patchright.sync_api import (
-    sync_playwright,
     Page,
-    TimeoutError as PlaywrightTimeoutError,
 )
 
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
-
-user_data_dir = "./playwright_user_data"
+from scraper.browser_pool import BrowserPool, get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.csv_stream import write_csv
+from scraper.fetch_engine import AsyncFetchEngine
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.frontier import CrawlFrontier, FrontierEntry
+from scraper.html_cache import get_html_cache
+from scraper.rate_limit import get_rate_limiter
+from scraper.retry_policy import get_retry_policy, retry_fetch, retry_scrape
+from scraper.table_extract import PageSections, iter_table_html, parse_table
+from scraper.telemetry import get_telemetry
+from scraper.tracing import get_tracer
 
 
 class LeagueData(TypedDict):
@@ -96,9 +98,20 @@ scrapes: LeagueList = [
 ]
 
 
+def _flatten(matches) -> pd.DataFrame:
+    """Flattens matches into a frame, with ``home_team_name`` style columns."""
+    df = pd.json_normalize(list(matches))
+    df.columns = df.columns.str.replace("home_team.", "home_team_", regex=False)
+    df.columns = df.columns.str.replace("away_team.", "away_team_", regex=False)
+    return df
+
+
 class FBRefCompetitionScheduleScraper:
     """A class to scrape football competition schedule data from FBRef."""
 
+    kind = "schedule"
+    sections = PageSections(table_prefixes=("sched_",))
+
     def __init__(self, league_name: str, fbref_id: int, season_year: str):
         """Initializes the FBRefCompetitionScheduleScraper."""
         self.league_name = league_name
@@ -107,65 +120,47 @@ class FBRefCompetitionScheduleScraper:
         self.base_url = f"https://fbref.com/en/comps/{fbref_id}/{season_year}/schedule/{season_year}-{league_name}-Scores-and-Fixtures"
         self.dataset: List[dict] = []
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    @retry_fetch()
     def fetch_page_html(self, page: Page) -> str:
         """Fetches the HTML content of the league's schedule page."""
         print(f"🔁 Navigating to {self.base_url}")
 
-        _ = page.goto(self.base_url, timeout=60_000, wait_until="domcontentloaded")
+        rate_limiter = get_rate_limiter()
+        rate_limiter.acquire(self.base_url)
+        telemetry = get_telemetry()
+        with telemetry.phase("goto"):
+            response = page.goto(
+                self.base_url, timeout=60_000, wait_until="domcontentloaded"
+            )
+        if response is not None:
+            rate_limiter.check_response(
+                self.base_url, response.status, response.headers.get("retry-after")
+            )
 
-        try:
-            _ = page.wait_for_selector("table", timeout=10_000)
-            print("✅ Page loaded and table found.")
+        get_challenge_handler().wait_for_tables(page)
+        with telemetry.phase("content"):
             return page.content()
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page. Checking Cloudflare")
-
-        try:
-            print("Checking Cloudflare status.")
-            page.wait_for_timeout(1000)
-            iframe_locator = page.frame_locator("iframe[id*='cf-chl-widget-']")
-
-            if iframe_locator.locator("body").count() != 0:
-                print("Cloudflare iframe Found!")
-                checkbox = iframe_locator.locator("input[type='checkbox']")
-                if not checkbox.all():
-                    page.wait_for_timeout(20_000)
-                    checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox.all():
-                    print("Clicking the checkbox.")
-                    checkbox.first.click(force=True, timeout=60_000)
-                    print("Cloudflare checkbox clicked.")
-                    print("Cloudflare Bypass successfully.")
-                else:
-                    raise PlaywrightTimeoutError("Checkbox not found")
-            else:
-                print("Iframe Doesn't Exist, Extracting the tables.")
-        except PlaywrightTimeoutError:
-            print("Checkbox not found.")
-
-        try:
-            _ = page.wait_for_selector("table", timeout=15_000)
-            print("✅ Page loaded and table found.")
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page.")
-            raise
-
-        return page.content()
-
-    def parse_schedule(self, html: str):
-        """Parses the HTML to extract the competition schedule."""
-        soup = BeautifulSoup(html, "html.parser")
-        tables = soup.select("table")
 
-        matches = []
-
-        for table in tables:
+    def iter_rows(self, html: str) -> Iterator[dict]:
+        """Yields the matches of the schedule one at a time.
+
+        Only the ``sections`` tables are parsed, the rest of the page is not,
+        and each table is parsed only once the matches of the previous one
+        have been consumed. Only the parse of each table runs in a span, as
+        a span must not stay open while the generator is suspended.
+
+        Args:
+            html: The HTML of the schedule page, raw or rendered.
+
+        Yields:
+            The matches, as ``parse_schedule`` stores them.
+        """
+        tracer = get_tracer()
+        for name, fragment in iter_table_html(html, self.sections):
+            with tracer.span("schedule.parse_table", table=name):
+                table = parse_table(fragment)
+            if table is None:
+                continue
             for row in table.select("tbody tr:has(td)"):
                 try:
                     home_team_cell = row.find("td", {"data-stat": "home_team"})
@@ -182,71 +177,124 @@ class FBRefCompetitionScheduleScraper:
                         "span", {"data-venue-epoch": True}
                     )["data-venue-epoch"]
 
-                    matches.append(
-                        {
-                            "fbref_id": match_link.split("/")[3]
-                            if match_link
-                            else None,
-                            "match_week": row.find(
-                                "th", {"data-stat": "gameweek"}
-                            ).get_text(strip=True),
-                            "day": row.find("td", {"data-stat": "dayofweek"}).get_text(
-                                strip=True
-                            ),
-                            "date": datetime.fromtimestamp(
-                                int(schedule_epoch)
-                            ).strftime("%Y-%m-%d"),
-                            "schedule_epoch": schedule_epoch,
-                            "home_team": {
-                                "name": home_team_cell.get_text(strip=True),
-                                "fbref_id": home_team_link.split("/")[3],
-                                "link": home_team_link,
-                            },
-                            "away_team": {
-                                "name": away_team_cell.get_text(strip=True),
-                                "fbref_id": away_team_link.split("/")[3],
-                                "link": away_team_link,
-                            },
-                            "score": row.find("td", {"data-stat": "score"}).get_text(
-                                strip=True
-                            ),
-                            "attendance": row.find("td", {"data-stat": "attendance"})[
-                                "csk"
-                            ],
-                            "venue": row.find("td", {"data-stat": "venue"}).get_text(
-                                strip=True
-                            ),
-                            "referee": row.find(
-                                "td", {"data-stat": "referee"}
-                            ).get_text(strip=True),
-                            "match_link": match_link,
-                            "competition_id": self.fbref_id,
-                            "season": self.season_year,
-                        }
-                    )
+                    match = {
+                        "fbref_id": match_link.split("/")[3] if match_link else None,
+                        "match_week": row.find(
+                            "th", {"data-stat": "gameweek"}
+                        ).get_text(strip=True),
+                        "day": row.find("td", {"data-stat": "dayofweek"}).get_text(
+                            strip=True
+                        ),
+                        "date": datetime.fromtimestamp(int(schedule_epoch)).strftime(
+                            "%Y-%m-%d"
+                        ),
+                        "schedule_epoch": schedule_epoch,
+                        "home_team": {
+                            "name": home_team_cell.get_text(strip=True),
+                            "fbref_id": home_team_link.split("/")[3],
+                            "link": home_team_link,
+                        },
+                        "away_team": {
+                            "name": away_team_cell.get_text(strip=True),
+                            "fbref_id": away_team_link.split("/")[3],
+                            "link": away_team_link,
+                        },
+                        "score": row.find("td", {"data-stat": "score"}).get_text(
+                            strip=True
+                        ),
+                        "attendance": row.find("td", {"data-stat": "attendance"})[
+                            "csk"
+                        ],
+                        "venue": row.find("td", {"data-stat": "venue"}).get_text(
+                            strip=True
+                        ),
+                        "referee": row.find("td", {"data-stat": "referee"}).get_text(
+                            strip=True
+                        ),
+                        "match_link": match_link,
+                        "competition_id": self.fbref_id,
+                        "season": self.season_year,
+                    }
                 except (AttributeError, TypeError, KeyError):
                     # skip incomplete rows like headers or rows without match data
                     continue
+                yield match
 
-        self.dataset = matches
+    def parse_schedule(self, html: str):
+        """Parses the HTML to extract the competition schedule.
+
+        Only the ``sections`` tables are parsed, the rest of the page is not.
+        The matches are kept whole in ``dataset``, as the incremental refresh
+        and the match batch read them after the scrape; a season has a few
+        hundred.
+        """
+        self.dataset = list(self.iter_rows(html))
         print(f"📦 Parsed {len(self.dataset)} matches.")
 
-    def scrape(self):
-        """Launches a Playwright browser and scrapes the data."""
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                channel="chrome",
-                headless=False,
-                no_viewport=True,
+    def scrape(self, pool: BrowserPool | None = None):
+        """Scrapes the data through the shared fetch strategy.
+
+        The page is served from the HTML cache or plain HTTP when possible;
+        a page is only borrowed from the browser pool for a challenge.
+
+        Args:
+            pool: The browser pool to borrow from. Defaults to the shared pool.
+        """
+        pool = pool or get_browser_pool()
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.league_name, self.season_year
+        ):
+            html = get_fetch_strategy().fetch(
+                self.base_url, lambda: pool.run(self.fetch_page_html)
             )
-            page = browser.new_page()
+            with telemetry.phase("parse"):
+                self.parse_schedule(html)
 
-            try:
-                html = self.fetch_page_html(page)
+    async def scrape_async(self, engine: AsyncFetchEngine):
+        """Fetches the page through the async fetch engine and parses it.
+
+        Args:
+            engine: The engine shared by all concurrently running scrapers.
+        """
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.league_name, self.season_year
+        ):
+            html = await engine.fetch(self.base_url)
+            with telemetry.phase("parse"):
                 self.parse_schedule(html)
-            finally:
-                browser.close()
+
+    def enqueue(self, frontier: CrawlFrontier, priority: int = 30) -> bool:
+        """Adds the schedule page to a crawl frontier.
+
+        Schedules default to the highest priority, as they list the matches
+        the match scraper needs.
+
+        Args:
+            frontier: The frontier to add the page to.
+            priority: Higher priorities are claimed first.
+
+        Returns:
+            True if the page was not already in the frontier.
+        """
+        return frontier.enqueue(
+            self.base_url,
+            self.kind,
+            league=self.league_name,
+            season=self.season_year,
+            priority=priority,
+            params={
+                "league_name": self.league_name,
+                "fbref_id": self.fbref_id,
+                "season_year": self.season_year,
+            },
+        )
+
+    @classmethod
+    def from_frontier(cls, entry: FrontierEntry) -> "FBRefCompetitionScheduleScraper":
+        """Rebuilds the scraper for a page claimed from a crawl frontier."""
+        return cls(**entry["params"])
 
     def save_to_csv(self):
         """Saves the scraped data to a CSV file."""
@@ -259,22 +307,20 @@ class FBRefCompetitionScheduleScraper:
         file_path = os.path.join(
             output_dir, f"schedule-{self.league_name}-{self.season_year}.csv"
         )
-        df = pd.json_normalize(self.dataset)
-        df.columns = df.columns.str.replace("home_team.", "home_team_", regex=False)
-        df.columns = df.columns.str.replace("away_team.", "away_team_", regex=False)
-        df.to_csv(file_path, index=False)
+        with get_tracer().span(
+            "save", path=file_path, format="csv", rows=len(self.dataset)
+        ):
+            write_csv(
+                file_path,
+                (_flatten(batch) for batch in itertools.batched(self.dataset, 500)),
+            )
         print(f"💾 Saved data to {file_path}")
 
 
 if __name__ == "__main__":
-    import time
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    import argparse
+
+    @retry_scrape(before_sleep=lambda _: get_browser_pool().recycle())
     def run_scraper_with_retries(scraper: FBRefCompetitionScheduleScraper):
         """Runs a scraper with a retry mechanism."""
         scraper.scrape()
@@ -282,6 +328,15 @@ if __name__ == "__main__":
 
     def main():
         """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+
         scraper_instances = [
             FBRefCompetitionScheduleScraper(
                 league_name=scrape["league_name"],
@@ -299,6 +354,11 @@ if __name__ == "__main__":
                 print(
                     f"Failed to scrape {scraper.base_url} after multiple retries: {e}"
                 )
-            time.sleep(5)
+
+        print(f"🧰 Browser pool stats: {get_browser_pool().stats()}")
+        print(f"📊 Fetch path stats: {get_fetch_strategy().stats()}")
+        print(f"🛡️ Challenge stats: {get_challenge_handler().stats()}")
+        print(f"🔁 Retry stats: {get_retry_policy().stats()}")
+        print(f"⏱️ Fetch telemetry report: {get_telemetry().write_report()}")
 
     main()
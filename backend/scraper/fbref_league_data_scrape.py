@@ -1,34 +1,35 @@
 """This script scrapes football league data from FBRef using Playwright.
 
 It defines a list of leagues and seasons to scrape, then iterates through them,
-launching a Playwright browser to fetch the HTML content of each league's stats
-page. The script then parses the HTML to extract tables of data, which are
-saved to CSV files.
+borrowing a page from the shared browser pool to fetch the HTML content of each
+league's stats page. The script then parses the HTML to extract tables of data,
+which are saved to CSV files.
 
 The script is designed to be resilient, with a multi-level retry mechanism to
-handle network errors and other intermittent issues. It also includes a delay
-between requests to avoid overwhelming the website's servers.
+handle network errors and other intermittent issues. Requests are throttled by
+a per-host token bucket (see ``scraper.rate_limit``) to avoid overwhelming the
+website's servers.
 """
 
 import os
 import uuid
 from typing import TypedDict
 import pandas as pd
-from bs4 import BeautifulSoup
 from patchright.sync_api import (
-    sync_playwright,
     Page,
-    TimeoutError as PlaywrightTimeoutError,
 )
 
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
-
-user_data_dir = "./playwright_user_data"
+from scraper.browser_pool import BrowserPool, get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.extraction_plan import StatRule, get_plan_registry, text_rule
+from scraper.fetch_engine import AsyncFetchEngine
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.frontier import CrawlFrontier, FrontierEntry
+from scraper.rate_limit import get_rate_limiter
+from scraper.retry_policy import retry_fetch
+from scraper.table_extract import PageSections, iter_table_html, parse_table
+from scraper.telemetry import get_telemetry
+from scraper.tracing import get_tracer
 
 
 class LeagueData(TypedDict):
@@ -146,6 +147,40 @@ scrapes: LeagueList = [
 ]
 
 
+def _team_values(cell) -> dict:
+    """Returns the id, URL, name and logo of the team of a ``team`` cell."""
+    values = {}
+    anchor = cell.find("a")
+    if anchor:
+        href = anchor.get("href", "")
+        values["team_id"] = (
+            href.split("/")[-3] if "squads" in href else href.split("/")[-2]
+        )
+        values["team_url"] = href
+        values["team"] = anchor.get_text(strip=True)
+    img = cell.find("img")
+    if img:
+        values["logo_url"] = img.get("src")
+    return values
+
+
+_TEAM_RULE = StatRule(
+    columns=("team_id", "team_url", "team", "logo_url"),
+    convert=_team_values,
+    numeric=False,
+)
+
+
+def _home_rule(stat: str) -> StatRule:
+    """Returns the extraction rule of a stat of a league table."""
+    return _TEAM_RULE if stat == "team" else text_rule(stat)
+
+
+def _away_rule(stat: str) -> StatRule:
+    """Returns the rule of a stat of an ``against`` table, suffixed ``_away``."""
+    return _TEAM_RULE if stat == "team" else text_rule(f"{stat}_away")
+
+
 class FBRefPlaywrightScraper:
     """A class to scrape football league data from FBRef.
 
@@ -157,6 +192,9 @@ class FBRefPlaywrightScraper:
         dataset: A dictionary to store the scraped data.
     """
 
+    kind = "league"
+    sections = PageSections(exclude_table_ids=("nations",))
+
     def __init__(self, league_name: str, fbref_id: int, season_year: str):
         """Initializes the FBRefPlaywrightScraper.
 
@@ -171,12 +209,7 @@ class FBRefPlaywrightScraper:
         self.base_url: str = f"https://fbref.com/en/comps/{fbref_id}/{season_year}/{season_year}-{league_name}-Stats"
         self.dataset: dict[str, pd.DataFrame] = {}
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    @retry_fetch()
     def fetch_page_html(self, page: Page) -> str:
         """Fetches the HTML content of the league's stats page.
 
@@ -188,141 +221,135 @@ class FBRefPlaywrightScraper:
         """
         print(f"🔁 Navigating to {self.base_url}")
 
-        _ = page.goto(self.base_url, timeout=60_000, wait_until="domcontentloaded")
+        rate_limiter = get_rate_limiter()
+        rate_limiter.acquire(self.base_url)
+        telemetry = get_telemetry()
+        with telemetry.phase("goto"):
+            response = page.goto(
+                self.base_url, timeout=60_000, wait_until="domcontentloaded"
+            )
+        if response is not None:
+            rate_limiter.check_response(
+                self.base_url, response.status, response.headers.get("retry-after")
+            )
         # page.wait_for_load_state("networkidle", timeout=60_000)
 
-        try:
-            _ = page.wait_for_selector("table", timeout=10_000)
-            print("✅ Page loaded and table found.")
-
+        get_challenge_handler().wait_for_tables(page)
+        with telemetry.phase("content"):
             return page.content()
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page. Checking Cloudflare")
-
-        try:
-            print("Checking Cloudflare status.")
-            page.wait_for_timeout(1000)
-            iframe_locator = page.frame_locator("iframe[id*='cf-chl-widget-']")
-
-            if iframe_locator.locator("body").count() != 0:
-                print("Cloudflare iframe Found!")
-                checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox.all() == []:
-                    page.wait_for_timeout(20_000)
-                    checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox is not None:
-                    if checkbox.all() != []:
-                        checkbox = iframe_locator.locator("input[type='checkbox']")
-                        print("Clicking the checkbox.")
-                        checkbox.first.click(force=True, timeout=60_000)
-                        print("Cloudflare checkbox cliked,")
-                        print("Cloudflare Bypass successfully.")
-                    else:
-                        raise PlaywrightTimeoutError("Checkbox not found")
-            else:
-                print("Iframe Doesn't Exist, Extracting the tables.")
-        except PlaywrightTimeoutError:
-            print("Checkbox not found.")
-
-        try:
-            _ = page.wait_for_selector("table", timeout=15_000)
-            print("✅ Page loaded and table found.")
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page.")
-            raise
-
-        return page.content()
 
     def parse_tables(self, html: str):
         """Parses the HTML to extract tables of data.
 
+        Each of the ``sections`` tables is cut out of the markup and parsed
+        on its own, so the tables FBRef leaves in comments are found in the
+        raw HTML too, and the rest of the page is never parsed. Each table
+        is parsed in a span of its own when tracing is on.
+
         Args:
-            html: The HTML content of the page.
+            html: The HTML content of the page, raw or rendered.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        tables = soup.select("table")
-        table_names = [table.get("id") for table in tables]
-
-        for table, name in zip(tables, table_names):
-            if not name or name == "nations":
-                continue
-            print(f"📦 Parsing table: {name}")
-            data = self._get_table_stats_and_header(table)
+        tracer = get_tracer()
+        for name, fragment in iter_table_html(html, self.sections):
+            with tracer.span("league.parse_table", table=name) as span:
+                table = parse_table(fragment)
+                if table is None:
+                    continue
+                print(f"📦 Parsing table: {name}")
+                if name.startswith("results") and "_" in name:
+                    name = "results_" + name.split("_", 1)[1]
+                data = self._get_table_stats_and_header(table, name)
+                if span is not None:
+                    span.set_attributes(rows=len(data))
             data["competition_id"] = self.fbref_id
             data["season_id"] = self.season_year
             data["id"] = str(uuid.uuid4())
-
-            if name.startswith("results") and "_" in name:
-                name = "results_" + name.split("_", 1)[1]
             self.dataset[name] = data
 
-    def _get_table_stats_and_header(self, table):
+    def _get_table_stats_and_header(self, table, table_type: str):
         """Extracts the stats and headers from a table.
 
+        The table is extracted with the cached plan of its header, so the
+        columns and the handling of each stat are worked out once per layout
+        and not once per table; a header that changes is reported as schema
+        drift.
+
         Args:
             table: The BeautifulSoup table object.
+            table_type: The name the table is stored under in the dataset.
 
         Returns:
-            A tuple containing the table headers and data.
+            A DataFrame with a column per stat and a row per team.
         """
-        stat_tags = []
+        is_away = "against" in (table.get("id") or "")
+        return get_plan_registry().extract(
+            table,
+            table_type,
+            "league_against" if is_away else "league",
+            _away_rule if is_away else _home_rule,
+        )
 
-        for th in table.find_all("th", attrs={"aria-label": True}):
-            stat_tag = th.get("data-stat")
-            if stat_tag:
-                stat_tags.append(stat_tag)
+    def scrape(self, pool: BrowserPool | None = None):
+        """Scrapes the data through the shared fetch strategy.
 
-        rows = []
-        is_away = "against" in (table.get("id") or "")
-        for row in table.select("tbody tr:has(td)"):
-            data = {}
-            for stat in stat_tags:
-                cell = row.find(attrs={"data-stat": stat})
-                if not cell:
-                    continue
+        The page is served from the HTML cache or plain HTTP when possible;
+        a page is only borrowed from the browser pool for a challenge.
 
-                text = cell.get_text(strip=True)
-
-                if stat == "team":
-                    anchor = cell.find("a")
-                    if anchor:
-                        href = anchor.get("href", "")
-                        team_id = (
-                            href.split("/")[-3]
-                            if "squads" in href
-                            else href.split("/")[-2]
-                        )
-                        data["team_id"] = team_id
-                        data["team_url"] = href
-                        data["team"] = anchor.get_text(strip=True)
-
-                    img = cell.find("img")
-                    if img:
-                        data["logo_url"] = img.get("src")
-                else:
-                    colname = f"{stat}_away" if is_away else stat
-                    data[colname] = text
-            rows.append(data)
-
-        league_table_data = pd.DataFrame(rows)
-        return league_table_data
-
-    def scrape(self):
-        """Launches a Playwright browser and scrapes the data."""
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                channel="chrome",
-                headless=False,
-                no_viewport=True,
+        Args:
+            pool: The browser pool to borrow from. Defaults to the shared pool.
+        """
+        pool = pool or get_browser_pool()
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.league_name, self.season_year
+        ):
+            html = get_fetch_strategy().fetch(
+                self.base_url, lambda: pool.run(self.fetch_page_html)
             )
-            page = browser.new_page()
+            with telemetry.phase("parse"):
+                self.parse_tables(html)
+
+    async def scrape_async(self, engine: AsyncFetchEngine):
+        """Fetches the page through the async fetch engine and parses it.
 
-            try:
-                html = self.fetch_page_html(page)
+        Args:
+            engine: The engine shared by all concurrently running scrapers.
+        """
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.league_name, self.season_year
+        ):
+            html = await engine.fetch(self.base_url)
+            with telemetry.phase("parse"):
                 self.parse_tables(html)
-            finally:
-                browser.close()
+
+    def enqueue(self, frontier: CrawlFrontier, priority: int = 20) -> bool:
+        """Adds the league's stats page to a crawl frontier.
+
+        Args:
+            frontier: The frontier to add the page to.
+            priority: Higher priorities are claimed first.
+
+        Returns:
+            True if the page was not already in the frontier.
+        """
+        return frontier.enqueue(
+            self.base_url,
+            self.kind,
+            league=self.league_name,
+            season=self.season_year,
+            priority=priority,
+            params={
+                "league_name": self.league_name,
+                "fbref_id": self.fbref_id,
+                "season_year": self.season_year,
+            },
+        )
+
+    @classmethod
+    def from_frontier(cls, entry: FrontierEntry) -> "FBRefPlaywrightScraper":
+        """Rebuilds the scraper for a page claimed from a crawl frontier."""
+        return cls(**entry["params"])
 
     def get_dataset(self):
         return self.dataset
@@ -335,7 +362,13 @@ class FBRefPlaywrightScraper:
             file_path = os.path.join(
                 output_dir, f"{name}-{self.league_name}-{self.season_year}.csv"
             )
-            df.to_csv(file_path, index=False)
+            with get_tracer().span(
+                "save",
+                path=file_path,
+                format="csv",
+                rows=len(df),
+            ):
+                df.to_csv(file_path, index=False)
             print(f"💾 Saved data to {file_path}")
 
 
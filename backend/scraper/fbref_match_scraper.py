@@ -1,5 +1,6 @@
 """This script scrapes football match data from FBRef using Playwright."""
 
+import asyncio
 import os
 import re
 import json
@@ -8,21 +9,22 @@ import logging
 from typing import TypedDict
 from bs4.element import PageElement
 import pandas as pd
-from bs4 import BeautifulSoup
 from patchright.sync_api import (
-    sync_playwright,
     Page,
-    TimeoutError as PlaywrightTimeoutError,
 )
 
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
-
-user_data_dir = "./playwright_user_data"
+from scraper.browser_pool import BrowserPool, get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.fetch_engine import AsyncFetchEngine
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.frontier import CrawlFrontier, FrontierEntry
+from scraper.html_cache import get_html_cache
+from scraper.page_index import PageIndex
+from scraper.rate_limit import get_rate_limiter
+from scraper.retry_policy import get_retry_policy, retry_fetch, retry_scrape
+from scraper.table_extract import PageSections, make_section_soup
+from scraper.telemetry import get_telemetry
+from scraper.tracing import get_tracer, traced
 
 
 class MatchData(TypedDict):
@@ -55,11 +57,46 @@ scrapes: MatchList = [
 ]
 
 
+class _Abbreviated:
+    """An element rendered for a log message only if the message is emitted.
+
+    Rendering the whole element, let alone prettifying it, cost more than
+    parsing it, and was paid even when nothing was logged.
+    """
+
+    __slots__ = ("element", "limit")
+
+    def __init__(self, element: PageElement, limit: int = 300):
+        self.element = element
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.element)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[: self.limit]}... ({len(text)} chars)"
+
+
 class FBRefMatchScraper:
     """A class to scrape football match data from FBRef."""
 
+    kind = "match"
+    sections = PageSections(
+        selectors=(
+            "div#content > h1",
+            "div.scorebox",
+            "div.lineup",
+            "div.event",
+            "div#team_stats",
+            "div#team_stats_extra",
+            "div.filter.switcher",
+        ),
+        table_prefixes=("stats_", "keeper_stats_"),
+    )
+
     def __init__(self, match_data: MatchData):
         """Initializes the FBRefMatchScraper."""
+        self.match_data = match_data
         self.base_url = f"https://fbref.com/en/matches/{match_data['fbref_id']}/{match_data['home_team']}-{match_data['away_team']}-{match_data['date']}-{match_data['league_name']}"
         self.match_id = match_data["fbref_id"]
         self.match_name = f"{match_data['home_team']}-{match_data['away_team']}-{match_data['fbref_id']}"
@@ -73,89 +110,65 @@ class FBRefMatchScraper:
         self.logger = logging.getLogger(f"FBRefMatchScraper_match_data")
         self.logger.setLevel(logging.INFO)
 
-        # Create a file handler
-        handler = logging.FileHandler(log_file)
-        handler.setLevel(logging.INFO)
-
-        # Create a logging format
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-
-        # Add the handlers to the logger
+        # Add the file handler once: every match of a run shares the logger,
+        # and opening the log file per match leaked a file per scraper.
         if not self.logger.handlers:
+            handler = logging.FileHandler(log_file)
+            handler.setLevel(logging.INFO)
+
+            # Create a logging format
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            handler.setFormatter(formatter)
             self.logger.addHandler(handler)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    @retry_fetch()
     def fetch_page_html(self, page: Page) -> str:
         """Fetches the HTML content of the league's stats page."""
-        self.logger.info(f"🔁 Navigating to {self.base_url}")
-
-        _ = page.goto(self.base_url, timeout=60_000, wait_until="domcontentloaded")
+        self.logger.info("🔁 Navigating to %s", self.base_url)
+
+        rate_limiter = get_rate_limiter()
+        rate_limiter.acquire(self.base_url)
+        telemetry = get_telemetry()
+        with telemetry.phase("goto"):
+            response = page.goto(
+                self.base_url, timeout=60_000, wait_until="domcontentloaded"
+            )
+        if response is not None:
+            rate_limiter.check_response(
+                self.base_url, response.status, response.headers.get("retry-after")
+            )
 
-        try:
-            _ = page.wait_for_selector("table", timeout=10_000)
-            self.logger.info("✅ Page loaded and table found.")
+        get_challenge_handler().wait_for_tables(page, log=self.logger.info)
+        with telemetry.phase("content"):
             return page.content()
-        except PlaywrightTimeoutError:
-            self.logger.warning("❌ No table found on the page. Checking Cloudflare")
-
-        try:
-            self.logger.info("Checking Cloudflare status.")
-            page.wait_for_timeout(1000)
-            iframe_locator = page.frame_locator("iframe[id*='cf-chl-widget-']")
-
-            if iframe_locator.locator("body").count() != 0:
-                self.logger.info("Cloudflare iframe Found!")
-                checkbox = iframe_locator.locator("input[type='checkbox']")
-                if not checkbox.all():
-                    page.wait_for_timeout(20_000)
-                    checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox.all():
-                    self.logger.info("Clicking the checkbox.")
-                    checkbox.first.click(force=True, timeout=60_000)
-                    self.logger.info("Cloudflare checkbox clicked.")
-                    self.logger.info("Cloudflare Bypass successfully.")
-                else:
-                    raise PlaywrightTimeoutError("Checkbox not found")
-            else:
-                self.logger.info("Iframe Doesn't Exist, Extracting the tables.")
-        except PlaywrightTimeoutError:
-            self.logger.warning("Checkbox not found.")
-
-        try:
-            _ = page.wait_for_selector("table", timeout=15_000)
-            self.logger.info("✅ Page loaded and table found.")
-        except PlaywrightTimeoutError:
-            self.logger.error("❌ No table found on the page.")
-            raise
-
-        return page.content()
 
+    @traced("match.parse")
     def parse_match_page(self, html: str):
-        """Parses the HTML to extract all match data."""
-        soup = BeautifulSoup(html, "html.parser")
+        """Parses the HTML to extract all match data.
+
+        Only the ``sections`` the parser reads are turned into a soup, which
+        is indexed once for all the extractors to look their elements up in.
+        Each extractor runs in a span of its own when tracing is on.
+        """
+        with get_tracer().span("match.soup", html_bytes=len(html)):
+            page = PageIndex(make_section_soup(html, self.sections))
 
-        match_info = self._parse_match_info(soup)
-        home_team, away_team = self._parse_score_box(soup)
+        match_info = self._parse_match_info(page)
+        home_team, away_team = self._parse_score_box(page)
 
-        home_team["formation"] = self._extract_formation(soup, "a")
-        away_team["formation"] = self._extract_formation(soup, "b")
+        home_team["formation"] = self._extract_formation(page, "a")
+        away_team["formation"] = self._extract_formation(page, "b")
 
-        home_team["lineup"] = self._extract_lineup(soup, "a")
-        away_team["lineup"] = self._extract_lineup(soup, "b")
+        home_team["lineup"] = self._extract_lineup(page, "a")
+        away_team["lineup"] = self._extract_lineup(page, "b")
 
-        home_team["events"] = self._extract_match_events(soup, "a")
-        away_team["events"] = self._extract_match_events(soup, "b")
+        home_team["events"] = self._extract_match_events(page, "a")
+        away_team["events"] = self._extract_match_events(page, "b")
 
-        team_stats = self._extract_team_stats(soup)
-        extra_team_stats = self._extract_extra_team_stats(soup)
+        team_stats = self._extract_team_stats(page)
+        extra_team_stats = self._extract_extra_team_stats(page)
 
         home_team_name = home_team["team_name"]
         away_team_name = away_team["team_name"]
@@ -178,14 +191,14 @@ class FBRefMatchScraper:
             x.get("data-show").split("_")[-1]
             if "passing_type" not in x.get("data-show")
             else "_".join(x.get("data-show").split("_")[-2:])
-            for x in soup.find("div", class_="filter switcher").find_all("a")
+            for x in page.first_by_class("filter switcher", "div").find_all("a")
         ]
 
         home_team["player_stats"] = self._extract_all_player_stats_grouped(
-            soup, home_team["team_id"], player_stats_types
+            page, home_team["team_id"], player_stats_types
         )
         away_team["player_stats"] = self._extract_all_player_stats_grouped(
-            soup, away_team["team_id"], player_stats_types
+            page, away_team["team_id"], player_stats_types
         )
 
         self.dataset = {
@@ -195,26 +208,30 @@ class FBRefMatchScraper:
             "away_team": away_team,
         }
 
-    def _parse_match_info(self, soup: BeautifulSoup):
+    @traced("match.match_info")
+    def _parse_match_info(self, page: PageIndex):
         """Parses the match information from the page.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
 
         Returns:
             A dictionary containing the match name, date, attendance, and venue.
         """
-        self.logger.info("📝 Parsing match info...")
-        header = soup.select_one("div#content > h1")
+        self.logger.debug("📝 Parsing match info...")
+        content = page.by_id("content", "div")
+        header = content.find("h1", recursive=False) if content else None
         header_split = header.text.split("–")
         match_name = header_split[0].split("Match")[0].strip()
         match_date = header_split[1].strip()
 
-        scorebox_meta = soup.find("div", class_="scorebox_meta").find_all("div")[-3:-1]
+        scorebox_meta = page.first_by_class("scorebox_meta", "div").find_all("div")[
+            -3:-1
+        ]
         attendance = scorebox_meta[0].text.split(": ")[-1].strip()
         venue = scorebox_meta[1].text.split(": ")[-1].strip()
 
-        self.logger.info("✅ Match info parsed.")
+        self.logger.debug("✅ Match info parsed.")
         return {
             "match_name": match_name,
             "match_date": match_date,
@@ -222,17 +239,18 @@ class FBRefMatchScraper:
             "venue": venue,
         }
 
-    def _parse_score_box(self, soup: BeautifulSoup):
+    @traced("match.score_box")
+    def _parse_score_box(self, page: PageIndex):
         """Parses the scorebox to get team data.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
 
         Returns:
             A tuple containing the home and away team data.
         """
-        self.logger.info("📝 Parsing scorebox...")
-        scorebox = soup.find("div", class_="scorebox")
+        self.logger.debug("📝 Parsing scorebox...")
+        scorebox = page.first_by_class("scorebox", "div")
         teams = scorebox.find_all("div", recursive=False)
 
         home_team = self._parse_team_score_box(teams[0])
@@ -241,7 +259,7 @@ class FBRefMatchScraper:
         home_team["team_id"] = home_team["logo_url"].split("/")[-1].split(".")[0]
         away_team["team_id"] = away_team["logo_url"].split("/")[-1].split(".")[0]
 
-        self.logger.info("✅ Scorebox parsed.")
+        self.logger.debug("✅ Scorebox parsed.")
         return home_team, away_team
 
     def _parse_team_score_box(self, team_div):
@@ -254,7 +272,7 @@ class FBRefMatchScraper:
             A dictionary containing the team's data.
         """
         name = team_div.find("strong").find("a").text
-        self.logger.info(f"📝 Parsing team scorebox for team {name}...")
+        self.logger.debug("📝 Parsing team scorebox for team %s...", name)
         logo = team_div.find("img")["src"]
         score = team_div.find("div", class_="score").text.strip()
         xg = team_div.find("div", class_="score_xg").text.strip()
@@ -277,7 +295,9 @@ class FBRefMatchScraper:
                 info[label] = value
             except Exception as e:
                 self.logger.warning(
-                    f"Warning: Failed to parse datapoint: {div} | Error: {e}"
+                    "Warning: Failed to parse datapoint: %s | Error: %s",
+                    _Abbreviated(div),
+                    e,
                 )
 
         manager = info.get("Manager")
@@ -286,7 +306,7 @@ class FBRefMatchScraper:
 
         captain_fbref_id = captain_link["href"].split("/")[-2] if captain_link else None
 
-        self.logger.info(f"✅ Team scorebox for {name} parsed.")
+        self.logger.debug("✅ Team scorebox for %s parsed.", name)
         return {
             "team_name": name,
             "logo_url": logo,
@@ -297,40 +317,44 @@ class FBRefMatchScraper:
             "captain": {"name": captain_name, "fbref_id": captain_fbref_id},
         }
 
-    def _extract_formation(self, soup: BeautifulSoup, team_id: str):
+    @traced("match.formation")
+    def _extract_formation(self, page: PageIndex, team_id: str):
         """Extracts the formation of a team.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
             team_id: The ID of the team ('a' for home, 'b' for away).
 
         Returns:
             The formation string (e.g., '4-3-3') or None if not found.
         """
-        self.logger.info(f"📝 Extracting formation for team {team_id}...")
-        lineup_soup = soup.find("div", id=team_id, class_="lineup")
+        self.logger.debug("📝 Extracting formation for team %s...", team_id)
+        lineup_soup = page.by_id(team_id, "div", "lineup")
         try:
             text = lineup_soup.find("th").text
             match = re.search(r"\(([-\d]+)\)", text)
             formation = match.group(1) if match else None
-            self.logger.info(f"✅ Formation for team {team_id} extracted: {formation}")
+            self.logger.debug(
+                "✅ Formation for team %s extracted: %s", team_id, formation
+            )
             return formation
         except Exception as e:
-            self.logger.error(f"Error extracting formation: {e}")
+            self.logger.error("Error extracting formation: %s", e)
             return None
 
-    def _extract_lineup(self, soup: BeautifulSoup, team_id: str):
+    @traced("match.lineup")
+    def _extract_lineup(self, page: PageIndex, team_id: str):
         """Extracts the starting lineup of a team.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
             team_id: The ID of the team ('a' for home, 'b' for away).
 
         Returns:
             A list of dictionaries, each representing a player in the lineup.
         """
-        self.logger.info(f"📝 Extracting lineup for team {team_id}...")
-        lineup_soup = soup.find("div", id=team_id, class_="lineup")
+        self.logger.debug("📝 Extracting lineup for team %s...", team_id)
+        lineup_soup = page.by_id(team_id, "div", "lineup")
         players = lineup_soup.find_all("tr")[1:]
 
         lineup = []
@@ -349,23 +373,24 @@ class FBRefMatchScraper:
                     "fbref_id": player.find("a").get("href").split("/")[-2],
                 }
             )
-        self.logger.info(
-            f"✅ Lineup for team {team_id} extracted with {len(lineup)} players."
+        self.logger.debug(
+            "✅ Lineup for team %s extracted with %d players.", team_id, len(lineup)
         )
         return lineup
 
-    def _extract_match_events(self, soup: BeautifulSoup, team_id: str):
+    @traced("match.events")
+    def _extract_match_events(self, page: PageIndex, team_id: str):
         """Extracts match events like goals, substitutions, and cards.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
             team_id: The ID of the team ('a' for home, 'b' for away).
 
         Returns:
             A list of dictionaries, each representing a match event.
         """
-        self.logger.info(f"📝 Extracting match events for team {team_id}...")
-        events_html = soup.find_all("div", class_=f"event {team_id}")
+        self.logger.debug("📝 Extracting match events for team %s...", team_id)
+        events_html = page.by_class(f"event {team_id}", "div")
         events = []
         for event_div in events_html:
             icon_div = event_div.find("div", class_="event_icon")
@@ -403,7 +428,9 @@ class FBRefMatchScraper:
                         "event": event_data,
                     }
                 )
-        self.logger.info(f"✅ Extracted {len(events)} match events for team {team_id}.")
+        self.logger.debug(
+            "✅ Extracted %d match events for team %s.", len(events), team_id
+        )
         return events
 
     def _extract_goal(self, event_block):
@@ -492,19 +519,20 @@ class FBRefMatchScraper:
             else []
         )
 
-    def _extract_team_stats(self, soup: BeautifulSoup):
+    @traced("match.team_stats")
+    def _extract_team_stats(self, page: PageIndex):
         """Extracts the main team stats from the team stats table.
 
         This method is designed to be robust against changes in the HTML structure.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
 
         Returns:
             A dictionary containing the team stats for both teams.
         """
-        self.logger.info("📝 Extracting team stats...")
-        team_stats_table = soup.find("div", id="team_stats")
+        self.logger.debug("📝 Extracting team stats...")
+        team_stats_table = page.by_id("team_stats", "div")
         if not team_stats_table:
             self.logger.warning("⚠️ Team stats table not found.")
             return {}
@@ -512,7 +540,7 @@ class FBRefMatchScraper:
 
         try:
             team1, team2 = [th.get_text(strip=True) for th in rows[0].find_all("th")]
-            self.logger.info(f"Found teams: {team1} and {team2}")
+            self.logger.debug("Found teams: %s and %s", team1, team2)
         except IndexError:
             self.logger.error("Could not parse team names from team stats table header.")
             return {}
@@ -566,12 +594,12 @@ class FBRefMatchScraper:
 
             cells = rows[i].find_all("td")
             if len(cells) != 2:
-                self.logger.warning(f"Could not find 2 cells for label '{label}'")
+                self.logger.warning("Could not find 2 cells for label '%s'", label)
                 i += 1
                 continue
 
             if label not in label_map:
-                self.logger.warning(f"Label '{label}' not in label_map, skipping.")
+                self.logger.warning("Label '%s' not in label_map, skipping.", label)
                 i += 1
                 continue
 
@@ -581,31 +609,32 @@ class FBRefMatchScraper:
             try:
                 stats[team1][stat_key] = parser(cells[0])
                 stats[team2][stat_key] = parser(cells[1])
-                self.logger.info(f"Successfully parsed stats for '{label}'")
+                self.logger.debug("Successfully parsed stats for '%s'", label)
             except Exception as e:
-                self.logger.error(f"Error parsing stats for label '{label}': {e}")
+                self.logger.error("Error parsing stats for label '%s': %s", label, e)
 
             i += 1
 
-        self.logger.info(
-            f"✅ Team stats extracted for {len(stats.get(team1, {}))} categories for {team1}."
-        )
-        self.logger.info(
-            f"✅ Team stats extracted for {len(stats.get(team2, {}))} categories for {team2}."
-        )
+        for team in (team1, team2):
+            self.logger.debug(
+                "✅ Team stats extracted for %d categories for %s.",
+                len(stats.get(team, {})),
+                team,
+            )
         return stats
 
-    def _extract_extra_team_stats(self, soup: BeautifulSoup):
+    @traced("match.extra_team_stats")
+    def _extract_extra_team_stats(self, page: PageIndex):
         """Extracts additional team stats.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
 
         Returns:
             A dictionary containing the extra team stats for both teams.
         """
-        self.logger.info("📝 Extracting extra team stats...")
-        container = soup.select_one("#team_stats_extra")
+        self.logger.debug("📝 Extracting extra team stats...")
+        container = page.by_id("team_stats_extra")
         if not container:
             self.logger.warning("⚠️ Extra team stats container not found.")
             return {}
@@ -644,14 +673,17 @@ class FBRefMatchScraper:
                     stats[team2_name][label] = val2
                 except IndexError:
                     self.logger.warning(
-                        f"⚠️ Malformed stat block in extra_stats: {block.prettify()}"
+                        "⚠️ Malformed stat block in extra_stats: %s",
+                        _Abbreviated(block),
                     )
                 except Exception as e:
                     self.logger.error(
-                        f"⚠️ Could not parse extra stat block: {block.prettify()} | Error: {e}"
+                        "⚠️ Could not parse extra stat block: %s | Error: %s",
+                        _Abbreviated(block),
+                        e,
                     )
 
-        self.logger.info("✅ Extra team stats extracted.")
+        self.logger.debug("✅ Extra team stats extracted.")
         return stats
 
     def _try_parse_number(self, text: str):
@@ -682,11 +714,22 @@ class FBRefMatchScraper:
         Returns:
             A list of dictionaries, each representing a player's stats.
         """
-        players = []
-        rows = table.find_all("tr")
-        headers = [cell.get("data-stat") for cell in rows[0].find_all(["th", "td"])]
+        return list(self.iter_player_stats_rows(table, stat_type, team_id))
+
+    def iter_player_stats_rows(self, table, stat_type=None, team_id=None):
+        """Yields the players of a table of player stats one at a time.
 
-        for i, row in enumerate(rows):
+        The streaming variant of ``_parse_player_stats_table``.
+
+        Args:
+            table: The BeautifulSoup object of the table.
+            stat_type: The type of stats being parsed.
+            team_id: The ID of the team.
+
+        Yields:
+            A dictionary for each player, representing the player's stats.
+        """
+        for i, row in enumerate(table.find_all("tr")):
             if not row.find("th", {"data-stat": "player"}):
                 continue
 
@@ -714,45 +757,58 @@ class FBRefMatchScraper:
                         player_data["age"] = text.split("-")[0]
                     else:
                         player_data[key] = value
-                players.append(player_data)
             except Exception as e:
                 self.logger.error(
-                    f"❗️ Error parsing row {i} for stat_type '{stat_type}' (team_id: {team_id})"
+                    "❗️ Error parsing row %d for stat_type '%s' (team_id: %s)",
+                    i,
+                    stat_type,
+                    team_id,
                 )
-        return players
+            else:
+                yield player_data
 
-    def _extract_player_stats_type(self, soup, team_id, stat_type):
+    def _extract_player_stats_type(self, page: PageIndex, team_id, stat_type):
         """Extracts a specific type of player stats.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
             team_id: The ID of the team.
             stat_type: The type of stats to extract.
 
         Returns:
             A list of dictionaries, each representing a player's stats for the given type.
         """
-        self.logger.info(
-            f"📝 Extracting '{stat_type}' player stats for team {team_id}..."
+        self.logger.debug(
+            "📝 Extracting '%s' player stats for team %s...", stat_type, team_id
         )
         table_id = f"stats_{team_id}_{stat_type}"
-        table = soup.find("table", id=table_id)
-        if not table:
-            self.logger.warning(
-                f"⚠️ '{stat_type}' player stats table not found for team {team_id}."
-            )
-            return []
-        stats = self._parse_player_stats_table(table, stat_type, team_id)
-        self.logger.info(
-            f"✅ Extracted '{stat_type}' player stats for {len(stats)} players."
+        with get_tracer().span(
+            "match.player_stats_table", team_id=team_id, stat_type=stat_type
+        ) as span:
+            table = page.table(table_id)
+            if not table:
+                self.logger.warning(
+                    "⚠️ '%s' player stats table not found for team %s.",
+                    stat_type,
+                    team_id,
+                )
+                return []
+            stats = self._parse_player_stats_table(table, stat_type, team_id)
+            if span is not None:
+                span.set_attributes(rows=len(stats))
+        self.logger.debug(
+            "✅ Extracted '%s' player stats for %d players.", stat_type, len(stats)
         )
         return stats
 
-    def _extract_all_player_stats_grouped(self, soup, team_id, player_stats_types):
+    @traced("match.player_stats")
+    def _extract_all_player_stats_grouped(
+        self, page: PageIndex, team_id, player_stats_types
+    ):
         """Groups all player stats from different tables.
 
         Args:
-            soup: The BeautifulSoup object of the page.
+            page: The index of the parsed page.
             team_id: The ID of the team.
             player_stats_types: A list of stat types to extract.
 
@@ -761,7 +817,7 @@ class FBRefMatchScraper:
         """
         from collections import defaultdict
 
-        self.logger.info(f"📝 Grouping all player stats for team {team_id}...")
+        self.logger.debug("📝 Grouping all player stats for team %s...", team_id)
         grouped_stats = defaultdict(
             lambda: {"name": None, "link": None, "fbref_id": None}
         )
@@ -769,7 +825,7 @@ class FBRefMatchScraper:
         for stat_type in player_stats_types:
             try:
                 player_rows = self._extract_player_stats_type(
-                    soup, team_id=team_id, stat_type=stat_type
+                    page, team_id=team_id, stat_type=stat_type
                 )[1:-1]
             except Exception as e:
                 continue
@@ -787,10 +843,13 @@ class FBRefMatchScraper:
                 except Exception as e:
                     pass
 
-        gk_stat_table = soup.find("table", id=f"keeper_stats_{team_id}")
+        gk_stat_table = page.table(f"keeper_stats_{team_id}")
         if gk_stat_table:
-            self.logger.info(f"📝 Extracting goalkeeper stats for team {team_id}...")
-            gk_rows = self._parse_player_stats_table(gk_stat_table)
+            self.logger.debug(
+                "📝 Extracting goalkeeper stats for team %s...", team_id
+            )
+            with get_tracer().span("match.keeper_stats_table", team_id=team_id):
+                gk_rows = self._parse_player_stats_table(gk_stat_table)
             if len(gk_rows) > 2:
                 gk_rows = gk_rows[1:-1]
 
@@ -806,26 +865,69 @@ class FBRefMatchScraper:
                     pass
                 except Exception as e:
                     pass
-            self.logger.info(f"✅ Goalkeeper stats for team {team_id} extracted.")
-        self.logger.info(f"✅ All player stats for team {team_id} grouped.")
+            self.logger.debug("✅ Goalkeeper stats for team %s extracted.", team_id)
+        self.logger.debug("✅ All player stats for team %s grouped.", team_id)
         return list(grouped_stats.values())
 
-    def scrape(self):
-        """Launches a Playwright browser and scrapes the data."""
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                channel="chrome",
-                headless=False,
-                no_viewport=True,
-            )
-            page = browser.new_page()
+    def scrape(self, pool: BrowserPool | None = None):
+        """Scrapes the data through the shared fetch strategy.
 
-            try:
-                html = self.fetch_page_html(page)
+        The page is served from the HTML cache or plain HTTP when possible;
+        a page is only borrowed from the browser pool for a challenge.
+
+        Args:
+            pool: The browser pool to borrow from. Defaults to the shared pool.
+        """
+        pool = pool or get_browser_pool()
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.match_data["league_name"]
+        ):
+            html = get_fetch_strategy().fetch(
+                self.base_url, lambda: pool.run(self.fetch_page_html)
+            )
+            with telemetry.phase("parse"):
                 self.parse_match_page(html)
-            finally:
-                browser.close()
+
+    async def scrape_async(self, engine: AsyncFetchEngine):
+        """Fetches the page through the async fetch engine and parses it.
+
+        Args:
+            engine: The engine shared by all concurrently running scrapers.
+        """
+        telemetry = get_telemetry()
+        with telemetry.track(
+            self.base_url, self.kind, self.match_data["league_name"]
+        ):
+            html = await engine.fetch(self.base_url)
+            # Parsing a match page is slow; keep it off the event loop so
+            # other matches keep loading meanwhile.
+            await asyncio.to_thread(
+                telemetry.timed("parse", self.parse_match_page), html
+            )
+
+    def enqueue(self, frontier: CrawlFrontier, priority: int = 0) -> bool:
+        """Adds the match page to a crawl frontier.
+
+        Args:
+            frontier: The frontier to add the page to.
+            priority: Higher priorities are claimed first.
+
+        Returns:
+            True if the page was not already in the frontier.
+        """
+        return frontier.enqueue(
+            self.base_url,
+            self.kind,
+            league=self.match_data["league_name"],
+            priority=priority,
+            params=dict(self.match_data),
+        )
+
+    @classmethod
+    def from_frontier(cls, entry: FrontierEntry) -> "FBRefMatchScraper":
+        """Rebuilds the scraper for a page claimed from a crawl frontier."""
+        return cls(MatchData(**entry["params"]))
 
     def save_to_json(self):
         """Saves the scraped data to a JSON file."""
@@ -836,13 +938,14 @@ class FBRefMatchScraper:
         output_dir = os.path.join("scraped_data", "matches")
         os.makedirs(output_dir, exist_ok=True)
         file_path = os.path.join(output_dir, f"{self.match_name}.json")
-        with open(file_path, "w") as f:
-            json.dump(self.dataset, f, indent=2)
-        self.logger.info(f"💾 Saved data to {file_path}")
+        with get_tracer().span("save", path=file_path, format="json"):
+            with open(file_path, "w") as f:
+                json.dump(self.dataset, f, indent=2)
+        self.logger.info("💾 Saved data to %s", file_path)
 
 
 if __name__ == "__main__":
-    import time
+    import argparse
 
     # Configure root logger
     logging.basicConfig(
@@ -851,12 +954,7 @@ if __name__ == "__main__":
         handlers=[logging.StreamHandler()],
     )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    @retry_scrape(before_sleep=lambda _: get_browser_pool().recycle())
     def run_scraper_with_retries(scraper: FBRefMatchScraper):
         """Runs a scraper with a retry mechanism."""
         scraper.scrape()
@@ -864,6 +962,15 @@ if __name__ == "__main__":
 
     def main():
         """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+
         scraper_instances = [FBRefMatchScraper(scrape) for scrape in scrapes]
 
         for scraper in scraper_instances:
@@ -871,8 +978,15 @@ if __name__ == "__main__":
                 run_scraper_with_retries(scraper)
             except Exception as e:
                 logging.error(
-                    f"Failed to scrape {scraper.base_url} after multiple retries: {e}"
+                    "Failed to scrape %s after multiple retries: %s",
+                    scraper.base_url,
+                    e,
                 )
-            time.sleep(5)
+
+        logging.info("🧰 Browser pool stats: %s", get_browser_pool().stats())
+        logging.info("📊 Fetch path stats: %s", get_fetch_strategy().stats())
+        logging.info("🛡️ Challenge stats: %s", get_challenge_handler().stats())
+        logging.info("🔁 Retry stats: %s", get_retry_policy().stats())
+        logging.info("⏱️ Fetch telemetry report: %s", get_telemetry().write_report())
 
     main()
@@ -2,34 +2,47 @@
 This script scrapes football player data from FBRef using Playwright.
 
 It defines a list of leagues and seasons to scrape, then iterates through them,
-launching a Playwright browser to fetch the HTML content of each league's
-player stats pages for various categories (standard, shooting, passing, etc.).
-
-The script is designed to be resilient, with a multi-level retry mechanism to
-handle network errors and other intermittent issues. It also includes a delay
-between requests to avoid overwhelming the website's servers.
+fetching the HTML content of each league's player stats pages for various
+categories (standard, shooting, passing, etc.). The categories of a season are
+fetched concurrently, in tabs of one browser context when a browser is needed,
+and each page is parsed in a worker thread as soon as it arrives.
+
+The script is designed to be resilient: errors are classified by
+``scraper.retry_policy``, and the categories that failed are checkpointed so a
+retry or a ``--resume`` run only redoes those. A category whose page was
+fetched but could not be parsed is re-parsed from the HTML cache instead of
+being fetched again. Requests are throttled by a per-host token bucket (see
+``scraper.rate_limit``) to avoid overwhelming the website's servers.
 """
 
+import asyncio
+import json
 import os
 import uuid
-import time
-from typing import TypedDict
+from typing import Iterator, TypedDict
 import pandas as pd
-from bs4 import BeautifulSoup
-from patchright.sync_api import (
-    sync_playwright,
-    Page,
-    TimeoutError as PlaywrightTimeoutError,
-)
 
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
+from scraper.browser_pool import get_browser_pool
+from scraper.cloudflare import get_challenge_handler
+from scraper.csv_stream import write_csv
+from scraper.extraction_plan import StatRule, get_plan_registry, text_rule
+from scraper.fetch_engine import (
+    AsyncFetchEngine,
+    get_fetch_engine,
+    scrape_concurrently,
 )
-
-user_data_dir = "./playwright_user_data"
+from scraper.fetch_strategy import get_fetch_strategy
+from scraper.frontier import CrawlFrontier, FrontierEntry
+from scraper.html_cache import get_html_cache
+from scraper.retry_policy import (
+    CategoryFetchError,
+    ErrorKind,
+    get_retry_policy,
+    retry_scrape,
+)
+from scraper.table_extract import extract_table
+from scraper.telemetry import get_telemetry
+from scraper.tracing import get_tracer
 
 
 class LeagueData(TypedDict):
@@ -55,15 +68,86 @@ scrapes: LeagueList = [
 ]
 
 
+def _player_values(cell) -> dict:
+    a_tag = cell.find("a")
+    if not a_tag:
+        return {}
+    return {
+        "player_link": a_tag.get("href"),
+        "player_id": a_tag.get("href").split("/")[-2],
+        "player_name": a_tag.get_text(strip=True),
+    }
+
+
+def _team_values(cell) -> dict:
+    a_tag = cell.find("a")
+    if not a_tag:
+        return {}
+    return {
+        "team_id": a_tag.get("href").split("/")[-2],
+        "team_name": a_tag.get_text(strip=True),
+        "team_link": a_tag.get("href"),
+    }
+
+
+def _nationality_values(cell) -> dict:
+    span_tag = cell.find("span")
+    if not span_tag:
+        return {}
+    nationality = span_tag.get_text(strip=True)
+    return {
+        "nationality": (
+            nationality.split(" ")[-1] if " " in nationality else nationality
+        )
+    }
+
+
+def _matches_values(cell) -> dict:
+    a_tag = cell.find("a")
+    return {"matches_link": a_tag.get("href")} if a_tag else {}
+
+
+_PLAYER_RULES = {
+    "player": StatRule(
+        columns=("player_link", "player_id", "player_name"),
+        convert=_player_values,
+        numeric=False,
+    ),
+    "team": StatRule(
+        columns=("team_id", "team_name", "team_link"),
+        convert=_team_values,
+        numeric=False,
+    ),
+    "nationality": StatRule(
+        columns=("nationality",), convert=_nationality_values, numeric=False
+    ),
+    "matches": StatRule(
+        columns=("matches_link",), convert=_matches_values, numeric=False
+    ),
+}
+
+
+def _player_rule(stat: str) -> StatRule | None:
+    """Returns the extraction rule of a stat of a player stats table."""
+    if stat == "ranker":
+        return None
+    return _PLAYER_RULES.get(stat) or text_rule(stat)
+
+
 class FBRefPlayerScraper:
     """A class to scrape football player data from FBRef."""
 
+    kind = "players"
+
     def __init__(self, league_name: str, fbref_id: int, season_year: str):
         """Initializes the FBRefPlayerScraper."""
         self.league_name = league_name
         self.fbref_id = fbref_id
         self.season_year = season_year
         self.dataset: dict[str, pd.DataFrame] = {}
+        self.failed_categories: dict[str, str] = {}
+        self.failure_kinds: dict[str, ErrorKind] = {}
+        self.completed_categories: set[str] = set()
         self.urls = {
             "standard": f"https://fbref.com/en/comps/{self.fbref_id}/{self.season_year}/stats/{self.season_year}-{self.league_name}-Stats",
             "keeper": f"https://fbref.com/en/comps/{self.fbref_id}/{self.season_year}/keepers/{self.season_year}-{self.league_name}-Stats",
@@ -78,175 +162,317 @@ class FBRefPlayerScraper:
             "misc": f"https://fbref.com/en/comps/{self.fbref_id}/{self.season_year}/misc/{self.season_year}-{self.league_name}-Stats",
         }
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
-    def _fetch_page_html(self, page: Page, url: str) -> str:
-        """Fetches the HTML content of a given URL."""
-        print(f"🔁 Navigating to {url}")
-        _ = page.goto(url, timeout=60_000, wait_until="domcontentloaded")
-
-        try:
-            _ = page.wait_for_selector("table", timeout=10_000)
-            print("✅ Page loaded and table found.")
-
-            return page.content()
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page. Checking Cloudflare")
-
-        try:
-            print("Checking Cloudflare status.")
-            page.wait_for_timeout(1000)
-            iframe_locator = page.frame_locator("iframe[id*='cf-chl-widget-']")
-
-            if iframe_locator.locator('body').count() != 0:
-                print("Cloudflare iframe Found!")
-                checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox.all() == []:
-                    page.wait_for_timeout(20_000)
-                    checkbox = iframe_locator.locator("input[type='checkbox']")
-                if checkbox is not None:
-                    if checkbox.all() != []:
-                        checkbox = iframe_locator.locator("input[type='checkbox']")
-                        print("Clicking the checkbox.")
-                        checkbox.first.click(force=True, timeout=60_000)
-                        print("Cloudflare checkbox cliked,")
-                        print("Cloudflare Bypass successfully.")
-                    else:
-                        raise PlaywrightTimeoutError("Checkbox not found")
-            else:
-                print("Iframe Doesn't Exist, Extracting the tables.")
-        except PlaywrightTimeoutError:
-            print("Checkbox not found.")
-
-        try:
-            _ = page.wait_for_selector("table", timeout=15_000)
-            print("✅ Page loaded and table found.")
-        except PlaywrightTimeoutError:
-            print("❌ No table found on the page.")
-            raise
-
-        return page.content()
-
-    def _extract_player_data(self, table_rows) -> pd.DataFrame:
-        """Extracts player data from a list of table row elements."""
-        lst = []
-        for player in table_rows:
-            tmp = {}
-            for tag in player:
-                data_stat = tag.get("data-stat")
-
-                if data_stat == "player":
-                    a_tag = tag.find("a")
-                    if a_tag:
-                        tmp["player_link"] = a_tag.get("href")
-                        tmp["player_id"] = a_tag.get("href").split("/")[-2]
-                        tmp["player_name"] = a_tag.get_text(strip=True)
-                elif data_stat == "team":
-                    a_tag = tag.find("a")
-                    if a_tag:
-                        tmp["team_id"] = a_tag.get("href").split("/")[-2]
-                        tmp["team_name"] = a_tag.get_text(strip=True)
-                        tmp["team_link"] = a_tag.get("href")
-                elif data_stat == "nationality":
-                    span_tag = tag.find("span")
-                    if span_tag:
-                        nationality = span_tag.get_text(strip=True)
-                        tmp["nationality"] = (
-                            nationality.split(" ")[-1]
-                            if " " in nationality
-                            else nationality
-                        )
-                elif data_stat == "matches":
-                    a_tag = tag.find("a")
-                    if a_tag:
-                        tmp["matches_link"] = a_tag.get("href")
-                else:
-                    value = tag.get_text(strip=True)
-                    if data_stat:
-                        tmp[data_stat] = value
-
-            if "ranker" in tmp:
-                del tmp["ranker"]
-
-            if tmp:  # Only append if data was extracted
-                lst.append(tmp)
-
-        return pd.DataFrame(lst)
-
-    def _parse_commented_table(self, html: str, category: str):
-        """Parses a table that is commented out in the HTML."""
-        print(f"📦 Parsing commented table for category: {category}")
-        soup = BeautifulSoup(html, "html.parser")
-        player_stats_table = soup.find("table", attrs={"id": f"stats_{category}"})
-        # player_stats_table = table_soup.select_one("table")
+    def _extract_player_data(self, table, category: str) -> pd.DataFrame:
+        """Extracts player data from a stats table.
+
+        The table is extracted with the cached plan of its header, which is
+        the same for every season of a category, so the handling of each
+        stat is worked out once and not once per cell.
+        """
+        return get_plan_registry().extract(
+            table, f"player_stats_{category}", "players", _player_rule
+        )
+
+    def iter_rows(
+        self, html: str, category: str, batch_size: int = 500
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the rows of a category's table in batches.
+
+        The streaming variant of ``_parse_commented_table``: the rows are
+        extracted as the batches are consumed. Each batch has every column
+        of the table's plan, even the ones none of its players has a value
+        for, so the batches line up in one file.
+
+        Args:
+            html: The HTML of the category's page, raw or rendered.
+            category: The category of the page.
+            batch_size: The number of rows of a batch.
+
+        Yields:
+            DataFrames of up to ``batch_size`` players.
+        """
+        player_stats_table = extract_table(html, f"stats_{category}")
         if not player_stats_table:
             print(f"No table found for {category}")
             return
+        for batch in get_plan_registry().iter_batches(
+            player_stats_table,
+            f"player_stats_{category}",
+            "players",
+            _player_rule,
+            batch_size,
+        ):
+            batch["competition_id"] = self.fbref_id
+            batch["season_id"] = self.season_year
+            batch["id"] = [str(uuid.uuid4()) for _ in range(len(batch))]
+            yield batch
+
+    def stream_to_csv(self, html: str, category: str) -> int:
+        """Parses a category's table straight into its CSV file.
+
+        The file is the one ``save_to_csv`` writes, but the table is never
+        held whole, see ``iter_rows``; it is not kept in ``dataset`` either.
+
+        Args:
+            html: The HTML of the category's page, raw or rendered.
+            category: The category of the page.
+
+        Returns:
+            The number of players written.
+        """
+        file_path = self.csv_path(f"player_stats_{category}")
+        with get_tracer().span(
+            "save", path=file_path, format="csv", streamed=True
+        ) as span:
+            rows = write_csv(file_path, self.iter_rows(html, category))
+            if span is not None:
+                span.set_attributes(rows=rows)
+        if rows:
+            print(f"💾 Streamed {rows} players to {file_path}")
+        return rows
 
-        player_table_data = player_stats_table.select("tbody tr:has(td)")
-        df = self._extract_player_data(player_table_data)
+    def _parse_commented_table(self, html: str, category: str):
+        """Parses a table that is commented out in the HTML.
+
+        Only the ``stats_{category}`` table is parsed, cut out of the page
+        whether the browser rendered it or it is still in its comment.
+        """
+        print(f"📦 Parsing commented table for category: {category}")
+        with get_tracer().span("players.parse_table", category=category) as span:
+            player_stats_table = extract_table(html, f"stats_{category}")
+            # player_stats_table = table_soup.select_one("table")
+            if not player_stats_table:
+                print(f"No table found for {category}")
+                return
+
+            df = self._extract_player_data(player_stats_table, category)
+            if span is not None:
+                span.set_attributes(rows=len(df))
         if not df.empty:
             df["competition_id"] = self.fbref_id
             df["season_id"] = self.season_year
             df["id"] = [str(uuid.uuid4()) for _ in range(len(df))]
             self.dataset[f"player_stats_{category}"] = df
             print(f"data: player_stats_{category}")
-            print(df.head())
-
-    def scrape(self):
-        """Launches Playwright and scrapes player data for all categories."""
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                channel="chrome",
-                headless=True,
-                no_viewport=True,
-            )
-            page = browser.new_page()
 
-            try:
-                for category, url in self.urls.items():
-                    try:
-                        html = self._fetch_page_html(page, url)
-                        self._parse_commented_table(html, category)
-                        time.sleep(5)  # Delay between requests
-                    except Exception as e:
-                        print(f"❌ Failed to scrape {category} from {url}: {e}")
-            finally:
-                browser.close()
+    async def _scrape_category(self, engine: AsyncFetchEngine, category: str, url: str):
+        """Fetches one category and parses it in a worker thread.
+
+        A category that failed to parse last time is re-parsed from the HTML
+        that was already fetched, if the cache still has it.
+        """
+        telemetry = get_telemetry()
+        html = None
+        if self.failure_kinds.get(category) == "parse":
+            html = get_html_cache().get(url)
+        try:
+            with telemetry.track(url, self.kind, self.league_name, self.season_year):
+                if html is None:
+                    html = await engine.fetch(url)
+                else:
+                    telemetry.note(source="cache", content_bytes=len(html.encode()))
+                await asyncio.to_thread(
+                    telemetry.timed("parse", self._parse_commented_table),
+                    html,
+                    category,
+                )
+        except Exception as e:
+            print(f"❌ Failed to scrape {category} from {url}: {e}")
+            self.failed_categories[category] = str(e)
+            self.failure_kinds[category] = get_retry_policy().record(e)
+        else:
+            self.failed_categories.pop(category, None)
+            self.failure_kinds.pop(category, None)
+            self.completed_categories.add(category)
+
+    @property
+    def pending_categories(self) -> list[str]:
+        """The categories that have not been scraped successfully yet."""
+        return [c for c in self.urls if c not in self.completed_categories]
+
+    @property
+    def retryable_categories(self) -> list[str]:
+        """The failed categories whose error is worth fetching again for."""
+        return [
+            category
+            for category, kind in self.failure_kinds.items()
+            if kind in ("fetch", "browser")
+        ]
+
+    async def scrape_async(self, engine: AsyncFetchEngine):
+        """Fetches the pending categories concurrently through the fetch engine.
+
+        Every fetch takes its token from the shared rate limiter, and a page
+        is parsed off the event loop as soon as it arrives, so the season
+        finishes about when its slowest category does. Categories completed
+        by an earlier call are skipped, so calling this again only retries
+        the ones that failed.
+
+        Args:
+            engine: The engine shared by all concurrently running scrapers.
+        """
+        await asyncio.gather(
+            *(
+                self._scrape_category(engine, category, self.urls[category])
+                for category in self.pending_categories
+            )
+        )
+
+    def scrape(self, engine: AsyncFetchEngine | None = None):
+        """Scrapes all categories concurrently on the fetch engine.
+
+        Pages are served from the HTML cache or plain HTTP when possible;
+        a tab is only opened for a challenge. Errors of single categories
+        are kept in ``failed_categories``; anything else is raised.
+
+        Args:
+            engine: The engine to fetch with. Defaults to the shared engine.
+        """
+        (error,) = scrape_concurrently([self], engine)
+        if error is not None:
+            raise error
+
+    def enqueue(self, frontier: CrawlFrontier, priority: int = 10) -> int:
+        """Adds every category page to a crawl frontier.
+
+        Each category is its own entry, so a crash only repeats the
+        categories that were not scraped yet.
+
+        Args:
+            frontier: The frontier to add the pages to.
+            priority: Higher priorities are claimed first.
+
+        Returns:
+            The number of pages that were not already in the frontier.
+        """
+        added = 0
+        for category, url in self.urls.items():
+            added += frontier.enqueue(
+                url,
+                self.kind,
+                league=self.league_name,
+                season=self.season_year,
+                priority=priority,
+                params={
+                    "league_name": self.league_name,
+                    "fbref_id": self.fbref_id,
+                    "season_year": self.season_year,
+                    "category": category,
+                },
+            )
+        return added
+
+    @classmethod
+    def from_frontier(cls, entry: FrontierEntry) -> "FBRefPlayerScraper":
+        """Rebuilds the scraper for the category page claimed from a frontier."""
+        params = dict(entry["params"])
+        category = params.pop("category")
+        scraper = cls(**params)
+        scraper.urls = {category: scraper.urls[category]}
+        return scraper
+
+    def csv_path(self, name: str) -> str:
+        """The CSV file of the ``name`` table of the season."""
+        return os.path.join(
+            "scraped_data",
+            self.league_name,
+            "player_data",
+            f"{name}-{self.league_name}-{self.season_year}.csv",
+        )
 
     def save_to_csv(self):
-        """Saves the scraped data to CSV files."""
-        base_dir = os.path.join("scraped_data", self.league_name, "player_data")
-        os.makedirs(base_dir, exist_ok=True)
+        """Saves the scraped data to CSV files.
 
+        The tables are written from ``dataset``, which the scrape fills and
+        its callers read. ``stream_to_csv`` parses a page straight into its
+        file without keeping the table.
+        """
         for name, df in self.dataset.items():
-            file_path = os.path.join(
-                base_dir, f"{name}-{self.league_name}-{self.season_year}.csv"
-            )
-            df.to_csv(file_path, index=False)
+            file_path = self.csv_path(name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with get_tracer().span(
+                "save",
+                path=file_path,
+                format="csv",
+                rows=len(df),
+            ):
+                df.to_csv(file_path, index=False)
             print(f"💾 Saved data to {file_path}")
 
+    @property
+    def checkpoint_path(self) -> str:
+        """The JSON file recording which categories of the season are done."""
+        return os.path.join(
+            "scraped_data",
+            self.league_name,
+            "player_data",
+            f"checkpoint-{self.league_name}-{self.season_year}.json",
+        )
+
+    def save_checkpoint(self):
+        """Records the completed and failed categories of the season."""
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        with open(self.checkpoint_path, "w") as f:
+            json.dump(
+                {
+                    "completed": sorted(self.completed_categories),
+                    "failed": {
+                        category: {
+                            "kind": self.failure_kinds.get(category, "parse"),
+                            "error": error,
+                        }
+                        for category, error in self.failed_categories.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+
+    def load_checkpoint(self) -> bool:
+        """Restores the categories recorded by ``save_checkpoint``.
+
+        Returns:
+            True if a checkpoint was found.
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        self.completed_categories = set(checkpoint["completed"]) & set(self.urls)
+        for category, failure in checkpoint["failed"].items():
+            self.failed_categories[category] = failure["error"]
+            self.failure_kinds[category] = failure["kind"]
+        return True
+
 
 if __name__ == "__main__":
+    import argparse
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((PlaywrightTimeoutError, Exception)),
-        reraise=True,
-    )
+    @retry_scrape(before_sleep=lambda _: get_fetch_engine().recycle())
     def run_scraper_with_retries(scraper: FBRefPlayerScraper):
-        """Runs a scraper with a retry mechanism."""
+        """Runs a scraper, retrying only the categories that failed to fetch."""
         scraper.scrape()
         scraper.save_to_csv()
+        scraper.save_checkpoint()
+        if scraper.retryable_categories:
+            raise CategoryFetchError(scraper.retryable_categories)
 
     def main():
         """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the categories a previous run's checkpoint marks as done.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+
         scraper_instances = [
             FBRefPlayerScraper(
                 league_name=scrape["league_name"],
@@ -258,6 +484,11 @@ if __name__ == "__main__":
         ]
 
         for scraper in scraper_instances:
+            if args.resume and scraper.load_checkpoint():
+                print(
+                    f"⏩ Resuming {scraper.league_name} {scraper.season_year}: "
+                    f"{len(scraper.pending_categories)} categories left"
+                )
             try:
                 print(
                     f"--- Starting scraper for {scraper.league_name} {scraper.season_year} ---"
@@ -270,6 +501,11 @@ if __name__ == "__main__":
                 print(
                     f"❌ Failed to scrape {scraper.league_name} {scraper.season_year} after multiple retries: {e}"
                 )
-            time.sleep(10)
+
+        print(f"🧰 Browser pool stats: {get_browser_pool().stats()}")
+        print(f"📊 Fetch path stats: {get_fetch_strategy().stats()}")
+        print(f"🛡️ Challenge stats: {get_challenge_handler().stats()}")
+        print(f"🔁 Retry stats: {get_retry_policy().stats()}")
+        print(f"⏱️ Fetch telemetry report: {get_telemetry().write_report()}")
 
     main()
@@ -0,0 +1,296 @@
+"""An asyncio fetch engine that loads several FBRef pages at once.
+
+The sync scrapers load one page at a time and spend most of a run waiting on
+the network. ``AsyncFetchEngine`` keeps a single persistent browser context
+open with patchright's async API and lets up to ``concurrency`` tabs load in
+parallel. Every navigation first takes a token from the shared per-host rate
+limiter, so concurrency only fills the gaps the limiter allows and never
+pushes FBRef past its limit. A 429 pauses the host for its ``Retry-After``.
+
+Like the browser pool, one engine is shared by the whole process and returned
+by ``get_fetch_engine``. Playwright's async objects are bound to the event
+loop that created them, so the engine runs every coroutine on a loop of its
+own with ``run`` instead of ``asyncio.run``, and its browser stays up from
+one scrape to the next.
+
+The engine uses the same Chrome profile as the sync ``BrowserPool``; do not
+run both at the same time in one process.
+"""
+
+import asyncio
+import atexit
+import time
+from typing import Any, Coroutine, Protocol, Sequence, TypedDict, TypeVar
+
+from patchright.async_api import (
+    async_playwright,
+    BrowserContext,
+    Playwright,
+)
+
+from scraper.browser_pool import free_profile_dir, release_profile_dir, user_data_dir
+from scraper.clearance import get_clearance_store
+from scraper.cloudflare import get_challenge_handler
+from scraper.fetch_strategy import FetchStrategy, get_fetch_strategy
+from scraper.rate_limit import HostRateLimiter, get_rate_limiter
+from scraper.resource_blocking import ResourceBlocker
+from scraper.retry_policy import retry_fetch
+from scraper.telemetry import get_telemetry
+
+T = TypeVar("T")
+
+
+class FetchResult(TypedDict):
+    """The outcome of fetching a single URL."""
+
+    url: str
+    html: str | None
+    error: str | None
+    elapsed: float
+
+
+class AsyncScraper(Protocol):
+    """Any scraper exposing a ``scrape_async`` coroutine."""
+
+    async def scrape_async(self, engine: "AsyncFetchEngine"): ...
+
+
+class AsyncFetchEngine:
+    """Fetches pages concurrently in tabs of one persistent browser context.
+
+    Attributes:
+        concurrency: The maximum number of tabs loading at the same time.
+        rate_limiter: The per-host rate limiter every navigation goes through.
+        strategy: Tries the HTML cache and plain HTTP before opening a tab.
+        blocker: Aborts the requests a table scrape does not need.
+        headless: Whether Chrome runs headless.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 3,
+        rate_limiter: HostRateLimiter | None = None,
+        strategy: FetchStrategy | None = None,
+        blocker: ResourceBlocker | None = None,
+        headless: bool = False,
+    ):
+        """Initializes the AsyncFetchEngine.
+
+        Args:
+            concurrency: The maximum number of tabs loading at the same time.
+            rate_limiter: The rate limiter to use. Defaults to the shared one.
+            strategy: The fetch strategy to use. Defaults to the shared one.
+            blocker: The request blocker. Defaults to the standard block list.
+            headless: Whether Chrome runs headless.
+        """
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.strategy = strategy or get_fetch_strategy()
+        self.blocker = blocker or ResourceBlocker()
+        self.headless = headless
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._start_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._playwright: Playwright | None = None
+        self._context: BrowserContext | None = None
+        self._profile_dir = user_data_dir
+
+    async def __aenter__(self) -> "AsyncFetchEngine":
+        # The browser is launched by the first fetch that misses the cache.
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Launches the browser context."""
+        async with self._start_lock:
+            if self._context is not None:
+                return
+            # A recycle only closes the context, the driver is kept running.
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            clearance = get_clearance_store()
+            user_agent = clearance.user_agent()
+            self._profile_dir = free_profile_dir(user_data_dir)
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=self._profile_dir,
+                channel="chrome",
+                headless=self.headless,
+                no_viewport=True,
+                **({"user_agent": user_agent} if user_agent else {}),
+            )
+            await self.blocker.install_async(self._context)
+            await clearance.inject_async(self._context)
+
+    async def close(self):
+        """Closes the browser context and stops Playwright.
+
+        The HTTP clients belong to the fetch strategy and are left open.
+        """
+        await self._close_context()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _close_context(self):
+        """Closes the browser context, ignoring an already dead browser."""
+        context, self._context = self._context, None
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+            release_profile_dir(self._profile_dir)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Runs a coroutine on the engine's event loop and returns its result.
+
+        Args:
+            coro: The coroutine, typically one using this engine.
+
+        Returns:
+            Whatever the coroutine returned.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def recycle(self):
+        """Closes the browser context so the next fetch launches a new one.
+
+        Call it between runs, e.g. before a retry, not while one is running.
+        """
+        if self._context is None or self._loop is None:
+            return
+        print("♻️ Recycling the fetch engine's browser context.")
+        self._loop.run_until_complete(self._close_context())
+
+    def shutdown(self):
+        """Closes the engine and its event loop."""
+        if self._loop is None:
+            return
+        self._loop.run_until_complete(self.close())
+        self._loop.close()
+        self._loop = None
+
+    async def fetch(self, url: str) -> str:
+        """Returns the HTML of a URL from the cache, plain HTTP or a new tab.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The HTML content of the page.
+        """
+        return await self.strategy.fetch_async(url, lambda: self._fetch_live(url))
+
+    @retry_fetch()
+    async def _fetch_live(self, url: str) -> str:
+        """Fetches the HTML content of a URL in its own tab."""
+        await self.start()
+        assert self._context is not None
+
+        async with self._semaphore:
+            await self.rate_limiter.acquire_async(url)
+            page = await self._context.new_page()
+            await self.blocker.track_async(page)
+            telemetry = get_telemetry()
+            try:
+                print(f"🔁 Navigating to {url}")
+                with telemetry.phase("goto"):
+                    response = await page.goto(
+                        url, timeout=60_000, wait_until="domcontentloaded"
+                    )
+                if response is not None:
+                    self.rate_limiter.check_response(
+                        url, response.status, response.headers.get("retry-after")
+                    )
+                await get_challenge_handler().wait_for_tables_async(page)
+                with telemetry.phase("content"):
+                    return await page.content()
+            finally:
+                self.blocker.finish(page, url)
+                await page.close()
+
+    async def fetch_many(self, urls: Sequence[str]) -> list[FetchResult]:
+        """Fetches several URLs concurrently.
+
+        A failing URL does not cancel the others; its error is reported in
+        the result instead.
+
+        Args:
+            urls: The URLs to fetch.
+
+        Returns:
+            One result per URL, in the order of ``urls``.
+        """
+
+        async def _fetch_one(url: str) -> FetchResult:
+            started = time.perf_counter()
+            try:
+                html = await self.fetch(url)
+                return FetchResult(
+                    url=url,
+                    html=html,
+                    error=None,
+                    elapsed=time.perf_counter() - started,
+                )
+            except Exception as e:
+                print(f"❌ Failed to fetch {url}: {e}")
+                return FetchResult(
+                    url=url,
+                    html=None,
+                    error=str(e),
+                    elapsed=time.perf_counter() - started,
+                )
+
+        return list(await asyncio.gather(*(_fetch_one(url) for url in urls)))
+
+
+_default_engine: AsyncFetchEngine | None = None
+
+
+def get_fetch_engine() -> AsyncFetchEngine:
+    """Returns the process wide fetch engine shared by all scrapers."""
+    if _default_engine is None:
+        set_fetch_engine(AsyncFetchEngine())
+    assert _default_engine is not None
+    return _default_engine
+
+
+def set_fetch_engine(engine: AsyncFetchEngine):
+    """Replaces the process wide fetch engine, shutting down the previous one.
+
+    The scripts call it once at start up to apply ``--concurrency`` and
+    ``--headless``.
+    """
+    global _default_engine
+    if _default_engine is not None:
+        _default_engine.shutdown()
+    _default_engine = engine
+    atexit.register(engine.shutdown)
+
+
+def scrape_concurrently(
+    scrapers: Sequence[AsyncScraper], engine: AsyncFetchEngine | None = None
+) -> list[BaseException | None]:
+    """Runs ``scrape_async`` of several scrapers on one shared engine.
+
+    Args:
+        scrapers: The scrapers to run.
+        engine: The engine to run them on. Defaults to the shared one.
+
+    Returns:
+        One entry per scraper: ``None`` on success, otherwise the exception.
+    """
+    engine = engine or get_fetch_engine()
+
+    async def _run() -> list[BaseException | None]:
+        results = await asyncio.gather(
+            *(scraper.scrape_async(engine) for scraper in scrapers),
+            return_exceptions=True,
+        )
+        return [r if isinstance(r, BaseException) else None for r in results]
+
+    return engine.run(_run())
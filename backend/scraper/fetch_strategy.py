@@ -0,0 +1,229 @@
+"""Decides how each FBRef page is fetched: cache, plain HTTP or browser.
+
+Every scraper hands its URL and its Playwright fetch to ``FetchStrategy``,
+which tries the cheapest source first:
+
+1. a fresh snapshot from the HTML cache,
+2. a plain HTTP/2 request, unless Cloudflare answers with a challenge or
+   the server fails; a client error such as a 404 is raised as it is,
+3. the scraper's own Playwright path, borrowed from the browser pool.
+
+Whatever source served the page, live fetches are stored in the cache, and
+the strategy counts how often each path was used so a run can report it. The
+source and size of each page are also noted on its telemetry record.
+Live fetches go through the retry policy's per-host circuit breaker, so a
+host that keeps failing is left alone for a while.
+"""
+
+import atexit
+from typing import Awaitable, Callable, TypedDict
+
+import httpx
+
+from scraper.html_cache import HtmlCache, get_html_cache
+from scraper.http_fetch import CHALLENGE_STATUSES, HttpFetcher
+from scraper.rate_limit import RateLimitedError
+from scraper.retry_policy import CircuitBreaker, classify, get_retry_policy
+from scraper.telemetry import get_telemetry
+from scraper.tracing import get_tracer, traced
+
+
+def _is_client_error(error: httpx.HTTPError) -> bool:
+    """Whether the server refused the request itself, e.g. with a 404.
+
+    The browser would get the same answer, so such errors are raised instead
+    of falling back to it. Server and transport errors still fall back, and
+    so does a 403 Cloudflare may have answered without its challenge markup.
+    """
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status not in CHALLENGE_STATUSES
+
+
+class FetchStats(TypedDict):
+    """How many pages each fetch path served."""
+
+    cache: int
+    http: int
+    browser: int
+    http_challenged: int
+    http_errors: int
+
+
+class FetchStrategy:
+    """Fetches a page from the cache, over HTTP or with the browser.
+
+    Attributes:
+        cache: The HTML cache consulted first and filled by live fetches.
+        http: The plain HTTP fetcher, or None to always use the browser.
+        breaker: Fails live fetches fast for hosts that keep failing.
+    """
+
+    def __init__(
+        self,
+        cache: HtmlCache | None = None,
+        http: HttpFetcher | None = None,
+        use_http: bool = True,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """Initializes the FetchStrategy.
+
+        Args:
+            cache: The HTML cache to use. Defaults to the shared one.
+            http: The HTTP fetcher to use. Defaults to a new pooled client.
+            use_http: Whether to try plain HTTP before the browser.
+            breaker: The circuit breaker. Defaults to the retry policy's.
+        """
+        self.cache = cache or get_html_cache()
+        self.http = (http or HttpFetcher()) if use_http else None
+        self.breaker = breaker or get_retry_policy().breaker
+        self._stats: FetchStats = {
+            "cache": 0,
+            "http": 0,
+            "browser": 0,
+            "http_challenged": 0,
+            "http_errors": 0,
+        }
+
+    def _try_http(self, url: str) -> str | None:
+        """Tries the HTTP path, returning None if the browser is needed."""
+        if self.http is None:
+            return None
+        try:
+            html = self.http.fetch(url)
+        except RateLimitedError:
+            raise
+        except httpx.HTTPError as e:
+            if _is_client_error(e):
+                raise
+            print(f"⚠️ HTTP fetch failed for {url}: {e}")
+            self._stats["http_errors"] += 1
+            return None
+        if html is None:
+            self._stats["http_challenged"] += 1
+        return html
+
+    async def _try_http_async(self, url: str) -> str | None:
+        """Tries the HTTP path without blocking, None if the browser is needed."""
+        if self.http is None:
+            return None
+        try:
+            html = await self.http.fetch_async(url)
+        except RateLimitedError:
+            raise
+        except httpx.HTTPError as e:
+            if _is_client_error(e):
+                raise
+            print(f"⚠️ HTTP fetch failed for {url}: {e}")
+            self._stats["http_errors"] += 1
+            return None
+        if html is None:
+            self._stats["http_challenged"] += 1
+        return html
+
+    def _note(self, source: str, html: str):
+        """Notes the source and size of the page on its telemetry record."""
+        content_bytes = len(html.encode())
+        get_telemetry().note(source=source, content_bytes=content_bytes)
+        get_tracer().annotate(source=source, content_bytes=content_bytes)
+
+    def _record_failure(self, url: str, error: Exception):
+        """Counts a failed live fetch against the host's circuit."""
+        if classify(error) in ("fetch", "browser"):
+            self.breaker.record_failure(url)
+
+    @traced("fetch")
+    def fetch(self, url: str, browser_fetch: Callable[[], str]) -> str:
+        """Returns the HTML of a page from the cheapest source that works.
+
+        Args:
+            url: The URL of the page.
+            browser_fetch: Fetches the page with Playwright.
+
+        Returns:
+            The page HTML.
+        """
+        get_tracer().annotate(url=url)
+        html = self.cache.lookup(url)
+        if html is not None:
+            self._stats["cache"] += 1
+            self._note("cache", html)
+            return html
+
+        self.breaker.check(url)
+        try:
+            html = self._try_http(url)
+            if html is not None:
+                self._stats["http"] += 1
+                self._note("http", html)
+            else:
+                html = browser_fetch()
+                self._stats["browser"] += 1
+                self._note("browser", html)
+        except Exception as e:
+            self._record_failure(url, e)
+            raise
+        self.breaker.record_success(url)
+
+        self.cache.put(url, html)
+        return html
+
+    @traced("fetch")
+    async def fetch_async(
+        self, url: str, browser_fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        """The asyncio counterpart of ``fetch``.
+
+        Args:
+            url: The URL of the page.
+            browser_fetch: Fetches the page with async Playwright.
+
+        Returns:
+            The page HTML.
+        """
+        get_tracer().annotate(url=url)
+        html = self.cache.lookup(url)
+        if html is not None:
+            self._stats["cache"] += 1
+            self._note("cache", html)
+            return html
+
+        self.breaker.check(url)
+        try:
+            html = await self._try_http_async(url)
+            if html is not None:
+                self._stats["http"] += 1
+                self._note("http", html)
+            else:
+                html = await browser_fetch()
+                self._stats["browser"] += 1
+                self._note("browser", html)
+        except Exception as e:
+            self._record_failure(url, e)
+            raise
+        self.breaker.record_success(url)
+
+        self.cache.put(url, html)
+        return html
+
+    def stats(self) -> FetchStats:
+        """Returns how many pages each fetch path served."""
+        return FetchStats(**self._stats)
+
+    def close(self):
+        """Closes the HTTP client."""
+        if self.http is not None:
+            self.http.close()
+
+
+_default_strategy: FetchStrategy | None = None
+
+
+def get_fetch_strategy() -> FetchStrategy:
+    """Returns the process wide fetch strategy shared by all scrapers."""
+    global _default_strategy
+    if _default_strategy is None:
+        _default_strategy = FetchStrategy()
+        atexit.register(_default_strategy.close)
+    return _default_strategy
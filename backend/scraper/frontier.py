@@ -0,0 +1,315 @@
+"""A resumable, SQLite backed crawl frontier for the FBRef scrapers.
+
+Instead of walking the hard-coded ``scrapes`` lists in order, the scrapers
+enqueue the pages they are responsible for and workers claim them back one
+at a time, highest priority first. Every URL is stored once, so enqueueing a
+season twice does not scrape it twice, and because each page's status is
+written as it changes, a crashed backfill resumes where it stopped:
+
+- ``pending`` pages are waiting to be claimed,
+- ``in_progress`` pages are leased to a worker; a lease that is not completed
+  within ``lease_seconds`` (because the worker died) is handed out again,
+- ``done`` pages are finished and skipped by later enqueues,
+- ``failed`` pages ran out of attempts and are left for inspection.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, TypedDict
+
+frontier_db = "./crawl_frontier.sqlite"
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+
+class FrontierEntry(TypedDict):
+    """A page in the crawl frontier."""
+
+    url: str
+    kind: str
+    league: str | None
+    season: str | None
+    priority: int
+    status: str
+    attempts: int
+    last_fetched: float | None
+    params: dict[str, Any]
+    error: str | None
+
+
+_COLUMNS = (
+    "url, kind, league, season, priority, status, attempts, last_fetched, "
+    "params, error"
+)
+
+
+def _entry(row: tuple) -> FrontierEntry:
+    return FrontierEntry(
+        url=row[0],
+        kind=row[1],
+        league=row[2],
+        season=row[3],
+        priority=row[4],
+        status=row[5],
+        attempts=row[6],
+        last_fetched=row[7],
+        params=json.loads(row[8]),
+        error=row[9],
+    )
+
+
+class CrawlFrontier:
+    """A deduplicated, prioritised queue of pages to scrape.
+
+    Attributes:
+        path: The SQLite database file.
+        max_attempts: Claims a page gets before it is marked failed.
+        lease_seconds: How long a claimed page may stay in progress before it
+            is considered abandoned and handed out again.
+    """
+
+    def __init__(
+        self,
+        path: str = frontier_db,
+        max_attempts: int = 3,
+        lease_seconds: float = 15 * 60,
+    ):
+        """Initializes the CrawlFrontier, creating the database if needed.
+
+        Args:
+            path: The SQLite database file.
+            max_attempts: Claims a page gets before it is marked failed.
+            lease_seconds: How long a claimed page may stay in progress.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        # Autocommit mode, so ``claim`` can take the write lock up front.
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                league TEXT,
+                season TEXT,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_fetched REAL,
+                params TEXT NOT NULL DEFAULT '{}',
+                error TEXT,
+                leased_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS ix_frontier_claim
+                ON frontier (status, priority DESC);
+            """)
+
+    def enqueue(
+        self,
+        url: str,
+        kind: str,
+        league: str | None = None,
+        season: str | None = None,
+        priority: int = 0,
+        params: dict[str, Any] | None = None,
+        force: bool = False,
+    ) -> bool:
+        """Adds a page to the frontier unless it is already there.
+
+        A page that is already pending keeps its place but is raised to
+        ``priority`` if that is higher.
+
+        Args:
+            url: The page URL, which identifies the entry.
+            kind: The scraper that handles the page, e.g. ``"league"``.
+            league: The league the page belongs to.
+            season: The season the page belongs to.
+            priority: Higher priorities are claimed first.
+            params: What the scraper needs to be rebuilt from the entry.
+            force: Re-queue the page even if it is done or failed.
+
+        Returns:
+            True if the page was added or re-queued.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO frontier "
+                "(url, kind, league, season, priority, params) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, kind, league, season, priority, json.dumps(params or {})),
+            )
+            if cursor.rowcount:
+                return True
+            if force:
+                cursor = self._db.execute(
+                    "UPDATE frontier SET status = ?, attempts = 0, error = NULL, "
+                    "priority = ? WHERE url = ? AND status IN (?, ?)",
+                    (PENDING, priority, url, DONE, FAILED),
+                )
+                if cursor.rowcount:
+                    return True
+            self._db.execute(
+                "UPDATE frontier SET priority = ? "
+                "WHERE url = ? AND status = ? AND priority < ?",
+                (priority, url, PENDING, priority),
+            )
+            return False
+
+    def claim(self, kinds: tuple[str, ...] | None = None) -> FrontierEntry | None:
+        """Leases the highest priority page that is ready to be scraped.
+
+        Pending pages are claimed in priority order, oldest first within a
+        priority; pages whose lease ran out are claimed like pending ones,
+        unless they used up their attempts, in which case they are failed.
+
+        Args:
+            kinds: Only claim pages of these kinds. Defaults to any kind.
+
+        Returns:
+            The claimed entry, or None if the frontier has nothing ready.
+        """
+        now = time.time()
+        query = (
+            f"SELECT {_COLUMNS} FROM frontier "
+            "WHERE (status = ? OR (status = ? AND leased_at < ?))"
+        )
+        expired = now - self.lease_seconds
+        args: list[Any] = [PENDING, IN_PROGRESS, expired]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            args.extend(kinds)
+        query += " ORDER BY priority DESC, rowid LIMIT 1"
+
+        with self._lock:
+            # Take the write lock before reading, so two workers never claim
+            # the same page.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # A worker that died on its last attempt must not get the
+                # page re-leased forever.
+                self._db.execute(
+                    "UPDATE frontier SET status = ?, leased_at = NULL, "
+                    "error = ? WHERE status = ? AND leased_at < ? "
+                    "AND attempts >= ?",
+                    (
+                        FAILED,
+                        "Lease expired on the last attempt",
+                        IN_PROGRESS,
+                        expired,
+                        self.max_attempts,
+                    ),
+                )
+                row = self._db.execute(query, args).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE frontier SET status = ?, attempts = attempts + 1, "
+                        "leased_at = ? WHERE url = ?",
+                        (IN_PROGRESS, now, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        entry = _entry(row)
+        entry["status"] = IN_PROGRESS
+        entry["attempts"] += 1
+        return entry
+
+    def complete(self, url: str):
+        """Marks a claimed page as scraped."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE frontier SET status = ?, last_fetched = ?, error = NULL, "
+                "leased_at = NULL WHERE url = ?",
+                (DONE, time.time(), url),
+            )
+
+    def fail(self, url: str, error: str):
+        """Returns a claimed page to the queue, or fails it for good.
+
+        Args:
+            url: The page URL.
+            error: What went wrong, kept for inspection.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE frontier SET "
+                "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, leased_at = NULL WHERE url = ?",
+                (self.max_attempts, FAILED, PENDING, error, url),
+            )
+
+    def requeue_failed(self, kinds: tuple[str, ...] | None = None) -> int:
+        """Gives every failed page a fresh set of attempts.
+
+        Args:
+            kinds: Only re-queue pages of these kinds. Defaults to any kind.
+
+        Returns:
+            The number of pages re-queued.
+        """
+        query = "UPDATE frontier SET status = ?, attempts = 0 WHERE status = ?"
+        args: list[Any] = [PENDING, FAILED]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            args.extend(kinds)
+        with self._lock:
+            return self._db.execute(query, args).rowcount
+
+    def get(self, url: str) -> FrontierEntry | None:
+        """Returns the entry of a page, if it was ever enqueued."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM frontier WHERE url = ?", (url,)
+            ).fetchone()
+        return _entry(row) if row else None
+
+    def entries(
+        self,
+        kinds: tuple[str, ...] | None = None,
+        statuses: tuple[str, ...] | None = None,
+    ) -> list[FrontierEntry]:
+        """Returns the entries of the frontier, in the order they were queued.
+
+        Args:
+            kinds: Only return pages of these kinds. Defaults to any kind.
+            statuses: Only return pages in these statuses. Defaults to any.
+
+        Returns:
+            The matching entries.
+        """
+        query = f"SELECT {_COLUMNS} FROM frontier WHERE 1 = 1"
+        args: list[Any] = []
+        for column, values in (("kind", kinds), ("status", statuses)):
+            if values:
+                query += f" AND {column} IN ({', '.join('?' for _ in values)})"
+                args.extend(values)
+        query += " ORDER BY rowid"
+        with self._lock:
+            rows = self._db.execute(query, args).fetchall()
+        return [_entry(row) for row in rows]
+
+    def counts(self) -> dict[str, int]:
+        """Returns how many pages are in each status."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM frontier GROUP BY status"
+            ).fetchall()
+        return {status: 0 for status in (PENDING, IN_PROGRESS, DONE, FAILED)} | dict(
+            rows
+        )
+
+    def close(self):
+        """Closes the database connection."""
+        self._db.close()
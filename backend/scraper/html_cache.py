@@ -0,0 +1,354 @@
+"""A local, zstd compressed store of the raw HTML fetched from FBRef.
+
+Every page the scrapers fetch is written here before it is parsed, so fixing
+a bug in ``parse_tables`` or ``parse_match_page`` no longer means going back
+through Cloudflare. Snapshots are indexed by URL and fetch time in a small
+SQLite database, while the compressed bodies are stored once per content hash,
+so re-fetching an unchanged page costs no extra disk space.
+
+Snapshots older than ``ttl_seconds`` are evicted, and the least recently
+fetched snapshots are dropped whenever the compressed bodies exceed
+``max_bytes``. Eviction runs on the first write and then every
+``evict_every_bytes`` of new bodies or ``evict_every_seconds``, not on every
+write, so between two evictions the store may outgrow ``max_bytes`` by up to
+``evict_every_bytes``. A cache that is only read is never evicted. With
+``offline`` set (the scripts' ``--from-cache`` flag) the cache never falls
+back to the network and a miss raises ``CacheMissError``.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, TypedDict
+
+import zstandard
+
+cache_dir = "./html_cache"
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a URL has no cached snapshot."""
+
+
+class CacheStats(TypedDict):
+    """Counters describing the cache contents and its use in this process."""
+
+    snapshots: int
+    blobs: int
+    compressed_bytes: int
+    raw_bytes: int
+    hits: int
+    misses: int
+
+
+class HtmlCache:
+    """A content addressed, compressed store of fetched HTML.
+
+    Attributes:
+        root: The directory holding the index and compressed bodies.
+        ttl_seconds: Snapshots older than this are evicted.
+        max_bytes: The compressed size the store is trimmed down to.
+        fresh_seconds: How old a snapshot may be to be served instead of a
+            network fetch when not offline.
+        offline: Serve every page from the cache and never fetch.
+        evict_every_bytes: The compressed bytes written between evictions.
+        evict_every_seconds: The time between evictions while writing.
+    """
+
+    def __init__(
+        self,
+        root: str = cache_dir,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_bytes: int = 2 * 1024**3,
+        fresh_seconds: float = 12 * 3600,
+        offline: bool = False,
+        compression_level: int = 10,
+        evict_every_bytes: int = 64 * 1024**2,
+        evict_every_seconds: float = 3600,
+    ):
+        """Initializes the HtmlCache, creating the store if needed.
+
+        Args:
+            root: The directory holding the index and compressed bodies.
+            ttl_seconds: Snapshots older than this are evicted.
+            max_bytes: The compressed size the store is trimmed down to.
+            fresh_seconds: The maximum age of a snapshot served while online.
+            offline: Serve every page from the cache and never fetch.
+            compression_level: The zstd compression level.
+            evict_every_bytes: The compressed bytes written between evictions.
+            evict_every_seconds: The time between evictions while writing.
+        """
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self.offline = offline
+        self.evict_every_bytes = evict_every_bytes
+        self.evict_every_seconds = evict_every_seconds
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidated: dict[str, float] = {}
+        self._written_since_evict = 0
+        self._evicted_at: float | None = None
+
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(root, "index.sqlite"), check_same_thread=False
+        )
+        with self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (url, fetched_at)
+                );
+                CREATE INDEX IF NOT EXISTS ix_pages_fetched_at ON pages (fetched_at);
+                CREATE INDEX IF NOT EXISTS ix_pages_digest ON pages (digest);
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    raw_size INTEGER NOT NULL
+                );
+                """
+            )
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.html.zst")
+
+    def put(self, url: str, html: str, fetched_at: float | None = None) -> str:
+        """Stores a snapshot of a page.
+
+        Args:
+            url: The URL the HTML was fetched from.
+            html: The page HTML.
+            fetched_at: The fetch time as a Unix timestamp. Defaults to now.
+
+        Returns:
+            The content digest the body is stored under.
+        """
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        path = self._blob_path(digest)
+        with self._lock:
+            # Another process may store the same body concurrently: the file
+            # is replaced atomically and the first row inserted wins.
+            if os.path.exists(path):
+                size = os.path.getsize(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = self._compressor.compress(raw)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                size = len(compressed)
+            with self._db:
+                inserted = self._db.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size, raw_size) "
+                    "VALUES (?, ?, ?)",
+                    (digest, size, len(raw)),
+                ).rowcount
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages (url, fetched_at, digest) VALUES (?, ?, ?)",
+                    (url, fetched_at, digest),
+                )
+            if inserted:
+                self._written_since_evict += size
+            if (
+                self._evicted_at is None
+                or self._written_since_evict >= self.evict_every_bytes
+                or time.monotonic() - self._evicted_at >= self.evict_every_seconds
+            ):
+                self._evict()
+        return digest
+
+    def get(self, url: str, max_age: float | None = None) -> str | None:
+        """Returns the most recent snapshot of a URL.
+
+        Args:
+            url: The URL to look up.
+            max_age: Ignore snapshots older than this many seconds.
+
+        Returns:
+            The cached HTML, or None if there is no usable snapshot.
+        """
+        query = "SELECT digest FROM pages WHERE url = ?"
+        params: tuple = (url,)
+        if max_age is not None:
+            query += " AND fetched_at >= ?"
+            params = (url, time.time() - max_age)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        if not row:
+            return None
+        try:
+            with open(self._blob_path(row[0]), "rb") as f:
+                return self._decompressor.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def history(self, url: str) -> list[float]:
+        """Returns the fetch times of every stored snapshot of a URL."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT fetched_at FROM pages WHERE url = ? ORDER BY fetched_at",
+                (url,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def invalidate(self, url: str):
+        """Makes online lookups of a URL miss until it is fetched again.
+
+        The snapshots already stored are kept, and offline lookups still
+        serve them.
+
+        Args:
+            url: The URL whose snapshots are out of date.
+        """
+        self._invalidated[url] = time.time()
+
+    def lookup(self, url: str) -> str | None:
+        """Looks a page up the way a fetch would, counting hits and misses.
+
+        Online, only snapshots younger than ``fresh_seconds`` and fetched
+        after the last ``invalidate`` of the URL are served; offline, the
+        latest snapshot is served whatever its age.
+
+        Args:
+            url: The URL of the page.
+
+        Returns:
+            The cached HTML, or None if the page has to be fetched.
+
+        Raises:
+            CacheMissError: If offline and the URL was never cached.
+        """
+        max_age = self.fresh_seconds
+        if url in self._invalidated:
+            max_age = min(max_age, time.time() - self._invalidated[url])
+        html = self.get(url, max_age=None if self.offline else max_age)
+        if html is not None:
+            self._hits += 1
+            print(f"🗄️ Serving {url} from the HTML cache")
+            return html
+
+        self._misses += 1
+        if self.offline:
+            raise CacheMissError(f"{url} is not in the HTML cache")
+        return None
+
+    def get_or_fetch(self, url: str, fetch: Callable[[], str]) -> str:
+        """Serves a page from the cache, fetching and storing it on a miss.
+
+        Args:
+            url: The URL of the page.
+            fetch: Fetches the page HTML from the network.
+
+        Returns:
+            The page HTML.
+
+        Raises:
+            CacheMissError: If offline and the URL was never cached.
+        """
+        html = self.lookup(url)
+        if html is None:
+            html = fetch()
+            self.put(url, html)
+        return html
+
+    def evict(self):
+        """Drops expired snapshots, then the oldest ones until under max_bytes."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        """Does the work of ``evict``. Must be called with the lock held."""
+        self._written_since_evict = 0
+        self._evicted_at = time.monotonic()
+        with self._db:
+            self._db.execute(
+                "DELETE FROM pages WHERE fetched_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._delete_orphan_blobs()
+
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM blobs"
+            ).fetchone()[0]
+            while total > self.max_bytes:
+                oldest = self._db.execute(
+                    "SELECT url, fetched_at, digest FROM pages "
+                    "ORDER BY fetched_at LIMIT 100"
+                ).fetchall()
+                if not oldest:
+                    break
+                for url, fetched_at, digest in oldest:
+                    self._db.execute(
+                        "DELETE FROM pages WHERE url = ? AND fetched_at = ?",
+                        (url, fetched_at),
+                    )
+                    total -= self._delete_orphan_blobs((digest,))
+                    if total <= self.max_bytes:
+                        break
+
+    def _delete_orphan_blobs(self, digests: tuple[str, ...] | None = None) -> int:
+        """Deletes bodies no snapshot refers to and returns the bytes freed.
+
+        Args:
+            digests: Only consider these bodies. Defaults to all of them.
+        """
+        query = (
+            "SELECT digest, size FROM blobs WHERE NOT EXISTS "
+            "(SELECT 1 FROM pages WHERE pages.digest = blobs.digest)"
+        )
+        if digests is not None:
+            query += f" AND digest IN ({', '.join('?' for _ in digests)})"
+        orphans = self._db.execute(query, digests or ()).fetchall()
+        for digest, _ in orphans:
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+        self._db.executemany(
+            "DELETE FROM blobs WHERE digest = ?", [(digest,) for digest, _ in orphans]
+        )
+        return sum(size for _, size in orphans)
+
+    def stats(self) -> CacheStats:
+        """Returns the cache counters."""
+        with self._lock:
+            snapshots = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, size, raw_size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+        return CacheStats(
+            snapshots=snapshots,
+            blobs=blobs,
+            compressed_bytes=size,
+            raw_bytes=raw_size,
+            hits=self._hits,
+            misses=self._misses,
+        )
+
+
+_default_cache: HtmlCache | None = None
+
+
+def get_html_cache() -> HtmlCache:
+    """Returns the process wide HTML cache shared by all scrapers."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HtmlCache()
+    return _default_cache
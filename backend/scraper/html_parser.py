@@ -0,0 +1,143 @@
+"""Pluggable HTML parser backends for the FBRef parsers.
+
+Every parser builds a BeautifulSoup tree and walks it with ``find``,
+``select`` and friends, so the backend is the tree builder underneath:
+
+- ``html.parser``: Python's own parser, the slowest, and the reference the
+  other backends are checked against,
+- ``lxml``: libxml2's HTML parser through BeautifulSoup's lxml builder,
+- ``selectolax``: the Lexbor HTML5 parser. The document is parsed in C in a
+  few milliseconds and the finished tree is handed to BeautifulSoup node by
+  node, which skips the tokenizer callbacks the other builders go through.
+
+The parsers only call ``make_soup``, so switching backends needs no change
+to them. The backend defaults to ``html.parser``, what the scrapers were
+written against; the faster backends are opt-in, with the
+``SCRAPER_HTML_PARSER`` environment variable or ``set_parser_backend``, as
+their parity is only checked on pages rendered from ``scraped_data/`` and
+not yet on the HTML FBRef serves. Run ``python -m benchmarks.parser_parity``
+after changing a parser to check all backends still produce the same output.
+"""
+
+import os
+from typing import Any, Iterator, Literal, get_args
+
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from bs4.element import Comment, Doctype
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+ParserBackend = Literal["html.parser", "lxml", "selectolax"]
+
+PARSER_BACKENDS: tuple[ParserBackend, ...] = get_args(ParserBackend)
+DEFAULT_PARSER_BACKEND: ParserBackend = "html.parser"
+
+
+class LexborTreeBuilder(HTMLTreeBuilder):
+    """Builds a BeautifulSoup tree from a document parsed by Lexbor."""
+
+    NAME = "selectolax"
+    ALTERNATE_NAMES = ["lexbor"]
+    features = [NAME, *ALTERNATE_NAMES]
+
+    def prepare_markup(
+        self,
+        markup: str | bytes,
+        user_specified_encoding: str | None = None,
+        document_declared_encoding: str | None = None,
+        exclude_encodings: Any = None,
+    ) -> Iterator[tuple[str, str | None, str | None, bool]]:
+        if isinstance(markup, bytes):
+            markup = markup.decode(user_specified_encoding or "utf-8", "replace")
+        yield markup, None, None, False
+
+    def feed(self, markup: str):
+        assert self.soup is not None
+        soup = self.soup
+        root = LexborHTMLParser(markup).root
+        if root is None:
+            return
+        document = root.parent or root
+
+        # Walk the tree depth first without recursion, emitting the same
+        # start tag, data and end tag events a streaming parser would. Each
+        # stack entry is the next node to visit on that level.
+        stack: list[LexborNode | None] = [document.child]
+        while stack:
+            child = stack[-1]
+            if child is None:
+                stack.pop()
+                if stack:
+                    parent = stack[-1]
+                    assert parent is not None
+                    soup.handle_endtag(parent.tag)
+                    stack[-1] = parent.next
+                continue
+
+            tag = child.tag
+            if tag == "-text":
+                soup.handle_data(child.text_content or "")
+            elif tag == "-comment":
+                soup.endData()
+                # comment_content strips the comment, the serialized node
+                # keeps it exactly as written.
+                soup.handle_data((child.html or "<!---->")[4:-3])
+                soup.endData(Comment)
+            elif tag == "-doctype":
+                soup.endData()
+                soup.handle_data(_doctype_name(child.html or ""))
+                soup.endData(Doctype)
+            elif not tag.startswith(("-", "#")):
+                attrs = {k: v or "" for k, v in child.attributes.items()}
+                soup.handle_starttag(tag, None, None, attrs)
+                stack.append(child.child)
+                continue
+            stack[-1] = child.next
+
+    def test_fragment_to_document(self, fragment: str) -> str:
+        return fragment
+
+
+def _doctype_name(html: str) -> str:
+    """Turns ``<!DOCTYPE html>`` into ``html``, as BeautifulSoup stores it."""
+    return html.removeprefix("<!").removesuffix(">").split(None, 1)[-1]
+
+
+_backend: ParserBackend = os.environ.get(  # type: ignore[assignment]
+    "SCRAPER_HTML_PARSER", DEFAULT_PARSER_BACKEND
+)
+
+
+def get_parser_backend() -> ParserBackend:
+    """Returns the backend ``make_soup`` uses by default."""
+    return _backend
+
+
+def set_parser_backend(backend: ParserBackend):
+    """Changes the backend ``make_soup`` uses by default.
+
+    Raises:
+        ValueError: If ``backend`` is not one of ``PARSER_BACKENDS``.
+    """
+    global _backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, use {PARSER_BACKENDS}")
+    _backend = backend
+
+
+def make_soup(html: str, backend: ParserBackend | None = None) -> BeautifulSoup:
+    """Parses a page with the configured backend.
+
+    Args:
+        html: The HTML of the page.
+        backend: The backend to use. Defaults to ``get_parser_backend()``.
+
+    Returns:
+        The BeautifulSoup tree of the page.
+    """
+    backend = backend or _backend
+    if backend == "selectolax":
+        return BeautifulSoup(html, builder=LexborTreeBuilder())
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, use {PARSER_BACKENDS}")
+    return BeautifulSoup(html, backend)
@@ -0,0 +1,217 @@
+"""A plain HTTP fetcher for FBRef pages that do not need a browser.
+
+League, player and schedule pages ship their tables in the raw HTML (the
+secondary ones wrapped in HTML comments that the browser's JavaScript would
+otherwise unwrap), so most pages can be fetched with a pooled HTTP/2 ``httpx``
+client in a fraction of the time a Chromium render takes. When Cloudflare
+answers with a challenge instead, the fetcher reports it so the caller can
+fall back to the Playwright path. A challenge is a 403 or 503 carrying the
+markup of a Cloudflare interstitial; other error statuses and pages without
+any table are real errors and are raised as such, not sent to the browser.
+
+Once a browser has solved a challenge, its ``cf_clearance`` cookie is sent
+along with the user agent that earned it, so the fast path keeps working.
+"""
+
+import asyncio
+import re
+
+import httpx
+
+from scraper.clearance import ClearanceStore, get_clearance_store
+from scraper.rate_limit import HostRateLimiter, get_rate_limiter
+from scraper.telemetry import get_telemetry
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+)
+
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+CHALLENGE_STATUSES = (403, 503)
+
+# Only found on the interstitials themselves. The ``/cdn-cgi/challenge-platform``
+# script Cloudflare injects into ordinary pages is deliberately not a marker.
+CHALLENGE_MARKERS = (
+    "<title>Just a moment...</title>",
+    "_cf_chl_opt",
+    'id="cf-chl-',
+    "Attention Required! | Cloudflare",
+)
+
+_COMMENT_RE = re.compile(r"<!--(.*?)-->", re.DOTALL)
+
+
+class NoTablesError(Exception):
+    """Raised when a page came back fine but without a single table."""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"{url} answered {status} without any table")
+        self.url = url
+        self.status = status
+
+
+def is_challenge_page(status: int, html: str) -> bool:
+    """Checks whether a response is a Cloudflare challenge instead of the page.
+
+    Args:
+        status: The HTTP status of the response.
+        html: The response body.
+
+    Returns:
+        True if the response is a 403 or 503 interstitial.
+    """
+    return status in CHALLENGE_STATUSES and any(
+        marker in html for marker in CHALLENGE_MARKERS
+    )
+
+
+def uncomment_tables(html: str) -> str:
+    """Unwraps the HTML comments FBRef hides secondary tables in.
+
+    The browser does this with JavaScript; doing it here lets the existing
+    parsers find the same tables in a raw HTTP response.
+
+    Args:
+        html: The raw page HTML.
+
+    Returns:
+        The HTML with every comment containing a table unwrapped.
+    """
+    return _COMMENT_RE.sub(
+        lambda m: m.group(1) if "<table" in m.group(1) else m.group(0), html
+    )
+
+
+class HttpFetcher:
+    """Fetches pages over a pooled HTTP/2 connection.
+
+    Attributes:
+        rate_limiter: The per-host rate limiter every request goes through.
+        headers: The headers sent with every request.
+        clearance: Supplies the Cloudflare clearance cookie and its user agent.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: HostRateLimiter | None = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+        timeout: float = 30.0,
+        clearance: ClearanceStore | None = None,
+    ):
+        """Initializes the HttpFetcher. Clients are created lazily.
+
+        Args:
+            rate_limiter: The rate limiter to use. Defaults to the shared one.
+            user_agent: The User-Agent header to send.
+            timeout: The request timeout in seconds.
+            clearance: The clearance store. Defaults to the shared one.
+        """
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.headers = {**DEFAULT_HEADERS, "User-Agent": user_agent}
+        self.timeout = timeout
+        self.clearance = clearance or get_clearance_store()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                http2=True,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        # An async client is bound to the event loop it was created on, and a
+        # replaced fetch engine runs on a new one.
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_client = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+        return self._async_client
+
+    def _clearance_headers(self, url: str) -> dict[str, str]:
+        """Returns the cookie and user agent of an unexpired clearance, if any."""
+        clearance = self.clearance.get(url)
+        if clearance is None:
+            return {}
+        cookie = "; ".join(f"{c['name']}={c['value']}" for c in clearance["cookies"])
+        return {"Cookie": cookie, "User-Agent": clearance["user_agent"]}
+
+    def _handle_response(self, url: str, response: httpx.Response) -> str | None:
+        """Returns the usable HTML of a response, or None if challenged.
+
+        Raises:
+            RateLimitedError: If the response is a 429.
+            httpx.HTTPStatusError: If the response is another error.
+            NoTablesError: If the page holds no table.
+        """
+        self.rate_limiter.check_response(
+            url, response.status_code, response.headers.get("retry-after")
+        )
+        if is_challenge_page(response.status_code, response.text):
+            print(f"🛡️ Challenge over HTTP for {url}")
+            return None
+        response.raise_for_status()
+        if "<table" not in response.text:
+            raise NoTablesError(url, response.status_code)
+        return uncomment_tables(response.text)
+
+    def fetch(self, url: str) -> str | None:
+        """Fetches a page.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The page HTML, or None if a browser is needed to get past a challenge.
+        """
+        self.rate_limiter.acquire(url)
+        print(f"🌐 GET {url}")
+        with get_telemetry().phase("http"):
+            response = self.client.get(url, headers=self._clearance_headers(url))
+        return self._handle_response(url, response)
+
+    async def fetch_async(self, url: str) -> str | None:
+        """Fetches a page without blocking the event loop.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The page HTML, or None if a browser is needed to get past a challenge.
+        """
+        await self.rate_limiter.acquire_async(url)
+        print(f"🌐 GET {url}")
+        with get_telemetry().phase("http"):
+            response = await self.async_client.get(
+                url, headers=self._clearance_headers(url)
+            )
+        return self._handle_response(url, response)
+
+    def close(self):
+        """Closes the sync client."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Closes the async client, which is bound to the running event loop."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,260 @@
+"""Calendar-aware, incremental refreshes of a season in progress.
+
+Re-running the scrapers re-fetches a whole season, while in a current season
+only a handful of matches finish each week. ``IncrementalRefresher`` uses the
+``schedule_epoch`` and ``score`` columns of the saved schedule to work out
+what actually went stale since the last refresh:
+
+1. If no fixture without a score has kicked off (plus ``match_duration``)
+   since the schedule was saved and every played match is already saved,
+   nothing can have changed and nothing is fetched at all.
+2. Otherwise the schedule is fetched again, and the matches that now have a
+   score but are not in ``scraped_data/matches/`` are scraped.
+3. The league and player tables are only re-fetched when the latest
+   completed matchweek is past the one they were last fetched for. If a
+   match failed to scrape they are left for the next refresh, which retries
+   it first.
+
+Which matchweek the tables were fetched for is kept in ``refresh_state.json``.
+
+    python -m scraper.incremental
+"""
+
+import json
+import os
+import time
+from typing import Any, TypedDict
+
+from scraper.fbref_competition_schedule_scrape import FBRefCompetitionScheduleScraper
+from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.fbref_players_data_scrape import FBRefPlayerScraper
+from scraper.fetch_engine import AsyncFetchEngine, get_fetch_engine
+from scraper.html_cache import HtmlCache, get_html_cache
+from scraper.match_batch import load_schedule_csv, pending_matches, scrape_matches
+
+refresh_state_file = "./refresh_state.json"
+
+# How long after kick-off a match is expected to have a score on FBRef.
+MATCH_DURATION_SECONDS = 3 * 3600
+
+
+class RefreshSummary(TypedDict):
+    """What an incremental refresh of one season fetched."""
+
+    league_name: str
+    season_year: str
+    schedule_fetched: bool
+    matchweek: int
+    matches_scraped: int
+    matches_failed: int
+    tables_refreshed: bool
+
+
+def _is_played(row: dict[str, Any]) -> bool:
+    return isinstance(row.get("score"), str) and bool(row["score"])
+
+
+def due_fixtures(
+    schedule: list[dict[str, Any]],
+    now: float,
+    match_duration: float = MATCH_DURATION_SECONDS,
+) -> list[dict[str, Any]]:
+    """Returns the fixtures that should be over but have no score yet.
+
+    Args:
+        schedule: The schedule rows, as saved or as parsed.
+        now: The current time as a Unix timestamp.
+        match_duration: Seconds after kick-off a match is expected to end.
+
+    Returns:
+        The rows whose result should be on FBRef by now.
+    """
+    due = []
+    for row in schedule:
+        try:
+            kick_off = int(row["schedule_epoch"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not _is_played(row) and kick_off + match_duration <= now:
+            due.append(row)
+    return due
+
+
+def completed_matchweek(schedule: list[dict[str, Any]]) -> int:
+    """Returns the latest matchweek in which a match has been played."""
+    weeks = [
+        int(row["match_week"])
+        for row in schedule
+        if _is_played(row) and str(row.get("match_week", "")).isdigit()
+    ]
+    return max(weeks, default=0)
+
+
+class IncrementalRefresher:
+    """Re-fetches only the pages of a season that changed since last time.
+
+    Attributes:
+        state_path: The JSON file holding the matchweek each season's tables
+            were last fetched for.
+        cache: The HTML cache whose snapshots of stale pages are bypassed.
+        engine: The fetch engine the player and match pages are fetched with.
+    """
+
+    def __init__(
+        self,
+        state_path: str = refresh_state_file,
+        cache: HtmlCache | None = None,
+        engine: AsyncFetchEngine | None = None,
+    ):
+        """Initializes the IncrementalRefresher.
+
+        Args:
+            state_path: The JSON file holding the refresh state.
+            cache: The HTML cache. Defaults to the shared one.
+            engine: The fetch engine. Defaults to the shared one.
+        """
+        self.state_path = state_path
+        self.cache = cache or get_html_cache()
+        self.engine = engine or get_fetch_engine()
+        self._state: dict[str, dict[str, Any]] = {}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self._state = json.load(f)
+
+    def _save_state(self):
+        with open(self.state_path, "w") as f:
+            json.dump(self._state, f, indent=2)
+
+    def refresh(
+        self,
+        league_name: str,
+        fbref_id: int,
+        season_year: str,
+        now: float | None = None,
+    ) -> RefreshSummary:
+        """Brings the saved data of one season up to date.
+
+        Args:
+            league_name: The name of the league.
+            fbref_id: The FBRef ID of the league.
+            season_year: The season to refresh.
+            now: The current time as a Unix timestamp. Defaults to now.
+
+        Returns:
+            What was fetched.
+        """
+        now = time.time() if now is None else now
+        key = f"{league_name}/{season_year}"
+        state = self._state.setdefault(key, {"matchweek": 0})
+        summary = RefreshSummary(
+            league_name=league_name,
+            season_year=season_year,
+            schedule_fetched=False,
+            matchweek=state["matchweek"],
+            matches_scraped=0,
+            matches_failed=0,
+            tables_refreshed=False,
+        )
+
+        schedule_scraper = FBRefCompetitionScheduleScraper(
+            league_name, fbref_id, season_year
+        )
+        schedule_path = os.path.join(
+            "scraped_data",
+            league_name,
+            f"schedule-{league_name}-{season_year}.csv",
+        )
+        if os.path.exists(schedule_path):
+            saved = load_schedule_csv(schedule_path)
+            if (
+                not due_fixtures(saved, now)
+                and not pending_matches(saved)
+                and completed_matchweek(saved) <= state["matchweek"]
+            ):
+                print(f"💤 {key}: no fixture finished since the last refresh.")
+                return summary
+
+        self.cache.invalidate(schedule_scraper.base_url)
+        schedule_scraper.scrape()
+        schedule_scraper.save_to_csv()
+        schedule = schedule_scraper.dataset
+        summary["schedule_fetched"] = True
+
+        matches = pending_matches(schedule)
+        print(f"🗓️ {key}: {len(matches)} newly finished matches.")
+        if matches:
+            failed = scrape_matches(matches, self.engine)
+            summary["matches_scraped"] = len(matches) - len(failed)
+            summary["matches_failed"] = len(failed)
+        if summary["matches_failed"]:
+            # Keep the state so the next refresh retries the failed matches.
+            print(f"⚠️ {key}: {len(failed)} matches failed, not advancing.")
+            return summary
+
+        matchweek = completed_matchweek(schedule)
+        if matchweek > state["matchweek"]:
+            print(f"📈 {key}: matchweek {state['matchweek']} -> {matchweek}.")
+            self._refresh_tables(league_name, fbref_id, season_year)
+            state["matchweek"] = matchweek
+            state["tables_refreshed_at"] = now
+            summary["tables_refreshed"] = True
+            summary["matchweek"] = matchweek
+            self._save_state()
+        return summary
+
+    def _refresh_tables(self, league_name: str, fbref_id: int, season_year: str):
+        """Re-fetches the league and player tables of a season."""
+        league_scraper = FBRefPlaywrightScraper(league_name, fbref_id, season_year)
+        player_scraper = FBRefPlayerScraper(league_name, fbref_id, season_year)
+        for url in (league_scraper.base_url, *player_scraper.urls.values()):
+            self.cache.invalidate(url)
+
+        league_scraper.scrape()
+        league_scraper.save_to_csv()
+        player_scraper.scrape(self.engine)
+        player_scraper.save_to_csv()
+        if player_scraper.failed_categories:
+            raise RuntimeError(
+                f"Player tables failed to refresh: {player_scraper.failed_categories}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from scraper import fbref_competition_schedule_scrape
+    from scraper.browser_pool import get_browser_pool
+    from scraper.cloudflare import get_challenge_handler
+    from scraper.fetch_engine import set_fetch_engine
+    from scraper.fetch_strategy import get_fetch_strategy
+    from scraper.retry_policy import get_retry_policy
+    from scraper.telemetry import get_telemetry
+
+    def main():
+        """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--concurrency", type=int, default=3)
+        parser.add_argument("--headless", action="store_true")
+        args = parser.parse_args()
+
+        set_fetch_engine(
+            AsyncFetchEngine(concurrency=args.concurrency, headless=args.headless)
+        )
+        refresher = IncrementalRefresher()
+        for scrape in fbref_competition_schedule_scrape.scrapes:
+            for year in scrape["season_year"]:
+                try:
+                    summary = refresher.refresh(
+                        scrape["league_name"], scrape["fbref_id"], year
+                    )
+                    print(f"✅ {summary}")
+                except Exception as e:
+                    print(f"❌ Failed to refresh {scrape['league_name']} {year}: {e}")
+
+        print(f"🧰 Browser pool stats: {get_browser_pool().stats()}")
+        print(f"📊 Fetch path stats: {get_fetch_strategy().stats()}")
+        print(f"🛡️ Challenge stats: {get_challenge_handler().stats()}")
+        print(f"🔁 Retry stats: {get_retry_policy().stats()}")
+        print(f"⏱️ Fetch telemetry report: {get_telemetry().write_report()}")
+
+    main()
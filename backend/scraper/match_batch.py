@@ -0,0 +1,224 @@
+"""Scrapes every played match of a season, fed by the schedule scraper.
+
+The schedule page already lists the ``match_link`` and ``fbref_id`` of every
+fixture, so instead of a hand-written ``scrapes`` list this script takes a
+season's schedule, keeps the matches that have a score, drops those already
+saved in ``scraped_data/matches/`` and scrapes the rest concurrently on the
+shared async fetch engine. Every fetch takes its token from the shared rate
+limiter and every match is saved as soon as it is parsed, so a 380-match
+season can be collected unattended and an interrupted run resumes where it
+stopped.
+
+    python -m scraper.match_batch
+    python -m scraper.match_batch --schedule-csv scraped_data/Premier-League/schedule-Premier-League-2024-2025.csv
+"""
+
+import asyncio
+import logging
+import os
+import re
+from typing import Any, Iterable
+
+import pandas as pd
+
+from scraper.fbref_competition_schedule_scrape import FBRefCompetitionScheduleScraper
+from scraper.fbref_match_scraper import FBRefMatchScraper, MatchData
+from scraper.fetch_engine import AsyncFetchEngine, get_fetch_engine
+
+matches_dir = os.path.join("scraped_data", "matches")
+
+# /en/matches/cc5b4244/Manchester-United-Fulham-August-16-2024-Premier-League
+_MATCH_LINK_RE = re.compile(
+    r"/matches/(?P<fbref_id>[0-9a-f]+)/.*?-"
+    r"(?P<date>[A-Z][a-z]+-\d{1,2}-\d{4})-(?P<league_name>[^/]+)$"
+)
+
+
+def _team_slug(link: str) -> str:
+    """Turns ``/en/squads/19538871/2024-2025/Manchester-United-Stats`` into a slug."""
+    return link.rstrip("/").split("/")[-1].removesuffix("-Stats")
+
+
+def _field(row: dict[str, Any], team: str, key: str) -> Any:
+    """Reads a team field from a parsed schedule row or a flattened CSV row."""
+    nested = row.get(team)
+    if isinstance(nested, dict):
+        return nested.get(key)
+    return row.get(f"{team}_{key}")
+
+
+def match_data_from_schedule(row: dict[str, Any]) -> MatchData | None:
+    """Builds the match scraper input for a schedule row.
+
+    Args:
+        row: A match from ``FBRefCompetitionScheduleScraper.dataset`` or a row
+            of the CSV it saves.
+
+    Returns:
+        The match to scrape, or None if the match has not been played yet.
+    """
+    score = row.get("score")
+    match_link = row.get("match_link")
+    if not isinstance(score, str) or not score or not isinstance(match_link, str):
+        return None
+    match = _MATCH_LINK_RE.search(match_link)
+    home_link = _field(row, "home_team", "link")
+    away_link = _field(row, "away_team", "link")
+    if match is None or not (isinstance(home_link, str) and isinstance(away_link, str)):
+        return None
+    return MatchData(
+        league_name=match["league_name"],
+        fbref_id=match["fbref_id"],
+        home_team=_team_slug(home_link),
+        away_team=_team_slug(away_link),
+        date=match["date"],
+    )
+
+
+def load_schedule_csv(path: str) -> list[dict[str, Any]]:
+    """Reads a schedule saved by ``FBRefCompetitionScheduleScraper.save_to_csv``."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.to_dict(orient="records")
+
+
+def scraped_match_ids(directory: str = matches_dir) -> set[str]:
+    """Returns the FBRef ids of the matches already saved in ``directory``."""
+    if not os.path.isdir(directory):
+        return set()
+    return {
+        name.removesuffix(".json").rsplit("-", 1)[-1]
+        for name in os.listdir(directory)
+        if name.endswith(".json")
+    }
+
+
+def pending_matches(
+    schedule: Iterable[dict[str, Any]], directory: str = matches_dir
+) -> list[MatchData]:
+    """Returns the played matches of a schedule that are not saved yet.
+
+    Args:
+        schedule: The schedule rows.
+        directory: Where the match scraper saves its JSON files.
+
+    Returns:
+        The matches to scrape, in schedule order and without duplicates.
+    """
+    done = scraped_match_ids(directory)
+    pending: dict[str, MatchData] = {}
+    for row in schedule:
+        match_data = match_data_from_schedule(row)
+        if match_data and match_data["fbref_id"] not in done:
+            pending.setdefault(match_data["fbref_id"], match_data)
+    return list(pending.values())
+
+
+async def _scrape_and_save(scraper: FBRefMatchScraper, engine: AsyncFetchEngine):
+    await scraper.scrape_async(engine)
+    await asyncio.to_thread(scraper.save_to_json)
+
+
+def scrape_matches(
+    matches: list[MatchData], engine: AsyncFetchEngine | None = None
+) -> dict[str, BaseException]:
+    """Scrapes and saves matches concurrently on one async fetch engine.
+
+    Args:
+        matches: The matches to scrape.
+        engine: The engine to fetch with. Defaults to the shared engine.
+
+    Returns:
+        The error of every match that failed, keyed by its FBRef id.
+    """
+    engine = engine or get_fetch_engine()
+
+    async def _run() -> list[BaseException | None]:
+        return await asyncio.gather(
+            *(_scrape_and_save(FBRefMatchScraper(match), engine) for match in matches),
+            return_exceptions=True,
+        )
+
+    results = engine.run(_run())
+    return {
+        match["fbref_id"]: result
+        for match, result in zip(matches, results)
+        if isinstance(result, BaseException)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from scraper import fbref_competition_schedule_scrape
+    from scraper.cloudflare import get_challenge_handler
+    from scraper.fetch_engine import set_fetch_engine
+    from scraper.fetch_strategy import get_fetch_strategy
+    from scraper.html_cache import get_html_cache
+    from scraper.retry_policy import get_retry_policy
+    from scraper.telemetry import get_telemetry
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
+
+    def main():
+        """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--schedule-csv",
+            nargs="+",
+            help="Saved schedules to read instead of scraping the schedules "
+            "in the schedule scraper's scrapes list.",
+        )
+        parser.add_argument("--concurrency", type=int, default=3)
+        parser.add_argument("--headless", action="store_true")
+        parser.add_argument(
+            "--from-cache",
+            action="store_true",
+            help="Re-parse pages from the HTML cache without touching the network.",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            help="Serve the fetch metrics for Prometheus on this port.",
+        )
+        args = parser.parse_args()
+        get_html_cache().offline = args.from_cache
+        set_fetch_engine(
+            AsyncFetchEngine(concurrency=args.concurrency, headless=args.headless)
+        )
+        if args.metrics_port:
+            get_telemetry().serve(args.metrics_port)
+
+        schedule: list[dict[str, Any]] = []
+        if args.schedule_csv:
+            for path in args.schedule_csv:
+                schedule.extend(load_schedule_csv(path))
+        else:
+            for scrape in fbref_competition_schedule_scrape.scrapes:
+                for year in scrape["season_year"]:
+                    scraper = FBRefCompetitionScheduleScraper(
+                        league_name=scrape["league_name"],
+                        fbref_id=scrape["fbref_id"],
+                        season_year=year,
+                    )
+                    scraper.scrape()
+                    scraper.save_to_csv()
+                    schedule.extend(scraper.dataset)
+
+        matches = pending_matches(schedule)
+        logging.info("🗓️ %d played matches left to scrape.", len(matches))
+        failed = scrape_matches(matches)
+        for fbref_id, error in failed.items():
+            logging.error("Failed to scrape match %s: %s", fbref_id, error)
+        logging.info(
+            "✅ Scraped %d of %d matches.", len(matches) - len(failed), len(matches)
+        )
+        logging.info("📊 Fetch path stats: %s", get_fetch_strategy().stats())
+        logging.info("🛡️ Challenge stats: %s", get_challenge_handler().stats())
+        logging.info("🔁 Retry stats: %s", get_retry_policy().stats())
+        logging.info("⏱️ Fetch telemetry report: %s", get_telemetry().write_report())
+
+    main()
@@ -0,0 +1,114 @@
+"""An id and class index of a parsed page, built in one walk of its tree.
+
+Every ``soup.find`` walks the tree from the top until it finds a match, and
+the match parser used to make dozens of them per page: the lineup of each
+team twice, its events, and one table per stat type and team. ``PageIndex``
+walks the tree once and maps ids and classes to their elements, so each of
+those lookups is a dictionary access and parsing a page costs about one
+walk of it, however many extractors read from it.
+
+Lookups return the same elements ``find`` and ``find_all`` would, in page
+order, and follow BeautifulSoup's ``class_`` matching: a class string
+matches an element having that class, or whose whole class attribute is
+that string.
+"""
+
+from bs4 import BeautifulSoup, Comment, Tag
+
+from scraper.table_extract import extract_table
+
+
+def _has_class(tag: Tag, class_: str) -> bool:
+    classes = tag.get("class") or []
+    return class_ in classes or class_ == " ".join(classes)
+
+
+class PageIndex:
+    """The elements of a parsed page by id and by class.
+
+    Attributes:
+        soup: The parsed page.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        """Initializes the PageIndex by walking the whole page once.
+
+        Args:
+            soup: The parsed page.
+        """
+        self.soup = soup
+        self._by_id: dict[str, list[Tag]] = {}
+        self._by_class: dict[str, list[Tag]] = {}
+        self._table_comments: list[str] = []
+
+        for element in soup.descendants:
+            if isinstance(element, Tag):
+                element_id = element.get("id")
+                if element_id:
+                    self._by_id.setdefault(element_id, []).append(element)
+                for class_ in dict.fromkeys(element.get("class") or ()):
+                    self._by_class.setdefault(class_, []).append(element)
+            elif isinstance(element, Comment) and "<table" in element:
+                self._table_comments.append(str(element))
+
+    def by_id(
+        self, element_id: str, name: str | None = None, class_: str | None = None
+    ) -> Tag | None:
+        """Returns the first element with id ``element_id``.
+
+        Args:
+            element_id: The id of the element.
+            name: Only match elements with this tag name.
+            class_: Only match elements with this class.
+
+        Returns:
+            The element, or None if there is none.
+        """
+        for element in self._by_id.get(element_id, ()):
+            if name is not None and element.name != name:
+                continue
+            if class_ is not None and not _has_class(element, class_):
+                continue
+            return element
+        return None
+
+    def by_class(self, class_: str, name: str | None = None) -> list[Tag]:
+        """Returns the elements with class ``class_``, in page order.
+
+        Args:
+            class_: A class, or a whole class attribute such as ``"event a"``.
+            name: Only match elements with this tag name.
+
+        Returns:
+            The matching elements.
+        """
+        first, *_ = class_.split() or [""]
+        return [
+            element
+            for element in self._by_class.get(first, ())
+            if (name is None or element.name == name) and _has_class(element, class_)
+        ]
+
+    def first_by_class(self, class_: str, name: str | None = None) -> Tag | None:
+        """Returns the first element with class ``class_``, None if none."""
+        elements = self.by_class(class_, name)
+        return elements[0] if elements else None
+
+    def table(self, table_id: str) -> Tag | None:
+        """Returns the table with id ``table_id``, looking into comments too.
+
+        Args:
+            table_id: The id of the table.
+
+        Returns:
+            The table element, or None if the page has no such table.
+        """
+        table = self.by_id(table_id, "table")
+        if table is not None:
+            return table
+        for comment in self._table_comments:
+            if table_id in comment:
+                table = extract_table(comment, table_id)
+                if table is not None:
+                    return table
+        return None
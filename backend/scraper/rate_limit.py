@@ -0,0 +1,215 @@
+"""Per-host token bucket rate limiting for the FBRef scrapers.
+
+FBRef asks bots to stay under roughly ten requests a minute and answers bursts
+with ``429 Too Many Requests``. Rather than sleeping a fixed number of seconds
+between pages, every fetch takes a token from its host's bucket. The bucket
+refills at the configured rate, so a scraper only waits when it is actually
+ahead of the limit, and a 429 pauses the whole host for its ``Retry-After``.
+
+Buckets are thread safe and can be awaited from asyncio code, so the sync
+scrapers and the async fetch engine share the same limits. To share them
+across processes and machines, install a Redis backed limiter with
+``set_rate_limiter`` (see ``scraper.redis_rate_limit``).
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from scraper.telemetry import get_telemetry
+
+DEFAULT_REQUESTS_PER_MINUTE = 10
+DEFAULT_RETRY_AFTER_SECONDS = 60.0
+
+
+class RateLimitedError(Exception):
+    """Raised when the server answered a request with HTTP 429."""
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(f"Rate limited on {url}, retry after {retry_after:.0f}s")
+        self.url = url
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Parses a ``Retry-After`` header into a number of seconds.
+
+    Args:
+        value: The header value, either delta seconds or an HTTP date.
+
+    Returns:
+        The seconds to wait, falling back to a default when missing or invalid.
+    """
+    if not value:
+        return DEFAULT_RETRY_AFTER_SECONDS
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """A thread safe token bucket.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: The maximum number of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """Initializes the TokenBucket with a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: The maximum number of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one is due.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Blocks the calling thread until a token is available."""
+        while wait := self._reserve():
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Waits, without blocking the event loop, until a token is available."""
+        while wait := self._reserve():
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hands out no tokens for ``seconds``, then allows a single request."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = min(1.0, self.capacity)
+            self._updated = self._paused_until
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host.
+
+    Attributes:
+        requests_per_minute: The default rate for hosts without an override.
+        burst: The default bucket capacity.
+    """
+
+    def __init__(
+        self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, burst: int = 1
+    ):
+        """Initializes the HostRateLimiter.
+
+        Args:
+            requests_per_minute: The default rate for hosts without an override.
+            burst: The default bucket capacity.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _new_bucket(self, host: str, rate: float, capacity: int) -> TokenBucket:
+        """Creates the bucket of a host. Overridden by shared limiters."""
+        return TokenBucket(rate, capacity)
+
+    def configure(self, host: str, requests_per_minute: float, burst: int = 1):
+        """Sets a custom rate for a single host."""
+        with self._lock:
+            self._buckets[host] = self._new_bucket(
+                host, requests_per_minute / 60, burst
+            )
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Returns the bucket for the host of ``url``, creating it if needed."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = self._new_bucket(
+                    host, self.requests_per_minute / 60, self.burst
+                )
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        """Blocks until a request to ``url`` is allowed."""
+        with get_telemetry().phase("rate_limit"):
+            self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str):
+        """Waits until a request to ``url`` is allowed."""
+        with get_telemetry().phase("rate_limit"):
+            await self.bucket(url).acquire_async()
+
+    def penalize(self, url: str, retry_after: float):
+        """Pauses the host of ``url`` after a 429 response."""
+        print(f"⏳ Rate limited by {urlparse(url).netloc}, pausing {retry_after:.0f}s")
+        self.bucket(url).pause(retry_after)
+
+    def check_response(self, url: str, status: int | None, retry_after: str | None):
+        """Pauses the host and raises if a response was a 429.
+
+        Args:
+            url: The requested URL.
+            status: The HTTP status of the response, if any.
+            retry_after: The raw ``Retry-After`` header, if any.
+
+        Raises:
+            RateLimitedError: If ``status`` is 429.
+        """
+        if status != 429:
+            return
+        seconds = parse_retry_after(retry_after)
+        self.penalize(url, seconds)
+        raise RateLimitedError(url, seconds)
+
+
+_default_limiter: HostRateLimiter | None = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Returns the process wide rate limiter shared by all scrapers."""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = HostRateLimiter()
+    return _default_limiter
+
+
+def set_rate_limiter(limiter: HostRateLimiter):
+    """Replaces the process wide rate limiter.
+
+    Must be called before the first fetch, as the fetchers keep a reference
+    to the limiter they were created with.
+    """
+    global _default_limiter
+    _default_limiter = limiter
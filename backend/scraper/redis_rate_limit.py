@@ -0,0 +1,134 @@
+"""A cluster wide, Redis backed version of the per-host rate limiter.
+
+``HostRateLimiter`` keeps its buckets in process memory, which is fine for a
+single scraper but lets every additional Celery worker send another ten
+requests a minute. ``RedisHostRateLimiter`` keeps each host's bucket in Redis
+instead and refills and takes tokens in a single Lua script, so however many
+workers run, FBRef sees at most the configured rate. A 429 seen by one worker
+pauses the host for all of them.
+
+The Redis server's clock is used throughout, so workers on different machines
+need not agree on the time.
+"""
+
+import redis
+
+from scraper.rate_limit import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    HostRateLimiter,
+    TokenBucket,
+)
+
+KEY_PREFIX = "scraper:ratelimit:"
+
+# Buckets idle for longer than this are dropped; a missing bucket is full.
+BUCKET_TTL_SECONDS = 3600
+
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'paused_until')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local paused_until = tonumber(state[3]) or 0
+if now < paused_until then
+    return tostring(paused_until - now)
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return tostring(wait)
+"""
+
+_PAUSE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local paused_until = math.max(
+    tonumber(redis.call('HGET', KEYS[1], 'paused_until')) or 0,
+    now + tonumber(ARGV[1])
+)
+redis.call('HSET', KEYS[1],
+    'paused_until', tostring(paused_until),
+    'tokens', tostring(math.min(1, tonumber(ARGV[2]))),
+    'updated', tostring(paused_until))
+redis.call('EXPIRE', KEYS[1], math.ceil(paused_until - now) + tonumber(ARGV[3]))
+return tostring(paused_until)
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+    """A token bucket whose state lives in Redis.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: The maximum number of tokens, i.e. the allowed burst.
+        key: The Redis key holding the bucket.
+    """
+
+    def __init__(self, client: redis.Redis, key: str, rate: float, capacity: int = 1):
+        """Initializes the RedisTokenBucket.
+
+        Args:
+            client: The Redis client.
+            key: The Redis key holding the bucket.
+            rate: Tokens added per second.
+            capacity: The maximum number of tokens.
+        """
+        super().__init__(rate, capacity)
+        self.key = key
+        self._reserve_script = client.register_script(_RESERVE_SCRIPT)
+        self._pause_script = client.register_script(_PAUSE_SCRIPT)
+
+    def _reserve(self) -> float:
+        """Takes a token from the shared bucket if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one is due.
+        """
+        wait = self._reserve_script(
+            keys=[self.key], args=[self.rate, self.capacity, BUCKET_TTL_SECONDS]
+        )
+        return float(wait)
+
+    def pause(self, seconds: float):
+        """Hands out no tokens to any worker for ``seconds``."""
+        self._pause_script(
+            keys=[self.key], args=[seconds, self.capacity, BUCKET_TTL_SECONDS]
+        )
+
+
+class RedisHostRateLimiter(HostRateLimiter):
+    """Keeps one Redis backed token bucket per host.
+
+    Attributes:
+        requests_per_minute: The default rate for hosts without an override.
+        burst: The default bucket capacity.
+        client: The Redis client the buckets live in.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        burst: int = 1,
+    ):
+        """Initializes the RedisHostRateLimiter.
+
+        Args:
+            redis_url: The URL of the Redis server shared by all workers.
+            requests_per_minute: The default rate for hosts without an override.
+            burst: The default bucket capacity.
+        """
+        super().__init__(requests_per_minute, burst)
+        self.client = redis.Redis.from_url(redis_url)
+
+    def _new_bucket(self, host: str, rate: float, capacity: int) -> TokenBucket:
+        return RedisTokenBucket(self.client, f"{KEY_PREFIX}{host}", rate, capacity)
@@ -0,0 +1,269 @@
+"""Re-parses cached pages on every core, for backfills after a parser fix.
+
+Parsing is CPU bound BeautifulSoup work, and ``crawl --from-cache`` does it
+on one thread, one page after the other, so re-parsing thousands of match
+pages after a parser fix used a single core. This command takes the pages
+of the crawl frontier, whose entries hold what each scraper needs to be
+rebuilt, reads their raw HTML from the HTML cache and fans the parsing out
+to a ``ProcessPoolExecutor``:
+
+    python -m scraper.reparse --kinds match --workers 8
+
+Entries are sent to the workers in chunks of ``--chunk-size``, so the cost
+of handing work to a process is paid once per chunk and not once per page.
+Each worker opens its own connection to the cache, parses its pages with
+the scrapers' own parse methods and saves them with ``save_to_csv`` or
+``save_to_json``, so the outputs are the same as a scrape's. Only the
+outcome of each page travels back to the parent. With ``SCRAPER_TRACE_FILE``
+set, every page is traced from its own ``reparse`` root span.
+"""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, TypedDict
+
+from scraper.crawl import SCRAPERS, Scraper
+from scraper.fbref_competition_schedule_scrape import FBRefCompetitionScheduleScraper
+from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.fbref_match_scraper import FBRefMatchScraper
+from scraper.fbref_players_data_scrape import FBRefPlayerScraper
+from scraper.frontier import DONE, CrawlFrontier, FrontierEntry
+from scraper.html_cache import HtmlCache, cache_dir
+from scraper.html_parser import ParserBackend, set_parser_backend
+from scraper.tracing import get_tracer
+
+
+class ReparseResult(TypedDict):
+    """The outcome of re-parsing one page.
+
+    Attributes:
+        url: The URL of the page.
+        kind: The scraper that handled the page.
+        status: ``"ok"``, ``"missing"`` if the cache has no snapshot of the
+            page, or ``"failed"``.
+        error: What went wrong, for failed pages.
+        seconds: The time spent reading, parsing and saving the page.
+    """
+
+    url: str
+    kind: str
+    status: str
+    error: str | None
+    seconds: float
+
+
+class ReparseSummary(TypedDict):
+    """The outcome of a re-parse run."""
+
+    pages: int
+    ok: int
+    missing: int
+    failed: int
+    workers: int
+    seconds: float
+    pages_per_second: float
+
+
+_worker_cache: HtmlCache | None = None
+_worker_verbose = False
+
+
+def _init_worker(cache_root: str, backend: ParserBackend | None, verbose: bool):
+    """Opens the worker's own cache connection and sets its parser backend."""
+    global _worker_cache, _worker_verbose
+    _worker_cache = HtmlCache(cache_root, offline=True)
+    _worker_verbose = verbose
+    if backend is not None:
+        set_parser_backend(backend)
+
+
+def parse_and_save(scraper: Scraper, entry: FrontierEntry, html: str):
+    """Parses a page with its scraper and saves it like a scrape would.
+
+    Player tables, the largest, are streamed to their CSV file a batch of
+    rows at a time.
+
+    Args:
+        scraper: The scraper rebuilt from the entry.
+        entry: The frontier entry of the page.
+        html: The HTML of the page.
+
+    Raises:
+        RuntimeError: If the page yielded no data.
+    """
+    if isinstance(scraper, FBRefPlayerScraper):
+        category = entry["params"]["category"]
+        if not scraper.stream_to_csv(html, category):
+            raise RuntimeError(f"No player table for category {category}")
+        return
+    if isinstance(scraper, FBRefPlaywrightScraper):
+        scraper.parse_tables(html)
+        scraper.save_to_csv()
+    elif isinstance(scraper, FBRefCompetitionScheduleScraper):
+        scraper.parse_schedule(html)
+        scraper.save_to_csv()
+    elif isinstance(scraper, FBRefMatchScraper):
+        scraper.parse_match_page(html)
+        scraper.save_to_json()
+    if not scraper.dataset:
+        raise RuntimeError("No data parsed")
+
+
+def reparse_chunk(entries: list[FrontierEntry]) -> list[ReparseResult]:
+    """Re-parses a chunk of pages in a worker process.
+
+    Args:
+        entries: The frontier entries of the pages.
+
+    Returns:
+        The outcome of each page.
+    """
+    assert _worker_cache is not None, "reparse_chunk runs in a worker process"
+    tracer = get_tracer()
+    results = []
+    for entry in entries:
+        started = time.perf_counter()
+        status, error = "ok", None
+        with tracer.span("reparse", url=entry["url"], kind=entry["kind"]) as span:
+            try:
+                html = _worker_cache.get(entry["url"])
+                if html is None:
+                    status = "missing"
+                else:
+                    scraper = SCRAPERS[entry["kind"]].from_frontier(entry)
+                    with contextlib.ExitStack() as stack:
+                        if not _worker_verbose:
+                            stack.enter_context(
+                                contextlib.redirect_stdout(io.StringIO())
+                            )
+                        parse_and_save(scraper, entry, html)
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            if span is not None:
+                span.set_attributes(status=status, error=error)
+        results.append(
+            ReparseResult(
+                url=entry["url"],
+                kind=entry["kind"],
+                status=status,
+                error=error,
+                seconds=time.perf_counter() - started,
+            )
+        )
+    return results
+
+
+def _chunks(entries: list[FrontierEntry], size: int) -> Iterator[list[FrontierEntry]]:
+    for start in range(0, len(entries), size):
+        yield entries[start : start + size]
+
+
+def reparse(
+    entries: list[FrontierEntry],
+    workers: int | None = None,
+    chunk_size: int = 16,
+    cache_root: str = cache_dir,
+    backend: ParserBackend | None = None,
+    verbose: bool = False,
+) -> ReparseSummary:
+    """Re-parses the cached pages of ``entries`` on a pool of processes.
+
+    Args:
+        entries: The frontier entries of the pages.
+        workers: The number of worker processes. Defaults to the CPU count.
+        chunk_size: How many pages a worker is handed at a time.
+        cache_root: The directory of the HTML cache.
+        backend: The parser backend the workers use. Defaults to theirs.
+        verbose: Let the scrapers' own output through.
+
+    Returns:
+        The summary of the run.
+    """
+    workers = workers or os.cpu_count() or 1
+    counts = {"ok": 0, "missing": 0, "failed": 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(cache_root, backend, verbose),
+    ) as pool:
+        futures = [
+            pool.submit(reparse_chunk, chunk) for chunk in _chunks(entries, chunk_size)
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                counts[result["status"]] += 1
+                if result["status"] == "failed":
+                    print(f"❌ Failed to re-parse {result['url']}: {result['error']}")
+                elif result["status"] == "missing":
+                    print(f"⚠️ No cached snapshot of {result['url']}")
+    seconds = time.perf_counter() - started
+    return ReparseSummary(
+        pages=len(entries),
+        ok=counts["ok"],
+        missing=counts["missing"],
+        failed=counts["failed"],
+        workers=workers,
+        seconds=seconds,
+        pages_per_second=len(entries) / seconds if seconds else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from scraper.html_parser import PARSER_BACKENDS
+
+    def main():
+        """The main function of the script."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            "--kinds",
+            nargs="+",
+            choices=sorted(SCRAPERS),
+            help="Only re-parse pages of these kinds.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-parse every queued page, not only the ones marked done.",
+        )
+        parser.add_argument(
+            "--workers", type=int, help="Worker processes, the CPU count by default."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=16,
+            help="Pages handed to a worker at a time.",
+        )
+        parser.add_argument(
+            "--backend", choices=PARSER_BACKENDS, help="The HTML parser backend."
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Show the scrapers' output for every page.",
+        )
+        args = parser.parse_args()
+
+        frontier = CrawlFrontier()
+        entries = frontier.entries(
+            tuple(args.kinds) if args.kinds else None,
+            None if args.all else (DONE,),
+        )
+        frontier.close()
+        print(f"📥 Re-parsing {len(entries)} cached pages.")
+        summary = reparse(
+            entries,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            backend=args.backend,
+            verbose=args.verbose,
+        )
+        print(f"✅ Re-parse summary: {summary}")
+
+    main()
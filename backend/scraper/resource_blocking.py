@@ -0,0 +1,219 @@
+"""Request interception that keeps Playwright page loads lean.
+
+The scrapers only read the tables out of the DOM, yet a plain ``page.goto``
+downloads every image, font, stylesheet, ad and tracker on an FBRef page.
+``ResourceBlocker`` routes every request of a browser context and aborts:
+
+- images, media, fonts and stylesheets, and
+- scripts (and beacons) served from outside FBRef's own domains.
+
+Hosts on the allow-list, by default the Cloudflare challenge host, are never
+blocked so the challenge widget can still render and be solved. The bytes a
+page actually transferred are read from Chrome's network events, so the
+savings show up in ``ResourceBlocker.summary()``.
+"""
+
+from typing import TypedDict
+from urllib.parse import urlparse
+
+from patchright.async_api import (
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage,
+    Route as AsyncRoute,
+)
+from patchright.sync_api import BrowserContext, Page, Route
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+THIRD_PARTY_BLOCKED_TYPES = frozenset({"script", "xhr", "fetch", "ping", "websocket"})
+FIRST_PARTY_DOMAINS = ("fbref.com", "sports-reference.com", "ssref.net")
+ALLOWED_DOMAINS = ("challenges.cloudflare.com",)
+
+
+class PageTraffic(TypedDict):
+    """The network traffic of a single page load."""
+
+    url: str
+    bytes_transferred: int
+    requests: int
+    blocked: int
+
+
+class TrafficSummary(TypedDict):
+    """Network traffic totals over all tracked pages."""
+
+    pages: int
+    bytes_transferred: int
+    avg_bytes_per_page: int
+    requests: int
+    blocked: int
+
+
+def _matches(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+class ResourceBlocker:
+    """Aborts the requests a table scrape does not need.
+
+    Attributes:
+        blocked_types: Resource types aborted on every host.
+        third_party_types: Resource types aborted outside first-party domains.
+        first_party_domains: Domains treated as FBRef's own.
+        allowed_domains: Domains that are never blocked.
+        enabled: Whether blocking is active. Traffic is tracked either way.
+    """
+
+    def __init__(
+        self,
+        blocked_types: frozenset[str] = BLOCKED_RESOURCE_TYPES,
+        third_party_types: frozenset[str] = THIRD_PARTY_BLOCKED_TYPES,
+        first_party_domains: tuple[str, ...] = FIRST_PARTY_DOMAINS,
+        allowed_domains: tuple[str, ...] = ALLOWED_DOMAINS,
+        enabled: bool = True,
+    ):
+        """Initializes the ResourceBlocker.
+
+        Args:
+            blocked_types: Resource types aborted on every host.
+            third_party_types: Resource types aborted outside first-party domains.
+            first_party_domains: Domains treated as FBRef's own.
+            allowed_domains: Domains that are never blocked.
+            enabled: Whether blocking is active.
+        """
+        self.blocked_types = blocked_types
+        self.third_party_types = third_party_types
+        self.first_party_domains = first_party_domains
+        self.allowed_domains = allowed_domains
+        self.enabled = enabled
+        self.pages: list[PageTraffic] = []
+        self._active: dict[Page | AsyncPage, PageTraffic] = {}
+        self._blocked = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Decides whether a request is aborted.
+
+        Args:
+            url: The requested URL.
+            resource_type: Playwright's resource type of the request.
+
+        Returns:
+            True if the request should be aborted.
+        """
+        if not self.enabled or resource_type == "document":
+            return False
+        host = urlparse(url).hostname or ""
+        if _matches(host, self.allowed_domains):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return resource_type in self.third_party_types and not _matches(
+            host, self.first_party_domains
+        )
+
+    def _count_blocked(self, route: Route | AsyncRoute):
+        """Counts an aborted request against the page that issued it."""
+        self._blocked += 1
+        try:
+            traffic = self._active.get(route.request.frame.page)
+        except Exception:
+            traffic = None
+        if traffic is not None:
+            traffic["blocked"] += 1
+
+    def _handle(self, route: Route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self._count_blocked(route)
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _handle_async(self, route: AsyncRoute):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self._count_blocked(route)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def install(self, context: BrowserContext):
+        """Routes every request of a context through the blocker."""
+        if self.enabled:
+            context.route("**/*", self._handle)
+
+    async def install_async(self, context: AsyncBrowserContext):
+        """Routes every request of an async context through the blocker."""
+        if self.enabled:
+            await context.route("**/*", self._handle_async)
+
+    def _start(self, page: Page | AsyncPage) -> PageTraffic:
+        traffic = PageTraffic(url="", bytes_transferred=0, requests=0, blocked=0)
+        self._active[page] = traffic
+        self.pages.append(traffic)
+        return traffic
+
+    def _on_loading_finished(self, traffic: PageTraffic, event: dict):
+        traffic["bytes_transferred"] += int(event.get("encodedDataLength", 0))
+        traffic["requests"] += 1
+
+    def track(self, page: Page) -> PageTraffic:
+        """Starts counting the bytes a page transfers.
+
+        Args:
+            page: A freshly opened page.
+
+        Returns:
+            The traffic record, filled in as the page loads.
+        """
+        traffic = self._start(page)
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.on(
+                "Network.loadingFinished",
+                lambda event: self._on_loading_finished(traffic, event),
+            )
+            cdp.send("Network.enable")
+        except Exception as e:
+            print(f"⚠️ Could not track page traffic: {e}")
+        return traffic
+
+    async def track_async(self, page: AsyncPage) -> PageTraffic:
+        """The asyncio counterpart of ``track``."""
+        traffic = self._start(page)
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            cdp.on(
+                "Network.loadingFinished",
+                lambda event: self._on_loading_finished(traffic, event),
+            )
+            await cdp.send("Network.enable")
+        except Exception as e:
+            print(f"⚠️ Could not track page traffic: {e}")
+        return traffic
+
+    def finish(self, page: Page | AsyncPage, url: str):
+        """Completes the traffic record of a page once it is done.
+
+        Args:
+            page: The tracked page.
+            url: The URL the page was opened for.
+        """
+        traffic = self._active.pop(page, None)
+        if traffic is None:
+            return
+        traffic["url"] = url
+        print(
+            f"📉 {url}: {traffic['bytes_transferred'] / 1024:.0f} KiB over "
+            f"{traffic['requests']} requests, {traffic['blocked']} blocked"
+        )
+
+    def summary(self) -> TrafficSummary:
+        """Returns the traffic totals over all tracked pages."""
+        total = sum(p["bytes_transferred"] for p in self.pages)
+        return TrafficSummary(
+            pages=len(self.pages),
+            bytes_transferred=total,
+            avg_bytes_per_page=total // len(self.pages) if self.pages else 0,
+            requests=sum(p["requests"] for p in self.pages),
+            blocked=self._blocked,
+        )
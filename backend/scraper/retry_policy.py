@@ -0,0 +1,351 @@
+"""One retry policy for every layer of the FBRef scrapers.
+
+The scrapers used to retry ``Exception`` both around each page fetch and
+around the whole scrape, so one bad page could cost nine fetches and three
+browser relaunches, and a parser bug re-fetched the page it could not parse.
+Errors are now classified first and each layer only retries its own kind:
+
+- ``fetch`` errors (timeouts, connection and HTTP errors, 429s) are retried
+  around the single page fetch by ``retry_fetch``,
+- ``browser`` errors (a crashed or closed browser, or a scrape that left
+  pages unfetched, ``CategoryFetchError``) are retried around the whole
+  scrape by ``retry_scrape``, which relaunches the browser in between,
+- ``parse`` errors are never retried: the HTML is already in the cache, so
+  the page can be re-parsed with ``--from-cache`` once the parser is fixed,
+- ``fatal`` errors (an open circuit, an offline cache miss) stop at once.
+
+Every retry spends from a budget shared by the whole run, and a per-host
+circuit breaker stops fetching from a host that keeps failing, so a bad
+night on FBRef ends the run quickly instead of hammering the site. A run is
+a CLI invocation or, on a Celery worker, a task: ``reset`` gives the next
+one a fresh budget, while the circuits of failing hosts stay open.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Literal, TypedDict
+from urllib.parse import urlparse
+
+import httpx
+from patchright.sync_api import Error as PlaywrightError
+from patchright.sync_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_base,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from scraper.html_cache import CacheMissError
+from scraper.rate_limit import RateLimitedError
+
+ErrorKind = Literal["fetch", "browser", "parse", "fatal"]
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BUDGET = 30
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of fetching from a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CategoryFetchError(Exception):
+    """Raised after a scrape whose failed pages are worth fetching again.
+
+    The scrape itself keeps going past a page that fails, so this is raised
+    once it is done and saved, for ``retry_scrape`` to run it again.
+    """
+
+    def __init__(self, categories: list[str]):
+        super().__init__(f"Categories failed to fetch: {categories}")
+        self.categories = categories
+
+
+def classify(error: BaseException) -> ErrorKind:
+    """Sorts an error into the layer that should deal with it.
+
+    Args:
+        error: The error raised by a fetch or a parse.
+
+    Returns:
+        ``"fetch"``, ``"browser"``, ``"parse"`` or ``"fatal"``.
+    """
+    if isinstance(error, (CircuitOpenError, CacheMissError)):
+        return "fatal"
+    if isinstance(
+        error,
+        (
+            RateLimitedError,
+            PlaywrightTimeoutError,
+            httpx.HTTPError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    ):
+        return "fetch"
+    if isinstance(error, (PlaywrightError, CategoryFetchError)):
+        return "browser"
+    return "parse"
+
+
+class RetryStats(TypedDict):
+    """How the retry policy was used during a run."""
+
+    retries: int
+    budget: int
+    exhausted: int
+    errors: dict[str, int]
+    open_circuits: list[str]
+
+
+class CircuitBreaker:
+    """Stops fetching from a host after repeated failures.
+
+    After ``failure_threshold`` consecutive failed fetches the host's circuit
+    opens and fetches fail fast for ``reset_seconds``. Then a single trial
+    fetch is let through: success closes the circuit, failure reopens it.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_seconds: How long an open circuit stays open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 300.0):
+        """Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_seconds: How long an open circuit stays open.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def check(self, url: str):
+        """Raises if the host of ``url`` must not be fetched from right now.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            retry_in = opened_at + self.reset_seconds - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(host, retry_in)
+            # Half open: let this fetch through as the trial; a failure
+            # reopens the circuit straight away.
+            del self._opened_at[host]
+            self._failures[host] = self.failure_threshold - 1
+
+    def record_success(self, url: str):
+        """Closes the circuit of the host of ``url``."""
+        with self._lock:
+            self._failures.pop(urlparse(url).netloc, None)
+
+    def record_failure(self, url: str):
+        """Counts a failed fetch, opening the circuit at the threshold."""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold:
+                if host not in self._opened_at:
+                    print(f"🔌 Circuit opened for {host} for {self.reset_seconds:.0f}s")
+                self._opened_at[host] = time.monotonic()
+
+    def open_circuits(self) -> list[str]:
+        """Returns the hosts whose circuit is currently open."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                host
+                for host, opened_at in self._opened_at.items()
+                if opened_at + self.reset_seconds > now
+            ]
+
+
+class RetryPolicy:
+    """Decides which errors are retried, within a budget shared by a run.
+
+    Attributes:
+        budget: The number of retries the whole run may spend.
+        breaker: The per-host circuit breaker.
+    """
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_RETRY_BUDGET,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """Initializes the RetryPolicy.
+
+        Args:
+            budget: The number of retries the whole run may spend.
+            breaker: The circuit breaker. Defaults to a new one.
+        """
+        self.budget = budget
+        self.breaker = breaker or CircuitBreaker()
+        self._retries = 0
+        self._exhausted = 0
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, error: BaseException) -> ErrorKind:
+        """Counts an error by kind and returns its kind.
+
+        An error reaching several layers, such as a fetch error that
+        ``retry_fetch`` gave up on and ``retry_scrape`` sees next, is only
+        counted the first time.
+        """
+        kind = getattr(error, "_retry_kind", None)
+        if kind is not None:
+            return kind
+        kind = classify(error)
+        error._retry_kind = kind  # type: ignore[attr-defined]
+        with self._lock:
+            self._errors[kind] = self._errors.get(kind, 0) + 1
+        return kind
+
+    def should_retry(
+        self, error: BaseException, kind: ErrorKind, last_attempt: bool = False
+    ) -> bool:
+        """Spends one retry from the budget if ``error`` is of ``kind``.
+
+        The budget is charged once per failed attempt: an error some layer
+        already retried is not retried, nor charged, again.
+
+        Args:
+            error: The error that ended the attempt.
+            kind: The kind of error the calling layer retries.
+            last_attempt: Whether the caller has no attempts left anyway.
+
+        Returns:
+            True if the attempt should be retried.
+        """
+        if self.record(error) != kind or last_attempt:
+            return False
+        if getattr(error, "_retry_charged", False):
+            return False
+        error._retry_charged = True  # type: ignore[attr-defined]
+        with self._lock:
+            if self._retries >= self.budget:
+                self._exhausted += 1
+                print(f"💸 Retry budget of {self.budget} spent, not retrying: {error}")
+                return False
+            self._retries += 1
+            return True
+
+    def reset(self):
+        """Starts a new run with the whole budget and no errors counted.
+
+        The circuit breaker is kept: a host failing at the end of one run
+        is still failing at the start of the next.
+        """
+        with self._lock:
+            self._retries = 0
+            self._exhausted = 0
+            self._errors = {}
+
+    def stats(self) -> RetryStats:
+        """Returns the retry counters of the run."""
+        with self._lock:
+            return RetryStats(
+                retries=self._retries,
+                budget=self.budget,
+                exhausted=self._exhausted,
+                errors=dict(self._errors),
+                open_circuits=self.breaker.open_circuits(),
+            )
+
+
+_default_policy: RetryPolicy | None = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Returns the process wide retry policy shared by all scrapers.
+
+    Long lived processes running several runs, such as Celery workers, must
+    ``reset`` it at the start of each.
+    """
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = RetryPolicy()
+    return _default_policy
+
+
+class _retry_if_kind(retry_base):
+    """Retries errors of one kind while attempts and budget last."""
+
+    def __init__(self, kind: ErrorKind, max_attempts: int):
+        self.kind = kind
+        self.max_attempts = max_attempts
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        if retry_state.outcome is None or not retry_state.outcome.failed:
+            return False
+        return get_retry_policy().should_retry(
+            retry_state.outcome.exception(),
+            self.kind,
+            last_attempt=retry_state.attempt_number >= self.max_attempts,
+        )
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Waits out a 429's Retry-After, otherwise backs off exponentially."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(error, RateLimitedError):
+        return error.retry_after
+    return wait_exponential(multiplier=1, min=2, max=10)(retry_state)
+
+
+def retry_fetch(
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    before_sleep: Callable[[RetryCallState], Any] | None = None,
+):
+    """Retries a single page fetch on ``fetch`` errors.
+
+    Works on both plain functions and coroutines.
+
+    Args:
+        max_attempts: The attempts per fetch, budget permitting.
+        before_sleep: Called before each retry.
+    """
+    return retry(
+        stop=stop_after_attempt(max_attempts),
+        wait=_wait,
+        retry=_retry_if_kind("fetch", max_attempts),
+        before_sleep=before_sleep,
+        reraise=True,
+    )
+
+
+def retry_scrape(
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    before_sleep: Callable[[RetryCallState], Any] | None = None,
+):
+    """Retries a whole scrape on ``browser`` errors.
+
+    Fetch errors were already retried by ``retry_fetch`` and parse errors
+    would only fail again, so neither is retried here.
+
+    Args:
+        max_attempts: The attempts per scrape, budget permitting.
+        before_sleep: Called before each retry, e.g. to relaunch the browser.
+    """
+    return retry(
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=_retry_if_kind("browser", max_attempts),
+        before_sleep=before_sleep,
+        reraise=True,
+    )
@@ -0,0 +1,307 @@
+"""Finds FBRef tables in raw HTML, including the ones hidden in comments.
+
+FBRef ships most secondary tables inside HTML comments and only turns them
+into tables with JavaScript, which is why the scrapers used to need the
+browser's rendering of a page. Parsing the whole page to then look for one
+table also builds a soup of several megabytes for a few hundred kilobytes
+of table.
+
+These helpers work on the markup instead. A table is located by its id with
+a regular expression, whether it sits in the page or inside a comment, its
+extent is found by counting ``<table>`` and ``</table>`` tags, and only that
+fragment is parsed with ``make_soup``. The same code therefore handles the
+raw HTML of a plain HTTP response and the rendered HTML of the browser.
+
+Parsers that read more than tables declare the ``PageSections`` they need
+and build their soup with ``make_section_soup``: only the selected sections,
+the elements leading to them and the wanted tables make it into the final
+BeautifulSoup tree. The sections are cut out of a parse with the same
+backend, so the result matches what that backend makes of the whole page.
+With the Lexbor backend that first parse takes milliseconds, with the others
+the page is parsed once whole and the small remainder once more.
+"""
+
+import html as html_lib
+import re
+from typing import Iterator, TypedDict
+
+from bs4 import BeautifulSoup, Tag
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from scraper.html_parser import ParserBackend, get_parser_backend, make_soup
+
+_TABLE_TAG = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+_TABLE_ID = re.compile(
+    r"""(?<![\w-])id\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE
+)
+
+
+class PageSections(TypedDict, total=False):
+    """The parts of a page a parser reads.
+
+    Attributes:
+        selectors: CSS selectors of the sections. They are kept whole, along
+            with the bare elements leading to them, so selectors relying on
+            ancestors such as ``div#content > h1`` still match.
+        table_ids: The ids of the tables, found in the page or its comments.
+        table_prefixes: The id prefixes of the tables.
+        exclude_table_ids: The ids of tables to leave out. Without
+            ``table_ids`` or ``table_prefixes``, every other table with an
+            id is wanted.
+    """
+
+    selectors: tuple[str, ...]
+    table_ids: tuple[str, ...]
+    table_prefixes: tuple[str, ...]
+    exclude_table_ids: tuple[str, ...]
+
+
+def _wants_tables(sections: PageSections) -> bool:
+    return any(
+        sections.get(key)
+        for key in ("table_ids", "table_prefixes", "exclude_table_ids")
+    )
+
+
+def wants_table(sections: PageSections, table_id: str | None) -> bool:
+    """Returns whether a table is one of the ``sections``."""
+    if table_id is None or table_id in sections.get("exclude_table_ids", ()):
+        return False
+    if not sections.get("table_ids") and not sections.get("table_prefixes"):
+        return bool(sections.get("exclude_table_ids"))
+    return table_id in sections.get("table_ids", ()) or table_id.startswith(
+        sections.get("table_prefixes", ())
+    )
+
+
+def _table_end(html: str, start: int) -> int:
+    """Returns the end of the table opening at ``start``, nested ones included.
+
+    A table missing its closing tag runs to the end of the document, as it
+    would for an HTML parser.
+    """
+    depth = 0
+    for match in _TABLE_TAG.finditer(html, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return match.end()
+    return len(html)
+
+
+def _opening_tag_id(tag: str) -> str | None:
+    match = _TABLE_ID.search(tag)
+    if match is None:
+        return None
+    return next(group for group in match.groups() if group is not None)
+
+
+def find_table_html(html: str, table_id: str) -> str | None:
+    """Returns the markup of the table with id ``table_id``.
+
+    Args:
+        html: The HTML of the page, raw or rendered.
+        table_id: The id of the table.
+
+    Returns:
+        The ``<table>...</table>`` markup, or None if there is no such table.
+    """
+    pattern = re.compile(
+        r"<table\b[^>]*\sid\s*=\s*[\"']?" + re.escape(table_id) + r"[\"'\s>]",
+        re.IGNORECASE,
+    )
+    match = pattern.search(html)
+    if match is None:
+        return None
+    return html[match.start() : _table_end(html, match.start())]
+
+
+def iter_table_html(
+    html: str, sections: PageSections | None = None
+) -> Iterator[tuple[str | None, str]]:
+    """Yields the id and markup of every top level table, in page order.
+
+    Tables inside comments are included at the place of their comment. A
+    table that shows up more than once, rendered and still commented, is
+    only yielded the first time.
+
+    Args:
+        html: The HTML of the page, raw or rendered.
+        sections: Only yield the tables these sections want. Defaults to all.
+
+    Yields:
+        The id of the table, None if it has none, and its markup.
+    """
+    seen: set[str] = set()
+    position = 0
+    while True:
+        match = _TABLE_TAG.search(html, position)
+        if match is None:
+            return
+        if match.group(1):
+            position = match.end()
+            continue
+        end = _table_end(html, match.start())
+        position = end
+        table_id = _opening_tag_id(match.group(0))
+        if sections is not None and not wants_table(sections, table_id):
+            continue
+        if table_id is not None:
+            if table_id in seen:
+                continue
+            seen.add(table_id)
+        yield table_id, html[match.start() : end]
+
+
+def parse_table(fragment: str, backend: ParserBackend | None = None) -> Tag | None:
+    """Parses the markup of one table.
+
+    Args:
+        fragment: The ``<table>...</table>`` markup.
+        backend: The parser backend. Defaults to the configured one.
+
+    Returns:
+        The table element, or None if the markup holds no table.
+    """
+    return make_soup(fragment, backend).find("table")
+
+
+def extract_table(
+    html: str, table_id: str, backend: ParserBackend | None = None
+) -> Tag | None:
+    """Parses only the table with id ``table_id`` out of a page.
+
+    Args:
+        html: The HTML of the page, raw or rendered.
+        table_id: The id of the table.
+        backend: The parser backend. Defaults to the configured one.
+
+    Returns:
+        The table element, or None if the page has no such table.
+    """
+    fragment = find_table_html(html, table_id)
+    if fragment is None:
+        return None
+    return parse_table(fragment, backend)
+
+
+def _start_tag(name: str, attributes: dict[str, str | list[str] | None]) -> str:
+    attrs = "".join(
+        f' {key}="{html_lib.escape(_attribute(value), quote=True)}"'
+        for key, value in attributes.items()
+    )
+    return f"<{name}{attrs}>"
+
+
+def _attribute(value: str | list[str] | None) -> str:
+    # BeautifulSoup splits multi-valued attributes such as class.
+    return " ".join(value) if isinstance(value, list) else value or ""
+
+
+def _lexbor_sections(html: str, selectors: tuple[str, ...]) -> list[str]:
+    """Serializes the selected sections of a page parsed by Lexbor."""
+    parts: list[str] = []
+    tree = LexborHTMLParser(html)
+    if tree.body is None:
+        return parts
+    nodes = tree.css(", ".join(selectors))
+    selected = {node.mem_id for node in nodes}
+    on_path: set[int] = set()
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in on_path:
+            on_path.add(parent.mem_id)
+            parent = parent.parent
+
+    def emit(node: LexborNode):
+        child = node.child
+        while child is not None:
+            if child.mem_id in selected:
+                parts.append(child.html or "")
+            elif child.mem_id in on_path:
+                parts.append(_start_tag(child.tag, child.attributes))
+                emit(child)
+                parts.append(f"</{child.tag}>")
+            child = child.next
+
+    emit(tree.body)
+    return parts
+
+
+def _soup_sections(
+    html: str, selectors: tuple[str, ...], backend: ParserBackend
+) -> list[str]:
+    """Serializes the selected sections of a page parsed by ``backend``."""
+    parts: list[str] = []
+    soup = make_soup(html, backend)
+    if soup.body is None:
+        return parts
+    nodes = soup.select(", ".join(selectors))
+    selected = {id(node) for node in nodes}
+    on_path: set[int] = set()
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and id(parent) not in on_path:
+            on_path.add(id(parent))
+            parent = parent.parent
+
+    def emit(node: Tag):
+        for child in node.children:
+            if not isinstance(child, Tag):
+                continue
+            if id(child) in selected:
+                parts.append(str(child))
+            elif id(child) in on_path:
+                parts.append(_start_tag(child.name, child.attrs))
+                emit(child)
+                parts.append(f"</{child.name}>")
+
+    emit(soup.body)
+    return parts
+
+
+def section_html(
+    html: str, sections: PageSections, backend: ParserBackend | None = None
+) -> str:
+    """Returns the markup of only the ``sections`` of a page.
+
+    The selected sections are serialized whole. Their ancestors are kept as
+    bare tags, without their other children, so the sections stay where
+    they were in the page. The wanted tables follow at the end of the body.
+
+    Args:
+        html: The HTML of the page, raw or rendered.
+        sections: The sections to keep.
+        backend: The parser backend the selectors are matched with. Defaults
+            to the configured one.
+
+    Returns:
+        A much smaller document holding only the sections.
+    """
+    backend = backend or get_parser_backend()
+    parts = ["<html><body>"]
+    selectors = sections.get("selectors", ())
+    if selectors and backend == "selectolax":
+        parts.extend(_lexbor_sections(html, selectors))
+    elif selectors:
+        parts.extend(_soup_sections(html, selectors, backend))
+
+    if _wants_tables(sections):
+        parts.extend(fragment for _, fragment in iter_table_html(html, sections))
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def make_section_soup(
+    html: str, sections: PageSections, backend: ParserBackend | None = None
+) -> BeautifulSoup:
+    """Parses only the ``sections`` of a page.
+
+    Args:
+        html: The HTML of the page, raw or rendered.
+        sections: The sections to keep, see ``section_html``.
+        backend: The parser backend. Defaults to the configured one.
+
+    Returns:
+        The BeautifulSoup tree of the sections.
+    """
+    return make_soup(section_html(html, sections, backend), backend)
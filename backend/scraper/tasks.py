@@ -0,0 +1,215 @@
+"""Celery tasks that run the FBRef scrapers on a pool of workers.
+
+Each task scrapes and saves one page set: a league's stats page, a league's
+player stats pages, a schedule or a match. All workers take their tokens from
+one Redis backed bucket per host (see ``scraper.redis_rate_limit``), so adding
+workers adds throughput only until the cluster reaches FBRef's limit.
+
+Start workers from ``backend/`` with the prefork pool, as every worker process
+owns its own browser pool and fetch engine, and the sync Playwright API is
+bound to its thread:
+
+    celery -A scraper.tasks worker --pool prefork --concurrency 2
+
+and queue everything in the scrapers' ``scrapes`` lists with:
+
+    python -m scraper.tasks
+"""
+
+from celery import Celery, Task
+from celery.signals import task_prerun
+
+from app.config import settings
+from scraper import (
+    fbref_competition_schedule_scrape,
+    fbref_league_data_scrape,
+    fbref_match_scraper,
+    fbref_players_data_scrape,
+)
+from scraper.browser_pool import BrowserPool, get_browser_pool
+from scraper.fbref_competition_schedule_scrape import FBRefCompetitionScheduleScraper
+from scraper.fbref_league_data_scrape import FBRefPlaywrightScraper
+from scraper.fbref_match_scraper import FBRefMatchScraper, MatchData
+from scraper.fbref_players_data_scrape import FBRefPlayerScraper
+from scraper.fetch_engine import AsyncFetchEngine, get_fetch_engine
+from scraper.rate_limit import RateLimitedError, set_rate_limiter
+from scraper.redis_rate_limit import RedisHostRateLimiter
+from scraper.retry_policy import get_retry_policy
+
+app = Celery("scraper", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+app.conf.update(
+    # A worker that dies mid-scrape leaves its task to be redelivered.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Scrapes are long; do not let one worker hoard queued tasks.
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+    result_serializer="json",
+)
+
+_cluster_rate_limit = False
+
+
+@task_prerun.connect
+def _start_run(**_):
+    """Gives every task the whole retry budget.
+
+    A worker runs tasks for its whole life, so a budget shared by the
+    process would be spent by the first few tasks and never refilled.
+    """
+    get_retry_policy().reset()
+
+
+def _use_cluster_rate_limit():
+    """Switches this worker process to the cluster wide rate limiter."""
+    global _cluster_rate_limit
+    if not _cluster_rate_limit:
+        set_rate_limiter(RedisHostRateLimiter(settings.REDIS_URL))
+        _cluster_rate_limit = True
+
+
+def _retry(
+    task: Task,
+    error: Exception,
+    browser: BrowserPool | AsyncFetchEngine | None = None,
+):
+    """Schedules a failed scrape to run again, honouring ``Retry-After``.
+
+    Parse errors and fatal errors would only fail again, so they are raised
+    as they are and the task fails straight away.
+
+    Args:
+        task: The bound task that failed.
+        error: The error it failed with.
+        browser: What the scrape fetched with, recycled before the retry.
+            Defaults to the browser pool.
+
+    Raises:
+        celery.exceptions.Retry: To reschedule the task.
+        Exception: ``error`` itself, if retrying cannot help.
+    """
+    if get_retry_policy().record(error) in ("parse", "fatal"):
+        raise error
+    if isinstance(error, RateLimitedError):
+        countdown = error.retry_after
+    else:
+        countdown = min(10, 2 * 2**task.request.retries)
+        (browser or get_browser_pool()).recycle()
+    raise task.retry(exc=error, countdown=countdown)
+
+
+@app.task(bind=True, max_retries=3)
+def scrape_league(self, league_name: str, fbref_id: int, season_year: str) -> dict:
+    """Scrapes and saves a league's stats tables.
+
+    Returns:
+        The number of rows scraped per table.
+    """
+    _use_cluster_rate_limit()
+    scraper = FBRefPlaywrightScraper(league_name, fbref_id, season_year)
+    try:
+        scraper.scrape()
+    except Exception as e:
+        _retry(self, e)
+    scraper.save_to_csv()
+    return {name: len(df) for name, df in scraper.dataset.items()}
+
+
+@app.task(bind=True, max_retries=3)
+def scrape_players(
+    self,
+    league_name: str,
+    fbref_id: int,
+    season_year: str,
+    categories: list[str] | None = None,
+) -> dict:
+    """Scrapes and saves a league's player stats tables.
+
+    Args:
+        categories: Only scrape these categories. Defaults to all of them.
+
+    Returns:
+        The number of rows scraped per table.
+    """
+    _use_cluster_rate_limit()
+    scraper = FBRefPlayerScraper(league_name, fbref_id, season_year)
+    if categories:
+        scraper.urls = {c: scraper.urls[c] for c in categories}
+    try:
+        scraper.scrape()
+    except Exception as e:
+        _retry(self, e, get_fetch_engine())
+    scraper.save_to_csv()
+    if retryable := scraper.retryable_categories:
+        # Only the categories that failed to fetch are retried; a parse
+        # error would fail again on the same page.
+        get_fetch_engine().recycle()
+        raise self.retry(
+            args=(league_name, fbref_id, season_year, retryable),
+            kwargs={},
+            exc=RuntimeError(str(scraper.failed_categories)),
+            countdown=min(10, 2 * 2**self.request.retries),
+        )
+    if scraper.failed_categories:
+        raise RuntimeError(f"Categories failed to parse: {scraper.failed_categories}")
+    return {name: len(df) for name, df in scraper.dataset.items()}
+
+
+@app.task(bind=True, max_retries=3)
+def scrape_schedule(self, league_name: str, fbref_id: int, season_year: str) -> int:
+    """Scrapes and saves a season's schedule.
+
+    Returns:
+        The number of matches scraped.
+    """
+    _use_cluster_rate_limit()
+    scraper = FBRefCompetitionScheduleScraper(league_name, fbref_id, season_year)
+    try:
+        scraper.scrape()
+    except Exception as e:
+        _retry(self, e)
+    scraper.save_to_csv()
+    return len(scraper.dataset)
+
+
+@app.task(bind=True, max_retries=3)
+def scrape_match(self, match_data: MatchData) -> str:
+    """Scrapes and saves a match.
+
+    Returns:
+        The name the match was saved under.
+    """
+    _use_cluster_rate_limit()
+    scraper = FBRefMatchScraper(match_data)
+    try:
+        scraper.scrape()
+    except Exception as e:
+        _retry(self, e)
+    scraper.save_to_json()
+    return scraper.match_name
+
+
+def dispatch() -> int:
+    """Queues a task for everything in the scrapers' ``scrapes`` lists.
+
+    Returns:
+        The number of tasks queued.
+    """
+    queued = 0
+    for module, task in (
+        (fbref_competition_schedule_scrape, scrape_schedule),
+        (fbref_league_data_scrape, scrape_league),
+        (fbref_players_data_scrape, scrape_players),
+    ):
+        for scrape in module.scrapes:
+            for year in scrape["season_year"]:
+                task.delay(scrape["league_name"], scrape["fbref_id"], year)
+                queued += 1
+    for match in fbref_match_scraper.scrapes:
+        scrape_match.delay(match)
+        queued += 1
+    return queued
+
+
+if __name__ == "__main__":
+    print(f"📨 Queued {dispatch()} scrape tasks.")
@@ -0,0 +1,379 @@
+"""Per-fetch timings of the FBRef scrapers, for Prometheus and a run report.
+
+The scrapers only printed what they were doing, so there was no telling
+whether a slow run waited on the rate limiter, on navigation, on Cloudflare
+or on BeautifulSoup. Every page a scraper fetches is now tracked as one
+``FetchRecord``:
+
+    with get_telemetry().track(url, "league", league, season):
+        html = get_fetch_strategy().fetch(url, browser_fetch)
+        with get_telemetry().phase("parse"):
+            parse(html)
+
+The fetch layers add their phases to the record being tracked (it is held in
+a context variable, so concurrent asyncio fetches and parses running in
+worker threads each add to their own): ``rate_limit``, ``http``, ``goto``,
+``selector_wait``, ``challenge``, ``content`` and ``parse``. The fetch
+strategy notes which source served the page and how big it was.
+
+Finished records are observed by Prometheus counters and histograms labelled
+with the page kind, league and season. Long running processes can serve them
+with ``serve()``; every run also writes them, together with a JSON report of
+the slowest pages and the time spent per phase, with ``write_report()``.
+
+When tracing is on (see ``scraper.tracing``) ``track`` also opens the root
+``scrape`` span of the page and every phase a child span of it.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, ParamSpec, TypedDict, TypeVar
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    start_http_server,
+    write_to_textfile,
+)
+
+from scraper.tracing import get_tracer
+
+reports_dir = "./telemetry"
+
+PHASES = (
+    "rate_limit",
+    "http",
+    "goto",
+    "selector_wait",
+    "challenge",
+    "content",
+    "parse",
+)
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+BYTES_BUCKETS = (10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2e6, 5e6, 10e6)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class FetchRecord(TypedDict):
+    """The timings of fetching and parsing one page.
+
+    Attributes:
+        url: The URL of the page.
+        kind: The kind of page, e.g. ``"league"`` or ``"match"``.
+        league: The league the page belongs to.
+        season: The season the page belongs to, empty for match pages.
+        source: ``"cache"``, ``"http"`` or ``"browser"``, empty if the fetch
+            failed before a source served it.
+        status: ``"ok"``, or the name of the exception the page failed with.
+        started_at: When tracking started, as a Unix timestamp.
+        total_seconds: The wall time of the fetch and the parse.
+        content_bytes: The size of the HTML.
+        phases: The seconds spent in each phase.
+    """
+
+    url: str
+    kind: str
+    league: str
+    season: str
+    source: str
+    status: str
+    started_at: float
+    total_seconds: float
+    content_bytes: int
+    phases: dict[str, float]
+
+
+class PhaseSummary(TypedDict):
+    """The distribution of the time spent in one phase."""
+
+    count: int
+    total_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    max_seconds: float
+
+
+class TelemetryReport(TypedDict):
+    """The JSON report of a run."""
+
+    started_at: float
+    finished_at: float
+    fetches: int
+    by_source: dict[str, int]
+    by_status: dict[str, int]
+    phases: dict[str, PhaseSummary]
+    slowest: list[FetchRecord]
+    records: list[FetchRecord]
+
+
+_current: contextvars.ContextVar[FetchRecord | None] = contextvars.ContextVar(
+    "fetch_record", default=None
+)
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Returns the ``q`` quantile of sorted ``values``."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class FetchTelemetry:
+    """Collects a ``FetchRecord`` per page and exports them.
+
+    Attributes:
+        registry: The Prometheus registry the metrics are registered in.
+        max_records: How many records are kept for the JSON report.
+    """
+
+    def __init__(
+        self,
+        registry: CollectorRegistry | None = None,
+        max_records: int = 10_000,
+    ):
+        """Initializes the FetchTelemetry.
+
+        Args:
+            registry: The Prometheus registry to use. Defaults to a new one,
+                so several instances do not clash.
+            max_records: How many records are kept for the JSON report.
+        """
+        self.registry = registry or CollectorRegistry()
+        self.max_records = max_records
+        self._started_at = time.time()
+        self._records: deque[FetchRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+        labels = ("kind", "league", "season")
+        self._fetches = Counter(
+            "scraper_fetches",
+            "Pages fetched, by source and outcome.",
+            (*labels, "source", "status"),
+            registry=self.registry,
+        )
+        self._duration = Histogram(
+            "scraper_fetch_duration_seconds",
+            "Wall time of fetching and parsing a page.",
+            (*labels, "source"),
+            buckets=SECONDS_BUCKETS,
+            registry=self.registry,
+        )
+        self._phase_duration = Histogram(
+            "scraper_fetch_phase_duration_seconds",
+            "Time spent in one phase of fetching or parsing a page.",
+            (*labels, "phase"),
+            buckets=SECONDS_BUCKETS,
+            registry=self.registry,
+        )
+        self._content_bytes = Histogram(
+            "scraper_page_content_bytes",
+            "Size of the fetched HTML.",
+            (*labels, "source"),
+            buckets=BYTES_BUCKETS,
+            registry=self.registry,
+        )
+
+    @contextmanager
+    def track(
+        self, url: str, kind: str, league: str = "", season: str = ""
+    ) -> Iterator[FetchRecord]:
+        """Tracks the fetch and parse of one page.
+
+        Args:
+            url: The URL of the page.
+            kind: The kind of page.
+            league: The league the page belongs to.
+            season: The season the page belongs to.
+
+        Yields:
+            The record the phases inside the block are added to.
+        """
+        record = FetchRecord(
+            url=url,
+            kind=kind,
+            league=league,
+            season=season,
+            source="",
+            status="ok",
+            started_at=time.time(),
+            total_seconds=0.0,
+            content_bytes=0,
+            phases={},
+        )
+        token = _current.set(record)
+        started = time.perf_counter()
+        with get_tracer().span(
+            "scrape", url=url, kind=kind, league=league, season=season
+        ) as span:
+            try:
+                yield record
+            except BaseException as e:
+                record["status"] = type(e).__name__
+                raise
+            finally:
+                record["total_seconds"] = time.perf_counter() - started
+                _current.reset(token)
+                self._observe(record)
+                if span is not None:
+                    span.set_attributes(
+                        source=record["source"],
+                        status=record["status"],
+                        content_bytes=record["content_bytes"],
+                    )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the block to a phase of the current record.
+
+        The block also runs in a span of that name, under the page's
+        ``scrape`` span. Outside of ``track`` this does nothing, so the
+        fetch layers can time their phases unconditionally.
+
+        Args:
+            name: One of ``PHASES``.
+        """
+        record = _current.get()
+        if record is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            with get_tracer().span(name):
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            record["phases"][name] = record["phases"].get(name, 0.0) + elapsed
+
+    def timed(self, name: str, func: Callable[P, T]) -> Callable[P, T]:
+        """Wraps ``func`` to run inside ``phase(name)``.
+
+        Handy for ``asyncio.to_thread``, so only the time the function
+        actually runs is counted and not the time it waits for a thread.
+        """
+
+        def _timed(*args: P.args, **kwargs: P.kwargs) -> T:
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return _timed
+
+    def note(self, source: str | None = None, content_bytes: int | None = None):
+        """Records where the current page came from and how big it was."""
+        record = _current.get()
+        if record is None:
+            return
+        if source is not None:
+            record["source"] = source
+        if content_bytes is not None:
+            record["content_bytes"] = content_bytes
+
+    def _observe(self, record: FetchRecord):
+        labels = (record["kind"], record["league"], record["season"])
+        self._fetches.labels(*labels, record["source"], record["status"]).inc()
+        self._duration.labels(*labels, record["source"]).observe(
+            record["total_seconds"]
+        )
+        for name, seconds in record["phases"].items():
+            self._phase_duration.labels(*labels, name).observe(seconds)
+        if record["content_bytes"]:
+            self._content_bytes.labels(*labels, record["source"]).observe(
+                record["content_bytes"]
+            )
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> list[FetchRecord]:
+        """Returns the records kept so far, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def report(self, slowest: int = 20) -> TelemetryReport:
+        """Summarises the records of the run.
+
+        Args:
+            slowest: How many of the slowest pages to list.
+
+        Returns:
+            The report.
+        """
+        records = self.records()
+        by_source: dict[str, int] = {}
+        by_status: dict[str, int] = {}
+        phase_times: dict[str, list[float]] = {}
+        for record in records:
+            source = record["source"] or "none"
+            by_source[source] = by_source.get(source, 0) + 1
+            by_status[record["status"]] = by_status.get(record["status"], 0) + 1
+            for name, seconds in record["phases"].items():
+                phase_times.setdefault(name, []).append(seconds)
+
+        phases: dict[str, PhaseSummary] = {}
+        for name in sorted(phase_times, key=lambda n: (n not in PHASES, n)):
+            times = sorted(phase_times[name])
+            phases[name] = PhaseSummary(
+                count=len(times),
+                total_seconds=sum(times),
+                p50_seconds=_quantile(times, 0.5),
+                p95_seconds=_quantile(times, 0.95),
+                max_seconds=times[-1],
+            )
+
+        return TelemetryReport(
+            started_at=self._started_at,
+            finished_at=time.time(),
+            fetches=len(records),
+            by_source=by_source,
+            by_status=by_status,
+            phases=phases,
+            slowest=sorted(records, key=lambda r: r["total_seconds"], reverse=True)[
+                :slowest
+            ],
+            records=records,
+        )
+
+    def write_report(self, path: str | None = None) -> str:
+        """Writes the JSON report and the metrics in Prometheus text format.
+
+        The ``.prom`` file next to the report can be picked up by the node
+        exporter's textfile collector for runs too short to be scraped.
+
+        Args:
+            path: Where to write the JSON report. Defaults to a timestamped
+                file in ``reports_dir``.
+
+        Returns:
+            The path of the JSON report.
+        """
+        if path is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at))
+            path = os.path.join(reports_dir, f"fetch-report-{stamp}.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        write_to_textfile(f"{path.removesuffix('.json')}.prom", self.registry)
+        return path
+
+    def serve(self, port: int, addr: str = "0.0.0.0"):
+        """Serves the metrics for Prometheus to scrape on ``port``."""
+        start_http_server(port, addr=addr, registry=self.registry)
+        print(f"📈 Serving fetch metrics on http://{addr}:{port}/metrics")
+
+
+_default_telemetry: FetchTelemetry | None = None
+
+
+def get_telemetry() -> FetchTelemetry:
+    """Returns the process wide telemetry shared by all scrapers."""
+    global _default_telemetry
+    if _default_telemetry is None:
+        _default_telemetry = FetchTelemetry()
+    return _default_telemetry
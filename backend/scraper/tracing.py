@@ -0,0 +1,291 @@
+"""Spans around fetching, parsing and saving, written as OpenTelemetry JSON.
+
+``scraper.telemetry`` tells how long each page took per phase, but not where
+the time went inside the parse: which extractor of a match page, which
+table, or the save. The scrapers now open spans around those steps:
+
+    with get_tracer().span("league.parse_table", table=name):
+        ...
+
+or decorate them with ``@traced("match.extract_lineup")``. Spans nest
+through a context variable, so the extractors of a page land under its
+``parse`` phase, which lands under the ``scrape`` span ``FetchTelemetry.track``
+opens, and asyncio tasks and ``asyncio.to_thread`` workers keep their parent.
+
+Tracing is off unless a file is given, with the ``SCRAPER_TRACE_FILE``
+environment variable or ``set_trace_file()``; a span then costs one check.
+When on, every finished trace, a root span and everything under it, is
+appended to the file as one line of OTLP/JSON, the format OpenTelemetry's
+file exporter writes and the Collector's ``otlpjsonfile`` receiver reads, so
+the traces can be loaded into Jaeger, Tempo or any OTLP backend. Worker
+processes inherit the variable and append to the same file.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+service_name = "data-derby-scraper"
+
+
+class Span:
+    """A timed step, with the attributes describing it.
+
+    Attributes:
+        name: What the step is, such as ``match.extract_lineup``.
+        trace_id: The id of the trace, shared by a root span and its children.
+        span_id: The id of the span.
+        parent_id: The id of the parent span, None for a root span.
+        start_ns: When the span started, in nanoseconds since the epoch.
+        end_ns: When the span ended, 0 while it runs.
+        attributes: The attributes of the span.
+        error: The error the span ended with, if any.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict[str, Any]):
+        """Initializes and starts the Span."""
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.error: str | None = None
+        self.end_ns = 0
+        self.start_ns = time.time_ns()
+
+    def set_attributes(self, **attributes: Any):
+        """Adds attributes to the span."""
+        self.attributes.update(attributes)
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def _value(value: Any) -> dict[str, Any]:
+    """Encodes an attribute value as an OTLP/JSON ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    """Encodes a finished span as an OTLP/JSON ``Span``."""
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            {"key": key, "value": _value(value)}
+            for key, value in span.attributes.items()
+            if value is not None
+        ],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+class _SpanScope:
+    """Runs a span for the duration of a ``with`` block."""
+
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict[str, Any]):
+        self._tracer = tracer
+        self._span = Span(name, _current.get(), attributes)
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self._span
+        span.end_ns = time.time_ns()
+        if exc_type is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        self._tracer._finish(span)
+        return False
+
+
+class _NoSpan:
+    """Stands in for a span while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Opens spans and appends the finished traces to a file.
+
+    Attributes:
+        path: The OTLP/JSON lines file, None while tracing is off.
+    """
+
+    def __init__(self, path: str | None = None):
+        """Initializes the Tracer.
+
+        Args:
+            path: The file to append the traces to. Tracing is off without it.
+        """
+        self.path = path
+        self._pending: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self.path is not None
+
+    def span(self, name: str, **attributes: Any) -> _SpanScope | _NoSpan:
+        """Returns a context manager running a span, a child of the current one.
+
+        Args:
+            name: What the step is.
+            **attributes: The attributes of the span.
+
+        Returns:
+            The context manager. It yields the ``Span``, or None if tracing
+            is off.
+        """
+        if self.path is None:
+            return _NO_SPAN
+        return _SpanScope(self, name, attributes)
+
+    def annotate(self, **attributes: Any):
+        """Adds attributes to the current span, if there is one."""
+        span = _current.get()
+        if span is not None:
+            span.set_attributes(**attributes)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            trace = self._pending.setdefault(span.trace_id, [])
+            trace.append(span)
+            if span.parent_id is not None:
+                return
+            del self._pending[span.trace_id]
+        self._write(trace)
+
+    def _write(self, spans: list[Span]):
+        path = self.path
+        if path is None or not spans:
+            return
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": service_name},
+                                },
+                                {
+                                    "key": "process.pid",
+                                    "value": {"intValue": str(os.getpid())},
+                                },
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": __name__},
+                                "spans": [_otlp_span(span) for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def flush(self):
+        """Writes the spans of the traces whose root has not finished."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for spans in pending.values():
+            self._write(spans)
+
+
+_default_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """Returns the process wide tracer, writing to ``SCRAPER_TRACE_FILE``."""
+    global _default_tracer
+    if _default_tracer is None:
+        _default_tracer = Tracer(os.environ.get("SCRAPER_TRACE_FILE") or None)
+    return _default_tracer
+
+
+def set_trace_file(path: str | None):
+    """Sets the file traces are appended to, None to turn tracing off."""
+    get_tracer().path = path
+
+
+def traced(name: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Decorates a function, or a coroutine function, to run in a span.
+
+    Args:
+        name: The name of the span.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def _traced_async(*args: P.args, **kwargs: P.kwargs):
+                with get_tracer().span(name):
+                    return await func(*args, **kwargs)
+
+            return _traced_async  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def _traced(*args: P.args, **kwargs: P.kwargs) -> T:
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+
+        return _traced
+
+    return decorator
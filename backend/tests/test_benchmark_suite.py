@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.fixtures import load_pages
+from benchmarks.parser_parity import parse_fixture
+from benchmarks.suite import (
+    DEFAULT_TOLERANCE,
+    CaseResult,
+    dataset_rows,
+    regressions,
+)
+
+baseline_path = os.path.join(
+    os.path.dirname(__file__), "..", "benchmarks", "baseline.json"
+)
+
+
+def _result(seconds: float = 1.0, rows: int = 10, peak_bytes: int = 1000):
+    return CaseResult(
+        kind="parse",
+        seconds=seconds,
+        rows=rows,
+        rows_per_second=rows / seconds,
+        peak_bytes=peak_bytes,
+    )
+
+
+@pytest.mark.parametrize("fixture", load_pages(), ids=lambda fixture: fixture["name"])
+def test_checked_in_pages_parse_to_the_baseline_rows(fixture):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["cases"]
+
+    rows = dataset_rows(parse_fixture(fixture))
+
+    assert rows == baseline[f"parse/{fixture['name']}"]["rows"]
+
+
+def test_regressions_allow_the_tolerance():
+    baseline = {"case": _result()}
+
+    assert regressions({"case": _result(seconds=1.9, peak_bytes=1090)}, baseline) == []
+    assert regressions({"new": _result(seconds=100)}, baseline) == []
+
+
+def test_regressions_report_slowdowns_memory_and_rows():
+    baseline = {"case": _result()}
+
+    found = regressions(
+        {"case": _result(seconds=2.1, rows=9, peak_bytes=2000)}, baseline
+    )
+
+    assert len(found) == 3
+
+
+def test_min_seconds_absorbs_noise_on_fast_cases():
+    baseline = {"case": _result(seconds=0.001)}
+
+    assert regressions({"case": _result(seconds=0.008)}, baseline) == []
+    assert regressions({"case": _result(seconds=0.02)}, baseline)
+
+
+def test_rows_only_ignores_timings():
+    baseline = {"case": _result()}
+    slower = {"case": _result(seconds=10, peak_bytes=10**6)}
+
+    assert regressions(slower, baseline, DEFAULT_TOLERANCE, rows_only=True) == []
+    assert regressions({"case": _result(rows=11)}, baseline, rows_only=True)
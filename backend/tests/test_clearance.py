@@ -0,0 +1,82 @@
+import time
+
+from scraper.clearance import SESSION_CLEARANCE_SECONDS, ClearanceStore
+
+URL = "https://fbref.com/en/comps/9/"
+UA = "Mozilla/5.0 (X11; Linux x86_64) Chrome/124.0"
+
+
+def _cookie(name: str, expires: float = -1) -> dict:
+    return {"name": name, "value": "v", "domain": ".fbref.com", "expires": expires}
+
+
+class _Context:
+    def __init__(self):
+        self.cookies: list[dict] = []
+
+    def add_cookies(self, cookies: list[dict]):
+        self.cookies.extend(cookies)
+
+
+def test_store_keeps_only_clearance_cookies(tmp_path):
+    store = ClearanceStore(str(tmp_path / "cf.json"))
+    cookies = [
+        _cookie("cf_clearance", time.time() + 3600),
+        _cookie("__cf_bm"),
+        _cookie("sessionid"),
+    ]
+
+    assert store._store(URL, cookies, UA)
+
+    clearance = store.get("https://fbref.com/en/matches/1/")
+    assert [c["name"] for c in clearance["cookies"]] == ["cf_clearance", "__cf_bm"]
+    assert clearance["user_agent"] == UA
+    assert store.get("https://example.com/") is None
+
+
+def test_store_ignores_pages_without_a_clearance(tmp_path):
+    store = ClearanceStore(str(tmp_path / "cf.json"))
+
+    assert not store._store(URL, [_cookie("__cf_bm")], UA)
+    assert store.get(URL) is None
+    assert store.user_agent() is None
+
+
+def test_session_cookies_get_the_session_lifetime(tmp_path):
+    store = ClearanceStore(str(tmp_path / "cf.json"))
+
+    store._store(URL, [_cookie("cf_clearance")], UA)
+
+    expires = store.get(URL)["expires"]
+    assert abs(expires - time.time() - SESSION_CLEARANCE_SECONDS) < 5
+
+
+def test_expired_clearances_are_never_handed_out(tmp_path):
+    store = ClearanceStore(str(tmp_path / "cf.json"), expiry_margin=60)
+    store._store(URL, [_cookie("cf_clearance", time.time() + 30)], UA)
+    context = _Context()
+
+    store.inject(context)
+
+    assert store.get(URL) is None
+    assert store.user_agent() is None
+    assert context.cookies == []
+
+
+def test_inject_adds_cookies_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "cf.json")
+    ClearanceStore(path)._store(URL, [_cookie("cf_clearance", time.time() + 3600)], UA)
+    other_process = ClearanceStore(path)
+    context = _Context()
+
+    other_process.inject(context)
+
+    assert [c["name"] for c in context.cookies] == ["cf_clearance"]
+    assert other_process.user_agent() == UA
+
+
+def test_a_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "cf.json"
+    path.write_text("{not json")
+
+    assert ClearanceStore(str(path)).get(URL) is None
@@ -0,0 +1,63 @@
+import asyncio
+
+from patchright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+
+from scraper.clearance import ClearanceStore
+from scraper.cloudflare import ChallengeHandler
+
+
+class _Checkbox:
+    """A checkbox that only takes the click at the ``clickable_after``-th try."""
+
+    def __init__(self, page, clickable_after: int):
+        self.first = self
+        self.page = page
+        self.clickable_after = clickable_after
+        self.clicks = 0
+
+    def locator(self, selector):
+        return self
+
+    async def wait_for(self, state, timeout):
+        pass
+
+    async def click(self, force, timeout):
+        self.clicks += 1
+        if self.clicks < self.clickable_after:
+            raise AsyncPlaywrightTimeoutError("not clickable")
+        self.page.cleared.set()
+
+
+class _Page:
+    def __init__(self, clickable_after: int):
+        self.cleared = asyncio.Event()
+        self.checkbox = _Checkbox(self, clickable_after)
+
+    def frame_locator(self, selector):
+        return self.checkbox
+
+    async def wait_for_selector(self, selector, timeout):
+        try:
+            await asyncio.wait_for(self.cleared.wait(), timeout / 1000)
+        except TimeoutError:
+            raise AsyncPlaywrightTimeoutError("no table") from None
+
+
+def test_the_async_solver_keeps_clicking_an_unclickable_checkbox(tmp_path):
+    handler = ChallengeHandler(
+        solve_timeout=2_000,
+        poll_interval=10,
+        clearance=ClearanceStore(str(tmp_path / "cf.json")),
+    )
+    logged = []
+
+    async def solve():
+        page = _Page(clickable_after=3)
+        await handler._solve_challenge_async(page, logged.append)
+        return page
+
+    page = asyncio.run(solve())
+
+    assert page.checkbox.clicks == 3
+    assert logged.count("Checkbox not clickable yet.") == 2
+    assert handler.stats()["solved"] == 1
@@ -0,0 +1,156 @@
+import math
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from scraper.extraction_plan import (
+    ExtractionPlan,
+    PlanRegistry,
+    coerce_numeric,
+    fingerprint,
+    header_stats,
+    text_rule,
+)
+
+
+def _table(stats: list[str], rows: list[dict[str, str]]) -> BeautifulSoup:
+    head = "".join(f'<th aria-label="{s}" data-stat="{s}">{s}</th>' for s in stats)
+    body = "".join(
+        "<tr>"
+        + "".join(
+            f'<{"th" if i == 0 else "td"} data-stat="{stat}">{value}'
+            f'</{"th" if i == 0 else "td"}>'
+            for i, (stat, value) in enumerate(row.items())
+        )
+        + "</tr>"
+        for row in rows
+    )
+    html = f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+    return BeautifulSoup(html, "html.parser").find("table")
+
+
+def _rule_for(stat: str):
+    return None if stat == "ranker" else text_rule(stat)
+
+
+def test_coerce_numeric_parses_fbref_numbers():
+    columns = {
+        "games": ["1,234", "", math.nan],
+        "xg": ["+0.5", "1.25", ""],
+        "team": ["Arsenal", "Chelsea", ""],
+        "empty": ["", "", math.nan],
+    }
+
+    coerced = coerce_numeric(columns)
+
+    assert str(coerced["games"].dtype) == "Int64"
+    assert list(coerced["games"][:1]) == [1234]
+    assert coerced["games"][1] is pd.NA and coerced["games"][2] is pd.NA
+    assert str(coerced["xg"].dtype) == "Float64"
+    assert list(coerced["xg"][:2]) == [0.5, 1.25]
+    assert coerced["team"] == ["Arsenal", "Chelsea", ""]
+    assert coerced["empty"] == ["", "", columns["empty"][2]]
+
+
+def test_header_stats_and_fingerprint():
+    table = _table(["ranker", "team", "games"], [])
+
+    assert header_stats(table) == ("ranker", "team", "games")
+    assert fingerprint(("team", "games")) != fingerprint(("games", "team"))
+
+
+def test_plan_extracts_typed_rows_and_unknown_stats():
+    table = _table(
+        ["ranker", "team", "games"],
+        [
+            {"ranker": "1", "team": "Arsenal", "games": "38"},
+            {"ranker": "2", "team": "Chelsea", "games": "37", "xg": "1.5"},
+        ],
+    )
+    plan = ExtractionPlan(header_stats(table), _rule_for)
+
+    frame, unknown = plan.extract(table)
+
+    assert plan.columns == ("team", "games")
+    assert list(frame.columns) == ["team", "games"]
+    assert frame["team"].tolist() == ["Arsenal", "Chelsea"]
+    assert str(frame["games"].dtype) == "Int64"
+    assert frame["games"].tolist() == [38, 37]
+    assert unknown == {"xg"}
+
+
+def test_plan_skips_header_rows_in_the_body():
+    table = _table(["team", "games"], [{"team": "Arsenal", "games": "38"}])
+    table.find("tbody").append(
+        BeautifulSoup('<tr><th data-stat="team">Squad</th></tr>', "html.parser").tr
+    )
+
+    frame, _ = ExtractionPlan(header_stats(table), _rule_for).extract(table)
+
+    assert frame["team"].tolist() == ["Arsenal"]
+
+
+def test_plan_iter_batches_keeps_every_column():
+    table = _table(
+        ["team", "games"],
+        [{"team": f"Team {i}", "games": str(i)} for i in range(5)],
+    )
+    plan = ExtractionPlan(header_stats(table), _rule_for)
+
+    batches = list(plan.iter_batches(table, size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(list(batch.columns) == ["team", "games"] for batch in batches)
+
+
+def test_plan_iter_batches_types_a_column_alike_in_every_batch():
+    table = _table(
+        ["team", "games", "xg", "notes"],
+        [
+            {"team": "Arsenal", "games": "17", "xg": "", "notes": "1"},
+            {"team": "Chelsea", "games": "17.5", "xg": "", "notes": "x"},
+            {"team": "Everton", "games": "", "xg": "", "notes": "2"},
+        ],
+    )
+    plan = ExtractionPlan(header_stats(table), _rule_for)
+
+    batches = list(plan.iter_batches(table, size=1))
+
+    assert [str(batch["games"].dtype) for batch in batches] == ["Float64"] * 3
+    assert [batch["notes"].tolist() for batch in batches] == [["1"], ["x"], ["2"]]
+    assert pd.concat(batches, ignore_index=True).equals(plan.extract(table)[0])
+
+
+def test_registry_caches_plans_per_layout_and_header():
+    registry = PlanRegistry()
+    stats = ("team", "games")
+
+    plan = registry.plan("stats", "league", stats, _rule_for)
+
+    assert registry.plan("stats", "league", stats, _rule_for) is plan
+    assert registry.plan("stats", "players", stats, _rule_for) is not plan
+    assert registry.drift == []
+
+
+def test_registry_reports_header_drift():
+    registry = PlanRegistry()
+    registry.plan("stats", "league", ("team", "games"), _rule_for)
+
+    registry.plan("stats", "league", ("team", "games", "xg"), _rule_for)
+
+    (drift,) = registry.drift
+    assert drift["kind"] == "header"
+    assert drift["added"] == ["xg"]
+    assert drift["removed"] == []
+
+
+def test_registry_reports_rows_drift():
+    registry = PlanRegistry()
+    table = _table(["team"], [{"team": "Arsenal", "games": "38"}])
+
+    frame = registry.extract(table, "stats", "league", _rule_for)
+
+    assert list(frame.columns) == ["team"]
+    (drift,) = registry.drift
+    assert drift["kind"] == "rows"
+    assert drift["added"] == ["games"]
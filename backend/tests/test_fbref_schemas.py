@@ -0,0 +1,88 @@
+import math
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from pipeline.fbref_schemas import (
+    ResultsOverallSchema,
+    parse_float_signed,
+    parse_int_positive,
+    parse_int_signed,
+    parse_last5,
+)
+
+
+def _record(**overrides) -> dict:
+    """A results row as the typed league frame hands it over."""
+    frame = pd.DataFrame(
+        {
+            "id": [""],
+            "competition_id": [9],
+            "season_id": ["2024-2025"],
+            "rank": pd.array([1], dtype="Int64"),
+            "team_id": ["18bb7c10"],
+            "team_url": ["/en/squads/18bb7c10/Arsenal-Stats"],
+            "team": ["Arsenal"],
+            "logo_url": [None],
+            "games": pd.array([38], dtype="Int64"),
+            "wins": pd.array([26], dtype="Int64"),
+            "ties": pd.array([6], dtype="Int64"),
+            "losses": pd.array([6], dtype="Int64"),
+            "goals_for": pd.array([91], dtype="Int64"),
+            "goals_against": pd.array([29], dtype="Int64"),
+            "goal_diff": pd.array([62], dtype="Int64"),
+            "points": pd.array([84], dtype="Int64"),
+            "points_avg": pd.array([2.21], dtype="Float64"),
+            "xg_for": pd.array([76.2], dtype="Float64"),
+            "xg_against": pd.array([28.5], dtype="Float64"),
+            "xg_diff": pd.array([47.7], dtype="Float64"),
+            "xg_diff_per90": pd.array([1.26], dtype="Float64"),
+            "last_5": ["WWDLW"],
+            "attendance_per_g": pd.array([60236], dtype="Int64"),
+            "top_team_scorers": ["Bukayo Saka - 16"],
+            "top_keeper": ["David Raya"],
+            "notes": [None],
+        }
+    )
+    (record,) = frame.to_dict(orient="records")
+    return {**record, **overrides}
+
+
+def test_a_typed_record_validates():
+    row = ResultsOverallSchema(**_record())
+
+    assert row.id
+    assert row.attendance_per_g == 60236
+    assert row.last_5 == "W W D L W"
+
+
+def test_a_null_optional_cell_becomes_none():
+    row = ResultsOverallSchema(**_record(attendance_per_g=pd.NA, id=pd.NA))
+
+    assert row.attendance_per_g is None
+    assert row.id
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("xg_for", math.nan), ("xg_for", pd.NA), ("goal_diff", pd.NA), ("last_5", pd.NA)],
+)
+def test_a_null_required_cell_fails_validation(field, value):
+    with pytest.raises(ValidationError):
+        ResultsOverallSchema(**_record(**{field: value}))
+
+
+@pytest.mark.parametrize(
+    "parse", [parse_int_positive, parse_int_signed, parse_float_signed, parse_last5]
+)
+@pytest.mark.parametrize("value", [None, pd.NA, math.nan])
+def test_parse_helpers_reject_missing_values(parse, value):
+    with pytest.raises(ValueError):
+        parse(value)
+
+
+def test_parse_helpers_read_fbref_text():
+    assert parse_int_positive("1,234") == 1234
+    assert parse_int_signed("-3") == -3
+    assert parse_float_signed("+0.5") == 0.5
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from scraper import fetch_engine
+from scraper.clearance import ClearanceStore
+from scraper.fetch_engine import AsyncFetchEngine
+from scraper.http_fetch import HttpFetcher
+from scraper.rate_limit import HostRateLimiter
+
+
+class _Context:
+    async def close(self):
+        pass
+
+
+class _Driver:
+    def __init__(self):
+        self.chromium = self
+        self.stopped = False
+
+    async def launch_persistent_context(self, **kwargs):
+        return _Context()
+
+    async def stop(self):
+        self.stopped = True
+
+
+class _Blocker:
+    async def install_async(self, context):
+        pass
+
+
+class _Strategy:
+    def __init__(self, http):
+        self.http = http
+
+
+@pytest.fixture
+def drivers(tmp_path, monkeypatch):
+    started = []
+
+    class _AsyncPlaywright:
+        async def start(self):
+            started.append(_Driver())
+            return started[-1]
+
+    monkeypatch.setattr(fetch_engine, "async_playwright", _AsyncPlaywright)
+    monkeypatch.setattr(fetch_engine, "free_profile_dir", lambda path: path)
+    monkeypatch.setattr(fetch_engine, "release_profile_dir", lambda path: None)
+    monkeypatch.setattr(
+        fetch_engine,
+        "get_clearance_store",
+        lambda: ClearanceStore(str(tmp_path / "cf.json")),
+    )
+    return started
+
+
+@pytest.fixture
+def http(tmp_path):
+    return HttpFetcher(
+        HostRateLimiter(), clearance=ClearanceStore(str(tmp_path / "cf.json"))
+    )
+
+
+def test_recycling_reuses_the_playwright_driver(drivers, http):
+    engine = AsyncFetchEngine(
+        rate_limiter=HostRateLimiter(), strategy=_Strategy(http), blocker=_Blocker()
+    )
+
+    engine.run(engine.start())
+    engine.recycle()
+    engine.run(engine.start())
+    engine.shutdown()
+
+    assert len(drivers) == 1
+    assert drivers[0].stopped
+
+
+def test_closing_the_engine_leaves_the_strategy_client_open(drivers, http):
+    engine = AsyncFetchEngine(
+        rate_limiter=HostRateLimiter(), strategy=_Strategy(http), blocker=_Blocker()
+    )
+
+    async def use_client():
+        await engine.start()
+        return http.async_client
+
+    client = engine.run(use_client())
+    engine.shutdown()
+
+    assert not client.is_closed
+
+
+def test_the_async_client_follows_the_event_loop(http):
+    async def get_client():
+        return http.async_client, http.async_client
+
+    first, same = asyncio.run(get_client())
+    second, _ = asyncio.run(get_client())
+
+    assert first is same
+    assert second is not first
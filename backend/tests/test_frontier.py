@@ -0,0 +1,131 @@
+import pytest
+
+from scraper.frontier import DONE, FAILED, IN_PROGRESS, PENDING, CrawlFrontier
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"), max_attempts=2)
+    yield frontier
+    frontier.close()
+
+
+def test_enqueue_stores_every_url_once(frontier):
+    assert frontier.enqueue("https://fbref.com/a", "league", "EPL", "2024-2025")
+    assert not frontier.enqueue("https://fbref.com/a", "league", "EPL", "2024-2025")
+
+    (entry,) = frontier.entries()
+    assert entry["url"] == "https://fbref.com/a"
+    assert entry["status"] == PENDING
+    assert entry["params"] == {}
+
+
+def test_enqueue_raises_the_priority_of_a_pending_page(frontier):
+    frontier.enqueue("https://fbref.com/a", "match", priority=0)
+    frontier.enqueue("https://fbref.com/a", "match", priority=5)
+    frontier.enqueue("https://fbref.com/a", "match", priority=1)
+
+    assert frontier.get("https://fbref.com/a")["priority"] == 5
+
+
+def test_claim_takes_the_highest_priority_first_then_the_oldest(frontier):
+    frontier.enqueue("https://fbref.com/match", "match", priority=0)
+    frontier.enqueue("https://fbref.com/league-1", "league", priority=10)
+    frontier.enqueue("https://fbref.com/league-2", "league", priority=10)
+
+    claimed = [frontier.claim()["url"] for _ in range(3)]
+
+    assert claimed == [
+        "https://fbref.com/league-1",
+        "https://fbref.com/league-2",
+        "https://fbref.com/match",
+    ]
+    assert frontier.claim() is None
+
+
+def test_claim_filters_by_kind_and_leases_the_page(frontier):
+    frontier.enqueue("https://fbref.com/league", "league", priority=10)
+    frontier.enqueue("https://fbref.com/match", "match", params={"fbref_id": "x"})
+
+    entry = frontier.claim(kinds=("match",))
+
+    assert entry["url"] == "https://fbref.com/match"
+    assert entry["status"] == IN_PROGRESS
+    assert entry["attempts"] == 1
+    assert entry["params"] == {"fbref_id": "x"}
+    assert frontier.get(entry["url"])["status"] == IN_PROGRESS
+    assert frontier.claim(kinds=("match",)) is None
+
+
+def test_complete_marks_the_page_done_and_enqueue_skips_it(frontier):
+    frontier.enqueue("https://fbref.com/a", "league")
+    frontier.complete(frontier.claim()["url"])
+
+    assert frontier.get("https://fbref.com/a")["status"] == DONE
+    assert frontier.get("https://fbref.com/a")["last_fetched"] is not None
+    assert not frontier.enqueue("https://fbref.com/a", "league")
+    assert frontier.enqueue("https://fbref.com/a", "league", force=True)
+    assert frontier.get("https://fbref.com/a")["status"] == PENDING
+
+
+def test_fail_requeues_until_attempts_run_out(frontier):
+    frontier.enqueue("https://fbref.com/a", "league")
+
+    frontier.fail(frontier.claim()["url"], "timeout")
+    assert frontier.get("https://fbref.com/a")["status"] == PENDING
+
+    frontier.fail(frontier.claim()["url"], "timeout again")
+    entry = frontier.get("https://fbref.com/a")
+    assert entry["status"] == FAILED
+    assert entry["error"] == "timeout again"
+    assert frontier.claim() is None
+
+    assert frontier.requeue_failed() == 1
+    assert frontier.claim()["attempts"] == 1
+
+
+def test_an_expired_lease_is_claimed_again(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"), lease_seconds=-1)
+    frontier.enqueue("https://fbref.com/a", "league")
+
+    frontier.claim()
+    entry = frontier.claim()
+
+    assert entry["url"] == "https://fbref.com/a"
+    assert entry["attempts"] == 2
+    frontier.close()
+
+
+def test_an_expired_lease_on_the_last_attempt_fails_the_page(tmp_path):
+    frontier = CrawlFrontier(
+        str(tmp_path / "frontier.sqlite"), lease_seconds=-1, max_attempts=2
+    )
+    frontier.enqueue("https://fbref.com/a", "league")
+
+    frontier.claim()
+    frontier.claim()
+
+    assert frontier.claim() is None
+    entry = frontier.get("https://fbref.com/a")
+    assert entry["status"] == FAILED
+    assert entry["attempts"] == 2
+    assert entry["error"] == "Lease expired on the last attempt"
+    frontier.close()
+
+
+def test_counts_and_resume_from_the_database(tmp_path):
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier(path)
+    for name in "abc":
+        frontier.enqueue(f"https://fbref.com/{name}", "league")
+    frontier.complete(frontier.claim()["url"])
+    frontier.claim()
+    frontier.close()
+
+    resumed = CrawlFrontier(path)
+
+    assert resumed.counts() == {PENDING: 1, IN_PROGRESS: 1, DONE: 1, FAILED: 0}
+    assert [e["url"] for e in resumed.entries(statuses=(PENDING,))] == [
+        "https://fbref.com/c"
+    ]
+    resumed.close()
@@ -0,0 +1,172 @@
+import os
+import time
+
+import pytest
+
+from scraper import html_cache
+from scraper.html_cache import CacheMissError, HtmlCache, get_html_cache
+
+URL = "https://fbref.com/en/comps/9/Premier-League-Stats"
+
+
+def _page(n: int) -> str:
+    # Random-looking content, so the compressed bodies have a known size.
+    return f"<table>{os.urandom(500).hex()}</table><p>{n}</p>"
+
+
+def _old_snapshot(root):
+    # A cache that never expires anything, so the first write keeps it.
+    cache = HtmlCache(str(root), ttl_seconds=float("inf"))
+    cache.put(URL, "<table>old</table>", fetched_at=1.0)
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+
+    cache.put(URL, "<table>é</table>", fetched_at=time.time() - 10)
+    cache.put(URL, "<table>new</table>")
+
+    assert cache.get(URL) == "<table>new</table>"
+    assert cache.get(URL, max_age=60) == "<table>new</table>"
+    assert len(cache.history(URL)) == 2
+    assert cache.get("https://fbref.com/missing") is None
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+
+    first = cache.put(URL, "<table></table>", fetched_at=time.time() - 10)
+    second = cache.put(URL + "?again", "<table></table>")
+
+    assert first == second
+    assert cache.stats()["snapshots"] == 2
+    assert cache.stats()["blobs"] == 1
+
+
+def test_lookup_serves_fresh_snapshots_and_counts(tmp_path):
+    cache = HtmlCache(str(tmp_path), fresh_seconds=60)
+    cache.put(URL, "<table>old</table>", fetched_at=time.time() - 3600)
+
+    assert cache.lookup(URL) is None
+    cache.put(URL, "<table>fresh</table>")
+    assert cache.lookup(URL) == "<table>fresh</table>"
+
+    cache.invalidate(URL)
+    assert cache.lookup(URL) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_offline_serves_any_age_and_raises_on_a_miss(tmp_path):
+    _old_snapshot(tmp_path)
+    cache = HtmlCache(str(tmp_path), offline=True)
+
+    assert cache.get_or_fetch(URL, lambda: "unused") == "<table>old</table>"
+    with pytest.raises(CacheMissError):
+        cache.get_or_fetch("https://fbref.com/missing", lambda: "unused")
+
+
+def test_get_or_fetch_stores_what_it_fetched(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+
+    assert cache.get_or_fetch(URL, lambda: "<table>live</table>") == (
+        "<table>live</table>"
+    )
+    assert cache.get_or_fetch(URL, lambda: "unused") == "<table>live</table>"
+
+
+def test_evict_drops_expired_snapshots_and_their_bodies(tmp_path):
+    cache = HtmlCache(str(tmp_path), ttl_seconds=60)
+    cache.put(URL, "<table>expired</table>", fetched_at=time.time() - 3600)
+    cache.put(URL + "?2", "<table>kept</table>")
+
+    cache.evict()
+
+    assert cache.get(URL) is None
+    assert cache.get(URL + "?2") == "<table>kept</table>"
+    assert cache.stats()["blobs"] == 1
+    blobs = [f for _, _, files in os.walk(tmp_path / "blobs") for f in files]
+    assert len(blobs) == 1
+
+
+def test_evict_drops_the_oldest_snapshots_above_max_bytes(tmp_path):
+    cache = HtmlCache(str(tmp_path), max_bytes=3000)
+    now = time.time()
+    for n in range(10):
+        cache.put(f"{URL}?{n}", _page(n), fetched_at=now - 100 + n)
+
+    cache.evict()
+
+    stats = cache.stats()
+    assert 0 < stats["compressed_bytes"] <= 3000
+    assert cache.get(f"{URL}?9") is not None
+    assert cache.get(f"{URL}?0") is None
+    assert stats["snapshots"] == stats["blobs"]
+
+
+def test_eviction_runs_on_a_byte_threshold_not_on_every_write(tmp_path):
+    cache = HtmlCache(str(tmp_path), max_bytes=1, evict_every_bytes=10**9)
+    cache.evict()
+
+    for n in range(5):
+        cache.put(f"{URL}?{n}", _page(n))
+    assert cache.stats()["snapshots"] == 5
+
+    cache.evict_every_bytes = 1
+    cache.put(f"{URL}?5", _page(5))
+    assert cache.stats()["snapshots"] == 0
+
+
+def test_the_first_write_evicts_and_reads_never_do(tmp_path):
+    _old_snapshot(tmp_path)
+
+    assert HtmlCache(str(tmp_path), ttl_seconds=60).get(URL) is not None
+    cache = HtmlCache(str(tmp_path), ttl_seconds=60)
+    cache.put(URL + "?2", "<table>new</table>")
+    assert cache.get(URL) is None
+
+
+def test_going_offline_after_opening_keeps_expired_snapshots(tmp_path, monkeypatch):
+    _old_snapshot(tmp_path / "html_cache")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(html_cache, "_default_cache", None)
+
+    cache = get_html_cache()
+    cache.offline = True
+
+    assert cache.lookup(URL) == "<table>old</table>"
+
+
+def test_pages_are_indexed_by_digest(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+
+    plan = cache._db.execute(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM pages WHERE digest = ?", ("x",)
+    ).fetchall()
+
+    assert any("ix_pages_digest" in row[-1] for row in plan)
+
+
+class _RacingCompressor:
+    """Lets another process store the same body while this one compresses."""
+
+    def __init__(self, compressor, race):
+        self._compressor = compressor
+        self._race = race
+
+    def compress(self, raw: bytes) -> bytes:
+        self._race()
+        return self._compressor.compress(raw)
+
+
+def test_two_processes_storing_the_same_body_do_not_conflict(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    other = HtmlCache(str(tmp_path))
+    cache._compressor = _RacingCompressor(
+        cache._compressor, lambda: other.put(URL + "?other", "<table></table>")
+    )
+
+    cache.put(URL, "<table></table>")
+
+    assert cache.get(URL) == "<table></table>"
+    assert cache.stats()["blobs"] == 1
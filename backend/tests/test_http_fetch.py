@@ -0,0 +1,84 @@
+import httpx
+import pytest
+
+from scraper.clearance import ClearanceStore
+from scraper.fetch_strategy import _is_client_error
+from scraper.http_fetch import (
+    HttpFetcher,
+    NoTablesError,
+    is_challenge_page,
+    uncomment_tables,
+)
+from scraper.rate_limit import HostRateLimiter, RateLimitedError
+
+URL = "https://fbref.com/en/comps/9/Premier-League-Stats"
+
+CHALLENGE = "<html><head><title>Just a moment...</title></head></html>"
+# Ordinary pages carry Cloudflare's injected script too.
+PAGE = (
+    '<script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js"></script>'
+    '<table id="results"></table>'
+)
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return HttpFetcher(
+        HostRateLimiter(), clearance=ClearanceStore(str(tmp_path / "cf.json"))
+    )
+
+
+def _response(status: int, text: str, **headers) -> httpx.Response:
+    return httpx.Response(
+        status, text=text, headers=headers, request=httpx.Request("GET", URL)
+    )
+
+
+@pytest.mark.parametrize(
+    "status, html, challenged",
+    [
+        (403, CHALLENGE, True),
+        (503, '<div id="cf-chl-widget"></div>', True),
+        (200, CHALLENGE, False),
+        (403, PAGE, False),
+        (404, CHALLENGE, False),
+    ],
+)
+def test_is_challenge_page(status, html, challenged):
+    assert is_challenge_page(status, html) is challenged
+
+
+def test_uncomment_tables_only_unwraps_tables():
+    html = "<!-- <table id='a'></table> --><!-- a note -->"
+
+    assert uncomment_tables(html) == " <table id='a'></table> <!-- a note -->"
+
+
+def test_handle_response_returns_the_uncommented_page(fetcher):
+    html = fetcher._handle_response(URL, _response(200, PAGE + "<!--<table/>-->"))
+
+    assert html == PAGE + "<table/>"
+
+
+def test_handle_response_reports_a_challenge(fetcher):
+    assert fetcher._handle_response(URL, _response(403, CHALLENGE)) is None
+
+
+def test_handle_response_raises_on_a_page_without_tables(fetcher):
+    with pytest.raises(NoTablesError):
+        fetcher._handle_response(URL, _response(200, "<p>Maintenance</p>"))
+
+
+def test_handle_response_raises_on_429(fetcher):
+    with pytest.raises(RateLimitedError):
+        fetcher._handle_response(URL, _response(429, "", **{"retry-after": "1"}))
+
+
+@pytest.mark.parametrize(
+    "status, client_error", [(404, True), (403, False), (503, False), (500, False)]
+)
+def test_only_client_errors_skip_the_browser(fetcher, status, client_error):
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        fetcher._handle_response(URL, _response(status, PAGE))
+
+    assert _is_client_error(raised.value) is client_error
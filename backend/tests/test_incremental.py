@@ -0,0 +1,106 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from scraper import incremental
+from scraper.html_cache import HtmlCache
+from scraper.incremental import IncrementalRefresher
+
+LEAGUE = "Premier-League"
+SEASON = "2024-2025"
+NOW = 1_750_000_000.0
+
+PLAYED = {
+    "match_week": "1",
+    "schedule_epoch": str(int(NOW) - 7 * 24 * 3600),
+    "score": "1–0",
+    "match_link": "/en/matches/cc5b4244/Manchester-United-Fulham-August-16-2024-Premier-League",
+    "home_team_link": "/en/squads/19538871/2024-2025/Manchester-United-Stats",
+    "away_team_link": "/en/squads/fd962109/2024-2025/Fulham-Stats",
+}
+
+
+class _ScheduleScraper:
+    fetches = 0
+
+    def __init__(self, league_name, fbref_id, season_year):
+        self.base_url = f"https://fbref.com/en/comps/{fbref_id}/schedule/"
+        self.dataset = []
+
+    def scrape(self):
+        _ScheduleScraper.fetches += 1
+        self.dataset = [PLAYED]
+
+    def save_to_csv(self):
+        pass
+
+
+@pytest.fixture
+def refresher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _ScheduleScraper.fetches = 0
+    monkeypatch.setattr(
+        incremental, "FBRefCompetitionScheduleScraper", _ScheduleScraper
+    )
+    monkeypatch.setattr(
+        IncrementalRefresher, "_refresh_tables", lambda self, *args: None
+    )
+    os.makedirs(os.path.join("scraped_data", LEAGUE))
+    pd.DataFrame([PLAYED]).to_csv(
+        os.path.join("scraped_data", LEAGUE, f"schedule-{LEAGUE}-{SEASON}.csv"),
+        index=False,
+    )
+    return IncrementalRefresher(
+        state_path=str(tmp_path / "state.json"),
+        cache=HtmlCache(str(tmp_path / "cache")),
+        engine=object(),
+    )
+
+
+def _state(refresher):
+    if not os.path.exists(refresher.state_path):
+        return {}
+    with open(refresher.state_path) as f:
+        return json.load(f)
+
+
+def test_failed_matches_are_retried_without_advancing(refresher, monkeypatch):
+    monkeypatch.setattr(
+        incremental,
+        "scrape_matches",
+        lambda matches, engine: {"cc5b4244": RuntimeError("boom")},
+    )
+
+    summary = refresher.refresh(LEAGUE, 9, SEASON, now=NOW)
+
+    assert summary["matches_failed"] == 1
+    assert not summary["tables_refreshed"]
+    assert _state(refresher) == {}
+
+    monkeypatch.setattr(incremental, "scrape_matches", lambda matches, engine: {})
+
+    summary = refresher.refresh(LEAGUE, 9, SEASON, now=NOW)
+
+    assert _ScheduleScraper.fetches == 2
+    assert summary["matches_scraped"] == 1
+    assert summary["tables_refreshed"]
+    assert _state(refresher)[f"{LEAGUE}/{SEASON}"]["matchweek"] == 1
+
+
+def test_nothing_is_fetched_once_every_match_is_saved(refresher, monkeypatch):
+    monkeypatch.setattr(incremental, "scrape_matches", lambda matches, engine: {})
+    refresher.refresh(LEAGUE, 9, SEASON, now=NOW)
+    os.makedirs(os.path.join("scraped_data", "matches"))
+    open(
+        os.path.join(
+            "scraped_data", "matches", "Manchester-United-Fulham-cc5b4244.json"
+        ),
+        "w",
+    ).close()
+
+    summary = refresher.refresh(LEAGUE, 9, SEASON, now=NOW)
+
+    assert _ScheduleScraper.fetches == 1
+    assert not summary["schedule_fetched"]
@@ -0,0 +1,63 @@
+from bs4 import BeautifulSoup
+
+from scraper.page_index import PageIndex
+
+PAGE = """
+<html><body>
+<div id="a" class="lineup">Home lineup</div>
+<span id="a">A span with the same id</span>
+<div id="b" class="lineup">Away lineup</div>
+<div class="event a">Goal</div>
+<div class="event b">Card</div>
+<div class="event">Substitution</div>
+<table id="stats_home"><tr><td>Home</td></tr></table>
+<!-- <table id="keeper_stats_home"><tr><td>Keeper</td></tr></table> -->
+</body></html>
+"""
+
+
+def _index() -> PageIndex:
+    return PageIndex(BeautifulSoup(PAGE, "html.parser"))
+
+
+def test_by_id_returns_the_first_match():
+    assert _index().by_id("a").get_text() == "Home lineup"
+
+
+def test_by_id_filters_by_name_and_class():
+    index = _index()
+
+    assert index.by_id("a", name="span").get_text() == "A span with the same id"
+    assert index.by_id("b", class_="lineup").get_text() == "Away lineup"
+    assert index.by_id("b", class_="event") is None
+    assert index.by_id("missing") is None
+
+
+def test_by_class_matches_like_find_all():
+    index = _index()
+
+    for class_ in ("event", "event a", "lineup", "a"):
+        expected = index.soup.find_all(class_=class_)
+        assert index.by_class(class_) == expected, class_
+
+
+def test_by_class_filters_by_name():
+    assert [tag.get_text() for tag in _index().by_class("lineup", name="div")] == [
+        "Home lineup",
+        "Away lineup",
+    ]
+
+
+def test_first_by_class():
+    index = _index()
+
+    assert index.first_by_class("event").get_text() == "Goal"
+    assert index.first_by_class("missing") is None
+
+
+def test_table_is_found_in_the_page_and_in_comments():
+    index = _index()
+
+    assert index.table("stats_home").get_text() == "Home"
+    assert index.table("keeper_stats_home").get_text() == "Keeper"
+    assert index.table("stats_away") is None
@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.fixtures import as_raw, load_pages
+from benchmarks.parser_parity import first_difference, normalize, parse_fixture
+from scraper import html_parser
+from scraper.html_parser import PARSER_BACKENDS
+
+PAGES = load_pages()
+
+
+def _variants():
+    for fixture in PAGES:
+        yield pytest.param(fixture, id=fixture["name"])
+        # The schedule is served as it is rendered, see as_raw.
+        if fixture["kind"] != "schedule":
+            yield pytest.param(as_raw(fixture), id=f"{fixture['name']}-raw")
+
+
+def _parse(fixture, backend, monkeypatch):
+    monkeypatch.setattr(html_parser, "_backend", backend)
+    return normalize(parse_fixture(fixture))
+
+
+@pytest.fixture(scope="module")
+def expected():
+    """The html.parser datasets of the rendered pages, by page name."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        return {
+            fixture["name"]: _parse(fixture, "html.parser", monkeypatch)
+            for fixture in PAGES
+        }
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("fixture", _variants())
+def test_every_backend_parses_like_html_parser(fixture, backend, expected, monkeypatch):
+    name = fixture["name"].removesuffix("-raw")
+
+    actual = _parse(fixture, backend, monkeypatch)
+
+    assert first_difference(expected[name], actual) is None
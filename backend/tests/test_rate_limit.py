@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from scraper.rate_limit import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    HostRateLimiter,
+    RateLimitedError,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 5 ") == 5.0
+
+
+def test_parse_retry_after_http_date():
+    later = datetime.now(timezone.utc) + timedelta(seconds=90)
+
+    assert 80 < parse_retry_after(format_datetime(later, usegmt=True)) <= 90
+
+
+def test_parse_retry_after_date_in_the_past():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "-5"])
+def test_parse_retry_after_falls_back_to_the_default(value):
+    assert parse_retry_after(value) == DEFAULT_RETRY_AFTER_SECONDS
+
+
+def test_token_bucket_allows_its_burst_then_waits():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert 0.9 < bucket._reserve() <= 1.0
+
+
+def test_token_bucket_pause_then_allows_a_single_request():
+    bucket = TokenBucket(rate=1000.0, capacity=5)
+
+    bucket.pause(30)
+
+    assert 29 < bucket._reserve() <= 30
+
+
+def test_host_rate_limiter_keeps_a_bucket_per_host():
+    limiter = HostRateLimiter(requests_per_minute=60, burst=3)
+    limiter.configure("slow.example", requests_per_minute=6)
+
+    fbref = limiter.bucket("https://fbref.com/en/comps/9/")
+
+    assert fbref is limiter.bucket("https://fbref.com/en/matches/1/")
+    assert fbref is not limiter.bucket("https://example.com/")
+    assert (fbref.rate, fbref.capacity) == (1.0, 3)
+    assert limiter.bucket("https://slow.example/").rate == 0.1
+
+
+def test_check_response_pauses_the_host_and_raises_on_429():
+    limiter = HostRateLimiter()
+    url = "https://fbref.com/en/comps/9/"
+
+    limiter.check_response(url, 200, None)
+    with pytest.raises(RateLimitedError) as raised:
+        limiter.check_response(url, 429, "30")
+
+    assert raised.value.retry_after == 30.0
+    assert 29 < limiter.bucket(url)._reserve() <= 30
+    assert limiter.bucket("https://example.com/")._reserve() == 0.0
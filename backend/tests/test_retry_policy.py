@@ -0,0 +1,174 @@
+import httpx
+import pytest
+from patchright.sync_api import Error as PlaywrightError
+from patchright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from scraper import retry_policy
+from scraper.html_cache import CacheMissError
+from scraper.rate_limit import RateLimitedError
+from scraper.retry_policy import (
+    CategoryFetchError,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    classify,
+    retry_fetch,
+    retry_scrape,
+)
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    """A fresh process wide policy, and retries that do not sleep."""
+    policy = RetryPolicy(budget=3)
+    monkeypatch.setattr(retry_policy, "_default_policy", policy)
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    return policy
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (RateLimitedError("https://fbref.com/", 5), "fetch"),
+        (PlaywrightTimeoutError("timeout"), "fetch"),
+        (httpx.ConnectError("refused"), "fetch"),
+        (TimeoutError(), "fetch"),
+        (PlaywrightError("Target closed"), "browser"),
+        (CategoryFetchError(["keeper"]), "browser"),
+        (CircuitOpenError("fbref.com", 10), "fatal"),
+        (CacheMissError("missing"), "fatal"),
+        (KeyError("team"), "parse"),
+    ],
+)
+def test_classify(error, kind):
+    assert classify(error) == kind
+
+
+def test_record_counts_an_error_once():
+    policy = RetryPolicy()
+    error = TimeoutError()
+
+    assert policy.record(error) == "fetch"
+    assert policy.record(error) == "fetch"
+    assert policy.record(KeyError()) == "parse"
+
+    assert policy.stats()["errors"] == {"fetch": 1, "parse": 1}
+
+
+def test_should_retry_charges_the_budget_once_per_attempt():
+    policy = RetryPolicy(budget=5)
+    error = TimeoutError()
+
+    assert policy.should_retry(error, "fetch")
+    assert not policy.should_retry(error, "fetch")
+    assert not policy.should_retry(KeyError(), "fetch")
+    assert not policy.should_retry(TimeoutError(), "fetch", last_attempt=True)
+
+    assert policy.stats()["retries"] == 1
+
+
+def test_should_retry_stops_when_the_budget_is_spent():
+    policy = RetryPolicy(budget=1)
+
+    assert policy.should_retry(TimeoutError(), "fetch")
+    assert not policy.should_retry(TimeoutError(), "fetch")
+
+    assert policy.stats()["exhausted"] == 1
+
+
+def test_reset_refills_the_budget_and_keeps_the_breaker():
+    policy = RetryPolicy(budget=1, breaker=CircuitBreaker(failure_threshold=1))
+    policy.should_retry(TimeoutError(), "fetch")
+    policy.breaker.record_failure("https://fbref.com/")
+
+    policy.reset()
+
+    stats = policy.stats()
+    assert (stats["retries"], stats["exhausted"], stats["errors"]) == (0, 0, {})
+    assert stats["open_circuits"] == ["fbref.com"]
+    assert policy.should_retry(TimeoutError(), "fetch")
+
+
+def test_circuit_breaker_opens_at_the_threshold_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    url = "https://fbref.com/en/comps/9/"
+
+    breaker.record_failure(url)
+    breaker.check(url)
+    breaker.record_failure(url)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(url)
+    breaker.check("https://example.com/")
+
+    assert breaker.open_circuits() == ["fbref.com"]
+    breaker.reset_seconds = 0
+    breaker.check(url)
+    assert breaker.open_circuits() == []
+
+
+def test_circuit_breaker_success_closes_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=2)
+    url = "https://fbref.com/"
+
+    breaker.record_failure(url)
+    breaker.record_success(url)
+    breaker.record_failure(url)
+
+    breaker.check(url)
+
+
+def test_retry_fetch_retries_fetch_errors_within_the_budget(policy):
+    calls = []
+
+    @retry_fetch(max_attempts=3)
+    def fetch():
+        calls.append(1)
+        if len(calls) < 3:
+            raise httpx.ConnectError("refused")
+        return "<table></table>"
+
+    assert fetch() == "<table></table>"
+    assert len(calls) == 3
+    assert policy.stats()["retries"] == 2
+
+
+def test_retry_fetch_does_not_retry_parse_errors(policy):
+    calls = []
+
+    @retry_fetch()
+    def fetch():
+        calls.append(1)
+        raise KeyError("team")
+
+    with pytest.raises(KeyError):
+        fetch()
+    assert len(calls) == 1
+
+
+def test_a_fetch_error_is_not_retried_again_by_retry_scrape(policy):
+    calls = []
+
+    @retry_scrape()
+    @retry_fetch(max_attempts=2)
+    def scrape():
+        calls.append(1)
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        scrape()
+    assert len(calls) == 2
+    assert policy.stats()["retries"] == 1
+    assert policy.stats()["errors"] == {"fetch": 2}
+
+
+def test_retry_scrape_retries_browser_errors(policy):
+    calls = []
+
+    @retry_scrape(max_attempts=3, before_sleep=lambda _: calls.append("recycle"))
+    def scrape():
+        calls.append("scrape")
+        if calls.count("scrape") < 2:
+            raise PlaywrightError("Target closed")
+
+    scrape()
+    assert calls == ["scrape", "recycle", "scrape"]
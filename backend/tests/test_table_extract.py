@@ -0,0 +1,131 @@
+import pytest
+
+from scraper import html_parser, table_extract
+from scraper.html_parser import PARSER_BACKENDS
+from scraper.table_extract import (
+    PageSections,
+    extract_table,
+    find_table_html,
+    iter_table_html,
+    make_section_soup,
+    section_html,
+    wants_table,
+)
+
+PAGE = """
+<html><body>
+<div id="content"><h1>Premier League Stats</h1><p>Not wanted.</p></div>
+<table id="results_overall"><tr><td>
+  <table id="inner"><tr><td>nested</td></tr></table>
+</td></tr><tr><td data-stat="team">Arsenal</td></tr></table>
+<!--
+<table id="stats_squads_standard_for"><tr><td data-stat="team">Chelsea</td></tr></table>
+-->
+<table id="nations"><tr><td>England</td></tr></table>
+<table><tr><td>No id</td></tr></table>
+<!-- <table id="nations"><tr><td>Again</td></tr></table> -->
+</body></html>
+"""
+
+
+def test_find_table_html_includes_nested_tables():
+    fragment = find_table_html(PAGE, "results_overall")
+
+    assert fragment.startswith('<table id="results_overall">')
+    assert fragment.endswith("</table>")
+    assert "nested" in fragment
+    assert "Arsenal" in fragment
+
+
+def test_find_table_html_looks_into_comments():
+    fragment = find_table_html(PAGE, "stats_squads_standard_for")
+
+    assert "Chelsea" in fragment
+
+
+def test_find_table_html_missing_table():
+    assert find_table_html(PAGE, "stats_keeper") is None
+
+
+def test_iter_table_html_yields_top_level_tables_once_in_page_order():
+    ids = [table_id for table_id, _ in iter_table_html(PAGE)]
+
+    assert ids == ["results_overall", "stats_squads_standard_for", "nations", None]
+
+
+def test_iter_table_html_filters_by_sections():
+    sections = PageSections(table_prefixes=("stats_",), table_ids=("nations",))
+
+    ids = [table_id for table_id, _ in iter_table_html(PAGE, sections)]
+
+    assert ids == ["stats_squads_standard_for", "nations"]
+
+
+def test_wants_table():
+    sections = PageSections(table_ids=("nations",), table_prefixes=("results",))
+
+    assert wants_table(sections, "nations")
+    assert wants_table(sections, "results2024-202591_overall")
+    assert not wants_table(sections, "stats_squads_standard_for")
+    assert not wants_table(sections, None)
+
+
+def test_wants_table_with_only_an_exclude_list_wants_every_other_table():
+    sections = PageSections(exclude_table_ids=("nations",))
+
+    assert wants_table(sections, "results_overall")
+    assert wants_table(sections, "stats_squads_standard_for")
+    assert not wants_table(sections, "nations")
+    assert not wants_table(sections, None)
+
+
+def test_wants_table_exclude_list_narrows_prefixes():
+    sections = PageSections(
+        table_prefixes=("stats_",), exclude_table_ids=("stats_squads_standard_for",)
+    )
+
+    assert wants_table(sections, "stats_squads_keeper_for")
+    assert not wants_table(sections, "stats_squads_standard_for")
+
+
+def test_selectors_alone_want_no_table():
+    assert not wants_table(PageSections(selectors=("h1",)), "results_overall")
+
+
+def test_extract_table_parses_only_that_table():
+    table = extract_table(PAGE, "stats_squads_standard_for")
+
+    assert table.name == "table"
+    assert table.find("td", attrs={"data-stat": "team"}).get_text() == "Chelsea"
+    assert extract_table(PAGE, "stats_keeper") is None
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_section_html_keeps_selected_sections_under_their_ancestors(backend):
+    sections = PageSections(selectors=("div#content > h1",), table_ids=("nations",))
+
+    html = section_html(PAGE, sections, backend)
+
+    assert '<div id="content"><h1>Premier League Stats</h1></div>' in html
+    assert "Not wanted" not in html
+    assert "England" in html
+    assert "Arsenal" not in html
+
+
+def test_make_section_soup_matches_selectors_relying_on_ancestors():
+    sections = PageSections(selectors=("div#content > h1",))
+
+    soup = make_section_soup(PAGE, sections)
+
+    assert soup.select_one("div#content > h1").get_text() == "Premier League Stats"
+    assert soup.find("table") is None
+
+
+def test_section_html_only_uses_lexbor_when_configured(monkeypatch):
+    monkeypatch.setattr(html_parser, "_backend", "html.parser")
+    monkeypatch.setattr(table_extract, "LexborHTMLParser", None)
+    sections = PageSections(selectors=("div#content > h1",), table_ids=("nations",))
+
+    html = section_html(PAGE, sections)
+
+    assert "Premier League Stats" in html